@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Async Scraper - asyncio/aiohttp fetching for UCFEventsScraper
+The listing page and every detail page go through one pooled aiohttp session
+with timeouts and per-host limits; parsing and validation are the sync
+scraper's own, so both paths produce the same events
+"""
+
+import asyncio
+import functools
+import itertools
+import time
+from urllib.parse import urlparse
+
+from event_enrichment import (FAILED, FETCHED, REVALIDATED, apply_cached, parse_detail_page, pending_links,
+                              revalidation_headers)
+from events_log import get_logger
+from incremental_extraction import STREAM_CHUNK_SIZE
+
+try:
+    import aiohttp
+except ImportError:  # async scraping is optional; the sync scraper needs only requests
+    aiohttp = None
+
+logger = get_logger('async')
+
+
+def blocking_chunks(chunks, loop):
+    """Iterator for a worker thread over an async chunk iterator, reading each chunk on loop when asked"""
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+async def read_page(response, threshold, chunk_size=STREAM_CHUNK_SIZE):
+    """incremental_extraction.read_page for an aiohttp response
+
+    A large page comes back as a blocking iterator over its chunks, to be
+    parsed in a worker thread while the rest of the body is still arriving,
+    so it is never held in memory whole.
+    """
+    chunks = response.content.iter_chunked(chunk_size).__aiter__()
+    head = []
+    if not (response.content_length or 0) > threshold:
+        size = 0
+        async for chunk in chunks:
+            head.append(chunk)
+            size += len(chunk)
+            if size > threshold:
+                break
+        else:
+            return b''.join(head), None
+    return None, itertools.chain(head, blocking_chunks(chunks, asyncio.get_running_loop()))
+
+
+def run_in_thread(func, *args):
+    """Await func(*args) run in the loop's default executor (asyncio.to_thread before 3.9)"""
+    return asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+
+class AsyncHostThrottle:
+    """HostThrottle for coroutines: caps concurrent requests per host and spaces their starts"""
+
+    def __init__(self, min_interval=0.25, max_per_host=4):
+        self.min_interval = min_interval
+        self.max_per_host = max_per_host
+        self._next_slot = {}
+        self._semaphores = {}
+
+    def semaphore(self, host):
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    async def wait_turn(self, host):
+        """Sleep until host's next request slot"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncUCFEventsScraper:
+    """Fetches for a UCFEventsScraper without blocking a thread per request.
+
+    scrape_events() keeps the sync contract: it returns the events (None on
+    304) and leaves used_fallback, not_modified, timings and trace on the
+    wrapped scraper. Crawler mode is not async and runs the sync crawl.
+    """
+
+    def __init__(self, scraper, max_connections=32, max_per_host=4, timeout=30, detail_timeout=15):
+        if aiohttp is None:
+            raise RuntimeError('aiohttp is not installed (pip install aiohttp)')
+        self.scraper = scraper
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=10)
+        self.detail_timeout = aiohttp.ClientTimeout(total=detail_timeout, sock_connect=10)
+        enricher = scraper.enricher
+        self.per_host_delay = enricher.throttle.min_interval if enricher else scraper.crawl_delay
+
+    def client(self):
+        """Pooled session for one scrape; keep-alive connections are shared by all its requests"""
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host,
+                                         ttl_dns_cache=300)
+        headers = {'User-Agent': self.scraper.session.headers['User-Agent']}
+        return aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=headers)
+
+    async def scrape_events(self):
+        """scrape_events of the wrapped scraper, with async network I/O"""
+        scraper = self.scraper
+        if scraper.crawl:
+            return await run_in_thread(scraper.crawl_events)
+        try:
+            logger.info('Scraping UCF events from %s (async)', scraper.base_url)
+            headers = scraper.listing_headers(scraper.base_url)
+            # aiohttp only decodes brotli when the brotli package is installed
+            headers['Accept-Encoding'] = 'gzip, deflate'
+            scraper.start_scrape()
+            async with self.client() as session:
+                with scraper.stage('fetch'):
+                    response = await session.get(scraper.base_url, headers=headers)
+                async with response:
+                    if response.status == 304:
+                        logger.info('Events page not modified, keeping cached events')
+                        scraper.not_modified = True
+                        return None
+                    response.raise_for_status()
+
+                    if urlparse(scraper.base_url).netloc not in str(response.url):
+                        logger.warning('Redirected to %s, using fallback', response.url)
+                        scraper.used_fallback = True
+                        return scraper.get_fallback_events()
+
+                    encoding = response.charset or 'utf-8'
+                    with scraper.stage('fetch'):
+                        content, chunks = await read_page(response, scraper.stream_threshold)
+                    # A streamed page is still being read (on this loop) while the thread parses it
+                    events = await run_in_thread(scraper.extract_page, content, chunks,
+                                                 str(response.url), encoding)
+                if not scraper.used_fallback:
+                    events = await self.enrich_events(session, events)
+                    scraper.remember_validators(scraper.base_url, response)
+            return events
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error('Network error: %s', e)
+            scraper.used_fallback = True
+            return scraper.get_fallback_events()
+        except Exception:
+            logger.exception('Unexpected error while scraping')
+            scraper.used_fallback = True
+            return scraper.get_fallback_events()
+
+    async def enrich_events(self, session, events):
+        """enrich_events with every detail page fetched concurrently on session"""
+        enricher = self.scraper.enricher
+        if enricher is None or not events:
+            return events
+        try:
+            with self.scraper.stage('enrich'):
+                started = time.monotonic()
+                pending, stale = pending_links(enricher.cache, events)
+                # asyncio semaphores belong to one event loop, so each run gets its own throttle
+                throttle = AsyncHostThrottle(self.per_host_delay, self.max_per_host)
+                outcomes = await asyncio.gather(*(self.refresh(session, throttle, enricher.cache, url)
+                                                  for url in stale))
+                # Saving the cache file is blocking disk I/O
+                return await run_in_thread(apply_cached, enricher.cache, events, pending, outcomes, started)
+        except Exception:
+            logger.exception('Enrichment failed, keeping listing fields')
+            return events
+
+    async def refresh(self, session, throttle, cache, url):
+        """Revalidate or fetch one detail page; returns FETCHED, REVALIDATED or FAILED"""
+        entry = cache.get(url)
+        host = urlparse(url).netloc
+        async with throttle.semaphore(host):
+            await throttle.wait_turn(host)
+            try:
+                async with session.get(url, headers=revalidation_headers(entry),
+                                       timeout=self.detail_timeout) as response:
+                    if entry and response.status == 304:
+                        cache.touch(url)
+                        return REVALIDATED
+                    response.raise_for_status()
+                    content = await response.read()
+            except Exception as e:
+                # A stale entry is still better than nothing
+                logger.warning('Detail fetch failed for %s: %s', url, e)
+                return FAILED
+
+        # Parsing is CPU work: off the event loop, and after the host slot is free again
+        try:
+            parse_pool = self.scraper.parse_pool
+            if parse_pool is not None:
+                details = await run_in_thread(parse_pool.parse_detail_fields(content, url).result)
+            else:
+                details = await run_in_thread(parse_detail_page, content, url)
+        except Exception as e:
+            logger.warning('Detail parse failed for %s: %s', url, e)
+            return FAILED
+        cache.put(url, details, response)
+        return FETCHED
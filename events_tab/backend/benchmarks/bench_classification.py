@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Classification Micro-Benchmark - per-call pattern loops vs the precompiled
+combined rules in event_rules, over thousands of synthetic titles
+
+Usage: python benchmarks/bench_classification.py [--titles 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_rules import (BENCHMARK_KEY_TERMS, BENCHMARK_PATTERNS, BENCHMARK_TITLES, CALENDAR_PATTERNS,
+                         EVENT_INDICATORS, NAVIGATION_KEYWORDS, STRICT_CALENDAR_PATTERNS)
+from events_api import UCFEventsScraper
+from events_log import configure_logging
+
+WORDS = [
+    'ucf', 'knights', 'student', 'union', 'career', 'fair', 'workshop', 'research', 'symposium',
+    'volleyball', 'vs', 'texas', 'tech', 'innovation', 'tournament', 'theatre', 'musical', 'open',
+    'house', 'alumni', 'give', 'back', 'spanish', 'cinema', 'now', 'film', 'night', 'october',
+    'calendar', 'login', 'menu', 'game', 'lecture', 'series', 'pegasus', 'ballroom', 'today'
+]
+FIXED = ['October2025', 'SuMTuWThFSa2829301234567891011121314', '12:00', 'Su', 'Events', 'Login Menu']
+
+
+def synthetic_titles(count, seed=42):
+    """Mix of benchmark titles, random event-like titles and calendar/navigation noise"""
+    rng = random.Random(seed)
+    titles = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.1:
+            titles.append(rng.choice(BENCHMARK_TITLES).title())
+        elif roll < 0.2:
+            titles.append(rng.choice(FIXED))
+        else:
+            titles.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))).title())
+    return titles
+
+
+# Reference implementations: the helpers as they were, rebuilding and looping per call
+def reference_is_benchmark_event(title):
+    if not title:
+        return False
+    title_lower = title.lower()
+    for benchmark in list(BENCHMARK_TITLES):
+        if benchmark in title_lower:
+            return True
+    return False
+
+
+def reference_matches_benchmark_event(title):
+    title_lower = title.lower()
+    for benchmark in list(BENCHMARK_TITLES):
+        if benchmark in title_lower:
+            return True
+    for term in list(BENCHMARK_KEY_TERMS):
+        if term in title_lower:
+            return True
+    return False
+
+
+def reference_is_valid_title(title):
+    if not title or len(title.strip()) < 5:
+        return False
+    title = title.strip()
+    if len(title) > 100 or len(title.split()) < 2:
+        return False
+    for pattern in list(CALENDAR_PATTERNS):
+        if re.match(pattern, title):
+            return False
+    return True
+
+
+def reference_is_high_quality_event(event):
+    if not event or not event.get('title'):
+        return False
+    title = event.get('title', '').strip().lower()
+    for pattern in ['.*' + p + '.*' for p in BENCHMARK_PATTERNS]:
+        if re.search(pattern, title):
+            return True
+    return any(indicator in title for indicator in list(EVENT_INDICATORS))
+
+
+def reference_is_valid_todays_event(event):
+    if not event.get('title'):
+        return False
+    title = event.get('title', '').strip()
+    if len(title) < 5 or len(title) > 100:
+        return False
+    for pattern in list(STRICT_CALENDAR_PATTERNS):
+        if re.match(pattern, title):
+            return False
+    title_lower = title.lower()
+    for keyword in list(NAVIGATION_KEYWORDS):
+        if keyword in title_lower and len(title.split()) < 4:
+            return False
+    if len(title.split()) < 2:
+        return False
+    return any(indicator in title_lower for indicator in list(EVENT_INDICATORS))
+
+
+def measure(func, items, repeat):
+    """Median time of running func over every item, plus its results"""
+    timings = []
+    results = None
+    for item in items:  # warm-up (lazily built matchers, caches)
+        func(item)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [func(item) for item in items]
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--titles', type=int, default=5000, help='number of synthetic titles')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (median is reported)')
+    args = parser.parse_args()
+    configure_logging('WARNING')  # keep per-block logging out of the timings
+
+    scraper = UCFEventsScraper()
+    titles = synthetic_titles(args.titles)
+    events = [{'title': title} for title in titles]
+    cases = [
+        ('is_benchmark_event', reference_is_benchmark_event, scraper.is_benchmark_event, titles),
+        ('matches_benchmark_event', reference_matches_benchmark_event, scraper.matches_benchmark_event, titles),
+        ('is_valid_title', reference_is_valid_title, scraper.is_valid_title, titles),
+        ('is_high_quality_event', reference_is_high_quality_event, scraper.is_high_quality_event, events),
+        ('is_valid_todays_event', reference_is_valid_todays_event, scraper.is_valid_todays_event, events),
+    ]
+
+    print(f"{len(titles)} synthetic titles, median of {args.repeat} runs")
+    print(f"{'helper':<26} {'reference':>11} {'compiled':>10} {'speedup':>8} {'accepted':>9}  agree")
+    for name, reference, compiled, items in cases:
+        reference_time, expected = measure(reference, items, args.repeat)
+        compiled_time, actual = measure(compiled, items, args.repeat)
+        print(f"{name:<26} {reference_time * 1000:>9.1f}ms {compiled_time * 1000:>8.1f}ms "
+              f"{reference_time / compiled_time:>7.1f}x {sum(actual):>9}  {'yes' if expected == actual else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmark - original multi-walk helpers vs the single-pass engine
+Runs every saved HTML fixture through each installed parser backend
+
+Usage: python benchmarks/bench_extraction.py [--repeat 5] [--scale 1 20]
+"""
+
+import argparse
+import glob
+import importlib.util
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events_api import UCFEventsScraper
+from events_log import configure_logging
+from extraction import SinglePassExtractor, make_soup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PARSERS = ['html.parser', 'lxml', 'html5lib']
+
+
+def installed_parsers():
+    """Parser backends available in this environment"""
+    return [p for p in PARSERS if p == 'html.parser' or importlib.util.find_spec(p)]
+
+
+def inflate(html, factor):
+    """Repeat the page's <main> block to simulate a bigger listing page"""
+    match = re.search(r'<main\b.*?</main>', html, re.S)
+    if not match or factor <= 1:
+        return html
+    return html[:match.end()] + match.group() * (factor - 1) + html[match.end():]
+
+
+def comparable(events):
+    """Events without their timestamps"""
+    return [{k: v for k, v in event.items() if k != 'scraped_at'} for event in events]
+
+
+def run_original(scraper, soup):
+    scraper.clean_page_content(soup)
+    return scraper.extract_todays_events_enhanced(soup)
+
+
+def run_single_pass(scraper, soup):
+    return SinglePassExtractor(scraper).extract(soup)
+
+
+def measure(func, repeat, setup=None):
+    """Median wall time of func over repeat runs, plus its last result
+
+    With setup, each run gets func(setup()) and only func is timed.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (median is reported)')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 20], help='page inflation factors')
+    args = parser.parse_args()
+    configure_logging('WARNING')  # keep per-block logging out of the timings
+
+    scraper = UCFEventsScraper()
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    print(f"{'fixture':<24} {'scale':>5} {'parser':<12} {'size':>9} {'parse':>9} {'original':>10} {'single':>9} {'speedup':>8} {'events':>6}  match")
+
+    for path in fixtures:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        for scale in args.scale:
+            page = inflate(html, scale)
+            for backend in installed_parsers():
+                def parse():
+                    return make_soup(page, backend)
+
+                # Parsing is timed on its own; both engines are timed on a fresh, already-parsed soup
+                # (the original one mutates it), so neither number includes the parse
+                parse_time, _ = measure(parse, args.repeat)
+                original_time, original = measure(lambda soup: run_original(scraper, soup), args.repeat, parse)
+                single_time, single = measure(lambda soup: run_single_pass(scraper, soup), args.repeat, parse)
+                print(f"{os.path.basename(path):<24} {scale:>5} {backend:<12} {len(page):>9} "
+                      f"{parse_time * 1000:>7.1f}ms {original_time * 1000:>8.1f}ms {single_time * 1000:>7.1f}ms "
+                      f"{original_time / single_time:>7.1f}x {len(single):>6}  "
+                      f"{'yes' if comparable(original) == comparable(single) else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
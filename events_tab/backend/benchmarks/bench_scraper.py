@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark - end-to-end scrape_events runs against the offline corpus
+Reports fetch/parse/extract/validate timings, tracemalloc peak memory and
+precision/recall against each page's labels; --save/--compare track regressions
+
+Usage: python benchmarks/bench_scraper.py [--repeat 5] [--pages today week] [--save base.json]
+       python benchmarks/bench_scraper.py --compare base.json [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events_api import UCFEventsScraper
+from events_log import configure_logging
+from fixture_server import FixtureServer
+from incremental_extraction import STREAM_THRESHOLD
+from make_corpus import CORPUS_DIR
+
+STAGES = ['fetch', 'parse', 'extract', 'validate']
+
+
+def corpus_pages():
+    """Names of the labeled pages in the corpus"""
+    return sorted(name[:-len('.labels.json')] for name in os.listdir(CORPUS_DIR) if name.endswith('.labels.json'))
+
+
+def normalize(title):
+    return ' '.join(title.lower().split())
+
+
+def score(events, labels, used_fallback):
+    """Precision, recall and the share of matched events with the right time and location"""
+    if used_fallback:
+        return 0.0, 0.0, 0.0
+    expected = {normalize(label['title']): label for label in labels}
+    matched = [(event, expected[normalize(event['title'])]) for event in events
+               if normalize(event['title']) in expected]
+    precision = len(matched) / len(events) if events else 0.0
+    recall = len({normalize(label['title']) for _, label in matched}) / len(expected) if expected else 0.0
+    fields = sum(event.get('time') == label['time'] and event.get('location') == label['location']
+                 for event, label in matched)
+    return precision, recall, fields / len(matched) if matched else 0.0
+
+
+def scrape(url, stream_threshold):
+    """(seconds, scraper, events) of one fresh end-to-end scrape"""
+    # No enrichment or feed lookups: they would only hit the corpus server's 404s
+    scraper = UCFEventsScraper(base_url=url, enrich=False, feed_paths=[], stream_threshold=stream_threshold)
+    started = time.perf_counter()
+    events = scraper.scrape_events()
+    return time.perf_counter() - started, scraper, events
+
+
+def bench_page(server, page, repeat, stream_threshold):
+    with open(os.path.join(CORPUS_DIR, f"{page}.labels.json"), encoding='utf-8') as f:
+        labels = json.load(f)
+    url = server.url(page)
+
+    totals = []
+    stages = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        elapsed, scraper, events = scrape(url, stream_threshold)
+        totals.append(elapsed)
+        for stage in STAGES:
+            stages[stage].append(scraper.timings.get(stage, 0.0))
+
+    # Memory is measured on a separate run; tracemalloc slows everything down
+    tracemalloc.start()
+    scrape(url, stream_threshold)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    precision, recall, fields = score(events, labels, scraper.used_fallback)
+    return {
+        'size': os.path.getsize(os.path.join(CORPUS_DIR, f"{page}.html")),
+        'labeled': len(labels),
+        'extracted': len(events),
+        'fallback': scraper.used_fallback,
+        'total': statistics.median(totals),
+        'stages': {stage: statistics.median(values) for stage, values in stages.items()},
+        'peak': peak,
+        'precision': precision,
+        'recall': recall,
+        'fields': fields
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of results against a saved baseline"""
+    problems = []
+    for page, result in results.items():
+        before = baseline.get(page)
+        if not before:
+            continue
+        for key in ('total', 'peak'):
+            if result[key] > before[key] * (1 + tolerance):
+                problems.append(f"{page}: {key} {before[key]:.4g} -> {result[key]:.4g}")
+        for key in ('precision', 'recall'):
+            if result[key] < before[key] - 0.005:
+                problems.append(f"{page}: {key} {before[key]:.3f} -> {result[key]:.3f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per page (median is reported)')
+    parser.add_argument('--pages', nargs='+', default=None, help='corpus pages (default: all)')
+    parser.add_argument('--stream-threshold', type=int, default=STREAM_THRESHOLD,
+                        help='bytes above which pages are parsed while streaming (0 streams everything)')
+    parser.add_argument('--chunk', type=int, default=None, help='serve bodies chunked in pieces of this many bytes')
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='baseline JSON to check the results against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown/memory growth (0.2 = 20%%)')
+    args = parser.parse_args()
+    configure_logging('CRITICAL')  # fallbacks show up in the table instead
+
+    results = {}
+    print(f"{'page':<22} {'size':>8} {'fetch':>8} {'parse':>8} {'extract':>8} {'validate':>8} {'total':>8} "
+          f"{'peak':>8} {'events':>9} {'prec':>5} {'recall':>6} {'fields':>6}")
+    with FixtureServer(chunk_size=args.chunk) as server:
+        for page in args.pages or corpus_pages():
+            result = results[page] = bench_page(server, page, args.repeat, args.stream_threshold)
+            stages = result['stages']
+            print(f"{page:<22} {result['size']:>8} "
+                  + ' '.join(f"{stages[stage] * 1000:>6.1f}ms" for stage in STAGES)
+                  + f" {result['total'] * 1000:>6.1f}ms {result['peak'] / 2 ** 20:>6.1f}MB "
+                  f"{result['extracted']:>4}/{result['labeled']:<4} {result['precision']:>5.2f} "
+                  f"{result['recall']:>6.2f} {result['fields']:>6.2f}" + ('  (fallback)' if result['fallback'] else ''))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print('REGRESSION', problem)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
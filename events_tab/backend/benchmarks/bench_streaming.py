@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Streaming Benchmark - whole-page DOM extraction vs incremental block parsing
+Reports wall time and tracemalloc peak memory on inflated listing pages
+
+Usage: python benchmarks/bench_streaming.py [--scale 1 50 200] [--chunk 65536]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import FIXTURES_DIR, inflate
+from events_api import UCFEventsScraper
+from events_log import configure_logging
+from extraction import make_soup
+from incremental_extraction import StreamingExtractor
+
+
+def run_dom(scraper, body, chunk_size):
+    """Read the whole body, then build and walk its DOM"""
+    content = b''.join(body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    return scraper.extract_todays_events(make_soup(content))
+
+
+def run_streaming(scraper, body, chunk_size):
+    """Parse the body chunk by chunk, one event block at a time"""
+    chunks = (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    events, _ = StreamingExtractor(scraper).extract(chunks, scraper.base_url)
+    return events
+
+
+def measure(func):
+    """(seconds, peak bytes, result) of one run"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 50, 200], help='page inflation factors')
+    parser.add_argument('--chunk', type=int, default=64 * 1024, help='bytes per streamed chunk')
+    args = parser.parse_args()
+    configure_logging('WARNING')
+
+    # No feeds to look for: only the page itself is measured
+    scraper = UCFEventsScraper(enrich=False, feed_paths=[])
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+    print(f"{'fixture':<24} {'scale':>5} {'size':>10} {'dom':>9} {'dom peak':>10} "
+          f"{'stream':>9} {'stream peak':>12} {'events':>13}")
+
+    for path in fixtures:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        for scale in args.scale:
+            body = inflate(html, scale).encode('utf-8')
+            dom_time, dom_peak, dom_events = measure(lambda: run_dom(scraper, body, args.chunk))
+            stream_time, stream_peak, stream_events = measure(lambda: run_streaming(scraper, body, args.chunk))
+            print(f"{os.path.basename(path):<24} {scale:>5} {len(body):>10} "
+                  f"{dom_time * 1000:>7.0f}ms {dom_peak / 2 ** 20:>8.1f}MB "
+                  f"{stream_time * 1000:>7.0f}ms {stream_peak / 2 ** 20:>10.1f}MB "
+                  f"{len(dom_events):>6} / {len(stream_events):<4}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Text Fallback Benchmark - scaling of the text-pattern block fallback
+Times PageIndex.find_text_blocks on pages with a growing number of event
+lines; per-line time should stay flat (linear growth overall)
+
+Usage: python benchmarks/bench_text_fallback.py [--lines 500 1000 2000 4000 8000] [--check]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_rules import BENCHMARK_KEYWORDS
+from extraction import PageIndex, make_soup
+
+# Allowed growth of the per-line time from the smallest to the largest page with --check
+MAX_PER_LINE_GROWTH = 3.0
+
+
+def fallback_page(lines):
+    """Page of lines naming benchmark events, each in its own nested block"""
+    keywords = sorted(BENCHMARK_KEYWORDS)
+    blocks = []
+    for i in range(lines):
+        keyword = keywords[i % len(keywords)].title()
+        blocks.append(f'<div class="row"><span>\n  <b>{keyword} session {i}</b>\n</span></div>')
+        blocks.append(f'<p>Filler paragraph {i} without an event name</p>')
+    return '<html><body><main>\n' + '\n'.join(blocks) + '\n</main></body></html>'
+
+
+def naive_text_blocks(soup, keywords):
+    """The original fallback: a find_all() over the page per matching line"""
+    blocks = []
+    for line in soup.get_text().split('\n'):
+        if any(keyword in line.lower() for keyword in keywords):
+            for element in soup.find_all():
+                if element.get_text().strip() == line.strip():
+                    blocks.append(element)
+                    break
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, nargs='+', default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument('--check', action='store_true', help='exit 1 if per-line time grows more than '
+                                                             f'{MAX_PER_LINE_GROWTH}x or results differ')
+    args = parser.parse_args()
+
+    print(f"{'lines':>6} {'size':>9} {'fallback':>10} {'per line':>10} {'blocks':>7}  match")
+    per_line = []
+    ok = True
+    for lines in args.lines:
+        soup = make_soup(fallback_page(lines))
+        page = PageIndex(soup)
+        started = time.perf_counter()
+        blocks = page.find_text_blocks(BENCHMARK_KEYWORDS)
+        elapsed = time.perf_counter() - started
+        per_line.append(elapsed / lines)
+        # The naive version is quadratic; only compare on the smallest page
+        match = '-'
+        if lines == min(args.lines):
+            same = [page.elements[i] for i in blocks] == naive_text_blocks(soup, BENCHMARK_KEYWORDS)
+            match = 'yes' if same else 'NO'
+            ok = ok and same
+        print(f"{lines:>6} {len(str(soup)):>9} {elapsed * 1000:>8.1f}ms {per_line[-1] * 1e6:>8.1f}us {len(blocks):>7}  {match}")
+
+    growth = per_line[-1] / per_line[0]
+    print(f"per-line time growth {min(args.lines)} -> {max(args.lines)} lines: {growth:.2f}x")
+    if args.check and (not ok or growth > MAX_PER_LINE_GROWTH):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
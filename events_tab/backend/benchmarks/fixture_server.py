@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Fixture Server - local HTTP stand-in for events.ucf.edu
+Serves fixtures/corpus/<page>.html at /<page>/ (or a nested site such as
+fixtures/site, where /this-week/ and /event/N/slug/ map to index.html files)
+with ETags, 304s and chunked transfer, so the scraper and crawler run end
+to end without touching the network
+
+Usage: python benchmarks/fixture_server.py [--port 8765]
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from make_corpus import CORPUS_DIR
+
+# Listing, category and detail pages laid out by URL path, for the crawler
+SITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'site')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        name = self.path.split('?')[0].strip('/')
+        server.count(name)
+        path = server.resolve(name)
+        if path is None:
+            # Feeds (and pages a fixture set leaves out) are not served
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = server.read(path)
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        if server.chunk_size:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for start in range(0, len(body), server.chunk_size):
+                chunk = body[start:start + server.chunk_size]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                if server.latency:
+                    time.sleep(server.latency)
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Corpus pages on localhost; use as a context manager.
+
+    chunk_size sends bodies with chunked transfer (no Content-Length), and
+    latency sleeps between chunks to imitate a slow upstream.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, directory=CORPUS_DIR, port=0, chunk_size=None, latency=0.0):
+        super().__init__(('127.0.0.1', port), FixtureHandler)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.latency = latency
+        self.requests = 0
+        # Requests per path (without query string or slashes around it)
+        self.hits = Counter()
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def count(self, name):
+        with self._lock:
+            self.requests += 1
+            self.hits[name] += 1
+
+    def resolve(self, name):
+        """File for a URL path: <name>.html, else <name>/index.html; None outside the directory"""
+        root = os.path.realpath(self.directory)
+        for candidate in (f"{name}.html", os.path.join(name, 'index.html')):
+            path = os.path.realpath(os.path.join(root, candidate))
+            if path.startswith(root + os.sep) and os.path.isfile(path):
+                return path
+        return None
+
+    def read(self, path):
+        body = self._bodies.get(path)
+        if body is None:
+            with open(path, 'rb') as f:
+                body = self._bodies[path] = f.read()
+        return body
+
+    def url(self, page):
+        """Base URL the scraper should use for a page ('' for the site root)"""
+        return f"http://127.0.0.1:{self.server_port}/" + (f"{page}/" if page else '')
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--chunk', type=int, default=None, help='send bodies chunked in pieces of this many bytes')
+    parser.add_argument('--site', action='store_true', help='serve the nested crawl site instead of the corpus')
+    args = parser.parse_args()
+    server = FixtureServer(directory=SITE_DIR if args.site else CORPUS_DIR, port=args.port, chunk_size=args.chunk)
+    if args.site:
+        print(server.url(''))
+    else:
+        pages = sorted(name[:-5] for name in os.listdir(server.directory) if name.endswith('.html'))
+        for page in pages:
+            print(server.url(page))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
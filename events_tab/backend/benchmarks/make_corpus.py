@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Corpus Generator - labeled events.ucf.edu-style listing pages for bench_scraper
+Writes fixtures/corpus/<page>.html plus <page>.labels.json (the events a
+perfect scraper would return); output is deterministic for a given seed
+
+Usage: python benchmarks/make_corpus.py [--seed 2025]
+"""
+
+import argparse
+import html
+import json
+import os
+import random
+import re
+from datetime import date, timedelta
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'corpus')
+
+# The benchmark events the heuristics were tuned on, with their venues
+BENCHMARK_EVENTS = [
+    ('ACE Personal Training Certification Course', 'RWC: 120', 'Health &amp; Wellness'),
+    ('Innovation Tournament 2025', 'Blackstone LaunchPad', 'Entrepreneurship'),
+    ('UCF AlumKnights Give Back', 'Virtual', 'Alumni'),
+    ('Knight for a Day Open House', 'Student Union: Pegasus Ballroom', 'Admissions'),
+    ('UCF Volleyball vs. Texas Tech', 'The Venue', 'Athletics'),
+    ('Spanish Cinema Now + 2025: Por Donde Pasa El Silencio', 'classroom 1::Room 101', 'Arts &amp; Exhibits'),
+    ('Urinetown: The Musical | Theatre UCF', 'Theatre UCF: Main Stage: TH 101', 'Performing Arts')
+]
+
+TITLE_TEMPLATES = [
+    '{dept} Seminar: {topic}', '{dept} Graduate Research Forum', 'Career Workshop: {skill}',
+    'Knights Basketball vs. {school}', 'UCF Soccer vs. {school}', '{dept} Colloquium on {topic}',
+    'Volunteer Orientation: {org}', '{org} General Meeting', 'Study Abroad Info Session: {country}',
+    'Film Screening: {film}', 'Guest Lecture: {topic}', '{skill} Certification Course'
+]
+WORDS = {
+    'dept': ['Physics', 'Chemistry', 'Mathematics', 'Computer Science', 'Biology', 'History', 'Nursing',
+             'Economics', 'Psychology', 'Hospitality'],
+    'topic': ['Quantum Sensing', 'Machine Learning in Medicine', 'Coastal Resilience', 'Space Policy',
+              'Data Privacy', 'Urban Heat Islands', 'Ethics of AI', 'Renewable Grids'],
+    'skill': ['Resume Review', 'Interview Prep', 'LinkedIn Profiles', 'Salary Negotiation', 'First Aid'],
+    'school': ['Texas Tech', 'Baylor', 'Houston', 'Cincinnati', 'Arizona State', 'Kansas'],
+    'org': ['Knights Helping Knights', 'Habitat for Humanity', 'SGA', 'Engineering Council', 'Pre-Med Society'],
+    'country': ['Spain', 'Japan', 'Ghana', 'Italy', 'Costa Rica'],
+    'film': ['Hidden Figures', 'Apollo 13', 'Coco', 'The Martian']
+}
+LOCATIONS = ['Student Union: Key West Ballroom', 'Pegasus Ballroom', 'Engineering II: 102', 'Library: 223',
+             'Addition Financial Arena', 'Harris Engineering Center: 101', 'Virtual', 'CFE Arena',
+             'Teaching Academy: 117', 'Visual Arts Building: Gallery']
+CATEGORIES = ['Academic', 'Athletics', 'Career Development', 'Arts &amp; Exhibits', 'Community Service',
+              'Lectures &amp; Seminars', 'Student Life']
+
+PAGES = {
+    # name: (days, events per day, benchmark events included)
+    'today': (1, 12, True),
+    'week': (7, 10, True),
+    'month': (30, 12, True),
+    'month_no_benchmarks': (30, 12, False)
+}
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', html.unescape(text).lower()).strip('-')
+
+
+def make_title(rng):
+    template = rng.choice(TITLE_TEMPLATES)
+    return template.format(**{key: rng.choice(values) for key, values in WORDS.items()})
+
+
+def make_events(rng, days, per_day, with_benchmarks, first_day):
+    """(day, events) pairs; each event is a dict of raw markup fields"""
+    event_id = 3500000
+    schedule = []
+    benchmarks = list(BENCHMARK_EVENTS) if with_benchmarks else []
+    for offset in range(days):
+        day_events = []
+        for _ in range(per_day):
+            event_id += 1
+            if benchmarks and (offset == 0 or rng.random() < 0.1):
+                title, location, category = benchmarks.pop(0)
+            else:
+                title = html.escape(make_title(rng))
+                location, category = rng.choice(LOCATIONS), rng.choice(CATEGORIES)
+            minutes = rng.randrange(8 * 60, 21 * 60, 15)
+            clock = f"{(minutes // 60 - 1) % 12 + 1}:{minutes % 60:02d} {'AM' if minutes < 12 * 60 else 'PM'}"
+            day_events.append({
+                'minutes': minutes,
+                'title': title,
+                'time': clock,
+                'location': location,
+                'category': category,
+                'link': f"/event/{event_id}/{slug(title)}/"
+            })
+        day_events.sort(key=lambda event: event['minutes'])
+        schedule.append((first_day + timedelta(days=offset), day_events))
+    return schedule
+
+
+def render_event(event):
+    return f'''        <div class="event-listing-item">
+          <h3 class="event-title"><a href="{event['link']}">{event['title']}</a></h3>
+          <p class="event-start">at {event['time']}</p>
+          <p class="event-location">{event['location']}</p>
+          <p class="event-category">{event['category']}</p>
+        </div>
+'''
+
+
+def render_page(name, schedule):
+    """Listing page markup in the shape of events.ucf.edu (nav, sidebar, listing, footer)"""
+    first_day = schedule[0][0]
+    heading = "Today's Events" if len(schedule) == 1 else f"Events for {first_day.strftime('%B %Y')}"
+    listing = []
+    for day, day_events in schedule:
+        if len(schedule) > 1:
+            listing.append(f'        <h3 class="event-day">{day.strftime("%A, %B %d")}</h3>\n')
+        listing.extend(render_event(event) for event in day_events)
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>UCF Events - {name}</title>
+  <link rel="stylesheet" href="/static/css/style.min.css">
+  <script>window.ucfEvents = {{"calendar": "events-at-ucf", "view": "{name}"}};</script>
+</head>
+<body>
+  <div id="ucfhb" class="ucf-header">
+    <a href="https://www.ucf.edu/">University of Central Florida</a>
+    <ul class="nav-menu">
+      <li><a href="/">Home</a></li>
+      <li><a href="/this-week/">This Week</a></li>
+      <li><a href="/this-month/">This Month</a></li>
+      <li><a href="/login/">Login</a></li>
+    </ul>
+  </div>
+  <main class="container">
+    <div class="row">
+      <aside class="col-md-3 sidebar">
+        <div class="calendar-widget"><h3>{first_day.strftime('%B%Y')}</h3></div>
+        <div class="category-list">
+          <h3>Categories</h3>
+          <ul>
+{''.join(f'            <li><a href="/category/{slug(c)}/">{c}</a></li>{chr(10)}' for c in CATEGORIES)}          </ul>
+        </div>
+      </aside>
+      <section class="col-md-9 event-list">
+        <h2>{heading}</h2>
+{''.join(listing)}      </section>
+    </div>
+  </main>
+  <footer class="site-footer">
+    <ul>
+      <li><a href="/about/">About</a></li>
+      <li><a href="/contact/">Contact</a></li>
+    </ul>
+    <p>University of Central Florida, 4000 Central Florida Blvd., Orlando, FL 32816</p>
+  </footer>
+</body>
+</html>
+'''
+
+
+def labels(schedule):
+    """What a perfect scrape of the page returns"""
+    return [{
+        'title': html.unescape(event['title']),
+        'date': day.isoformat(),
+        'time': event['time'],
+        'location': html.unescape(event['location']),
+        'link': event['link']
+    } for day, day_events in schedule for event in day_events]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args()
+
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name, (days, per_day, with_benchmarks) in PAGES.items():
+        rng = random.Random(f"{args.seed}-{name}")
+        schedule = make_events(rng, days, per_day, with_benchmarks, date(2025, 11, 3))
+        page = render_page(name, schedule)
+        with open(os.path.join(CORPUS_DIR, f"{name}.html"), 'w', encoding='utf-8') as f:
+            f.write(page)
+        with open(os.path.join(CORPUS_DIR, f"{name}.labels.json"), 'w', encoding='utf-8') as f:
+            f.write('[\n' + ',\n'.join(json.dumps(label) for label in labels(schedule)) + '\n]\n')
+        print(f"{name:<22} {len(page):>8} bytes {days * per_day:>5} events")
+
+
+if __name__ == '__main__':
+    main()
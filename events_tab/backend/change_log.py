@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Change Log - bounded history of what each cache generation changed
+Kept in the store metadata so every worker can answer delta requests
+"""
+
+from collections import deque
+
+
+class ChangeLog:
+    """Ring buffer of (generation, added IDs, updated IDs, removed IDs).
+
+    Only IDs are kept; the events themselves come from the current
+    generation, so a delta always carries their latest version.
+    """
+
+    def __init__(self, maxlen=50):
+        self.entries = deque(maxlen=maxlen)
+
+    def record(self, generation, diff):
+        """Append the diff that produced generation"""
+        # A failed save may have left an entry for a generation that was never written
+        while self.entries and self.entries[-1]['generation'] >= generation:
+            self.entries.pop()
+        self.entries.append({
+            'generation': generation,
+            'added': [event.id for event in diff.added],
+            'updated': [event.id for event in diff.updated],
+            'removed': list(diff.removed)
+        })
+
+    def to_meta(self):
+        """JSON-ready list for the store metadata"""
+        return list(self.entries)
+
+    def load_meta(self, entries):
+        """Replace the history with the one saved in a store"""
+        self.entries.clear()
+        self.entries.extend(entries or [])
+
+    def since(self, since, current, present_ids):
+        """(added, updated, removed) ID sets between two (epoch, generation) pairs
+
+        current is the generation this history leads up to and present_ids
+        are its IDs. Returns None when since is from another store epoch or
+        the history no longer reaches back to it (or has gaps), in which
+        case the caller sends a full snapshot.
+        """
+        epoch, generation = since
+        current_epoch, current_generation = current
+        if epoch != current_epoch or generation > current_generation:
+            return None
+        entries = [entry for entry in self.entries if generation < entry['generation'] <= current_generation]
+        expected = list(range(generation + 1, current_generation + 1))
+        if [entry['generation'] for entry in entries] != expected:
+            return None
+
+        # The first change seen for an ID tells whether it existed at generation
+        existed = {}
+        for entry in entries:
+            for event_id in entry['added']:
+                existed.setdefault(event_id, False)
+            for event_id in entry['updated'] + entry['removed']:
+                existed.setdefault(event_id, True)
+
+        added, updated, removed = set(), set(), set()
+        for event_id, was_there in existed.items():
+            if event_id in present_ids:
+                (updated if was_there else added).add(event_id)
+            elif was_there:
+                removed.add(event_id)
+        return added, updated, removed
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+UCF Events Crawler - multi-page, multi-day crawl mode for the scraper
+Fetches listing pages (day, week, month, categories) and event detail pages
+through a bounded thread pool sharing one pooled requests.Session
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin, urlparse, urldefrag
+
+from events_log import get_logger
+from extraction import make_soup
+
+logger = get_logger('crawler')
+
+# Listing pages crawled from the base URL (today, this week, this month)
+DEFAULT_LISTING_PATHS = ['', 'this-week/', 'this-month/']
+
+# Links that point at a single event, and links that lead to more listings
+DETAIL_LINK_PATTERN = re.compile(r'/event/\d+')
+LISTING_LINK_PATTERN = re.compile(r'/(category|tag)/|[?&]page=\d+')
+CATEGORY_LINK_PATTERN = re.compile(r'/category/([^/?#]+)')
+
+# Returned by fetch when a conditional request is answered with 304
+NOT_MODIFIED = object()
+
+
+def listing_links(page_url, content, host):
+    """Detail links (with their link text) and further listing links on host"""
+    soup = make_soup(content)
+    details = {}
+    listings = []
+    for anchor in soup.find_all('a', href=True):
+        link = urldefrag(urljoin(page_url, anchor['href']))[0]
+        if urlparse(link).netloc != host:
+            continue
+        if DETAIL_LINK_PATTERN.search(link):
+            title = anchor.get_text(strip=True)
+            if title or link not in details:
+                details[link] = title
+        elif LISTING_LINK_PATTERN.search(link):
+            listings.append(link)
+    return details, listings
+
+
+def detail_event(scraper, url, content, with_details=False):
+    """Parse one event detail page, preferring its JSON-LD data
+
+    with_details returns (event, enrichment fields) from the same parse,
+    for the enricher's cache.
+    """
+    soup = make_soup(content)
+    details = None
+    if with_details:
+        # Imported here: event_enrichment imports this module
+        from event_enrichment import detail_fields
+        details = detail_fields(soup, url)
+    events = scraper.extract_json_ld_events(soup)
+    if events:
+        event = events[0]
+    else:
+        card = soup.find('article') or soup.find('main') or soup.body or soup
+        event = scraper.parse_event_card(card)
+    if not event or not event.get('title'):
+        event = None
+    else:
+        event['link'] = url
+    return (event, details) if with_details else event
+
+
+class HostThrottle:
+    """Per-host politeness: caps concurrent requests and spaces out request starts"""
+
+    def __init__(self, min_interval=0.25, max_per_host=4):
+        self.min_interval = min_interval
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._semaphores = {}
+
+    def acquire(self, host):
+        """Wait for a free slot on host"""
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+        semaphore.acquire()
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def release(self, host):
+        """Give the slot on host back"""
+        self._semaphores[host].release()
+
+
+class EventsCrawler:
+    """Crawl listing and detail pages concurrently and collect events.
+
+    Only pages on the same host as base_url are fetched, so pointing
+    base_url at a local fixture server keeps the whole crawl offline.
+    """
+
+    def __init__(self, scraper, base_url=None, listing_paths=None, max_workers=8,
+                 per_host_delay=0.25, max_per_host=4, max_listing_pages=50,
+                 max_detail_pages=500, follow_details=True, timeout=15):
+        self.scraper = scraper
+        self.base_url = base_url or scraper.base_url
+        self.listing_paths = DEFAULT_LISTING_PATHS if listing_paths is None else listing_paths
+        self.max_workers = max_workers
+        self.max_listing_pages = max_listing_pages
+        self.max_detail_pages = max_detail_pages
+        self.follow_details = follow_details
+        self.timeout = timeout
+        self.host = urlparse(self.base_url).netloc
+        self.throttle = HostThrottle(per_host_delay, max_per_host)
+        self.session = scraper.session
+        # ParsePool for listing and detail pages; None parses in the crawl threads
+        self.parse_pool = scraper.parse_pool
+        # Detail pages also fill the enricher's cache, so enrichment does not fetch them again
+        self.enricher = scraper.enricher
+
+    def crawl(self):
+        """Crawl listings, then detail pages, and return de-duplicated events
+
+        Returns None (with scraper.not_modified set) when every seed listing
+        page answers a conditional request with 304.
+        """
+        started = time.monotonic()
+        listing_urls = [urljoin(self.base_url, path) for path in self.listing_paths]
+        seen_listings = set(listing_urls)
+        detail_links = {}
+        detail_categories = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='events-crawl') as pool:
+            seed_pages = list(pool.map(self.fetch_conditional, listing_urls))
+            if seed_pages and all(content is NOT_MODIFIED for content in seed_pages):
+                logger.info('Listing pages not modified, keeping cached events')
+                self.scraper.not_modified = True
+                return None
+            # Something changed, so the unchanged seed pages are needed in full too
+            seed_pages = [self.fetch(url, remember=True) if content is NOT_MODIFIED else content
+                          for url, content in zip(listing_urls, seed_pages)]
+
+            # Breadth-first over listing pages, discovering categories and pagination
+            pages = seed_pages
+            while listing_urls:
+                next_urls = []
+                for url, (details, listings) in self.parse_listing_pages(listing_urls, pages):
+                    category = self.listing_category(url)
+                    for link, title in details.items():
+                        detail_links.setdefault(link, title)
+                        if category:
+                            detail_categories.setdefault(link, set()).add(category)
+                    for link in listings:
+                        if link not in seen_listings and len(seen_listings) < self.max_listing_pages:
+                            seen_listings.add(link)
+                            next_urls.append(link)
+                listing_urls = next_urls
+                pages = pool.map(self.fetch, listing_urls)
+
+            logger.info('Crawled %d listing pages, found %d event links', len(seen_listings), len(detail_links))
+
+            if self.follow_details:
+                urls = list(detail_links)[:self.max_detail_pages]
+                if self.enricher is not None:
+                    self.enricher.cache.load()
+                events = []
+                responses = pool.map(self.fetch_detail, urls)
+                for url, event in zip(urls, self.parse_detail_pages(urls, responses)):
+                    events.append(event or self.listing_event(url, detail_links[url]))
+            else:
+                events = [self.listing_event(url, title) for url, title in detail_links.items()]
+
+        for event in events:
+            if event and event['link'] in detail_categories:
+                event['categories'] = sorted(detail_categories[event['link']])
+        events = self.dedupe(events)
+        logger.info('Crawl finished: %d events in %.2fs', len(events), time.monotonic() - started)
+        return events
+
+    def fetch(self, url, conditional=False, remember=False, keep_response=False):
+        """Fetch a page politely, returning its body or None on failure
+
+        Validators are only kept for conditional (seed listing) pages;
+        keep_response returns the whole response instead of its body.
+        """
+        host = urlparse(url).netloc
+        headers = self.scraper.conditional_headers(url) if conditional else None
+        self.throttle.acquire(host)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if conditional and response.status_code == 304:
+                return NOT_MODIFIED
+            response.raise_for_status()
+            if conditional or remember:
+                self.scraper.remember_validators(url, response)
+            return response if keep_response else response.content
+        except Exception as e:
+            logger.warning('Crawl fetch failed for %s: %s', url, e)
+            return None
+        finally:
+            self.throttle.release(host)
+
+    def fetch_detail(self, url):
+        """Fetch an event detail page, returning the response (its validators go in the enricher's cache)"""
+        return self.fetch(url, keep_response=True)
+
+    def fetch_conditional(self, url):
+        """Fetch a page with the validators from its last response"""
+        return self.fetch(url, conditional=True)
+
+    def same_host(self, url):
+        """Check if url stays on the crawled host"""
+        return urlparse(url).netloc == self.host
+
+    def listing_category(self, url):
+        """Category slug of a /category/<slug>/ listing page, or None"""
+        match = CATEGORY_LINK_PATTERN.search(urlparse(url).path)
+        return match.group(1) if match else None
+
+    def parse_listing_page(self, page_url, content):
+        """Collect detail links (with their link text) and further listing links"""
+        return listing_links(page_url, content, self.host)
+
+    def parse_listing_pages(self, urls, pages):
+        """(url, parse_listing_page result) per fetched page, in the parse pool when there is one"""
+        if self.parse_pool is None:
+            return [(url, self.parse_listing_page(url, content)) for url, content in zip(urls, pages)
+                    if content is not None]
+        # Pages are submitted as their fetches complete, so parsing overlaps fetching
+        futures = [(url, self.parse_pool.parse_listing(url, content, self.host))
+                   for url, content in zip(urls, pages) if content is not None]
+        return [(url, future.result()) for url, future in futures]
+
+    def parse_detail_pages(self, urls, responses):
+        """Event per fetched detail page (None where the fetch failed)
+
+        Each page is parsed once, outside the host slot; with an enricher
+        the same parse also fills its cache, so enrichment skips the page.
+        """
+        keep = self.enricher is not None
+        # responses may be a lazy pool.map, so it is walked once
+        if self.parse_pool is None:
+            parsed = [(url, response,
+                       detail_event(self.scraper, url, response.content, keep) if response is not None else None)
+                      for url, response in zip(urls, responses)]
+        else:
+            tasks = [(url, response,
+                      self.parse_pool.parse_detail(url, response.content, keep) if response is not None else None)
+                     for url, response in zip(urls, responses)]
+            parsed = [(url, response, task.result() if task is not None else None) for url, response, task in tasks]
+        if not keep:
+            return [result for _, _, result in parsed]
+
+        events = []
+        for url, response, result in parsed:
+            event, details = result if result is not None else (None, None)
+            if details is not None:
+                self.enricher.cache.put(url, details, response)
+            events.append(event)
+        return events
+
+    def listing_event(self, url, title):
+        """Minimal event built from a listing link when the detail page is unavailable"""
+        if not title:
+            return None
+        return {
+            'title': title,
+            'description': 'UCF Event - Click for details',
+            'date': 'Date TBD',
+            'time': 'Time TBD',
+            'location': 'UCF Campus',
+            'link': url,
+            'image': '',
+            'source': 'UCF Events',
+            'scraped_at': datetime.now().isoformat()
+        }
+
+    def dedupe(self, events):
+        """Drop empty events and repeats of the same link"""
+        unique = []
+        seen_links = set()
+        for event in events:
+            if not event or not event.get('title'):
+                continue
+            key = event.get('link') or event['title']
+            if key in seen_links:
+                continue
+            seen_links.add(key)
+            unique.append(event)
+        return unique
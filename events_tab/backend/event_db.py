@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Event Database - the current generation mirrored into the app's Prisma SQLite file
+Each saved generation is upserted in batches into the Event table (the model
+in prisma/schema.prisma), so server.js and filtered /api/events queries read
+matching rows through its start time, location and content hash indexes.
+Rows carry the store epoch too, as a recreated store restarts at generation 1
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import timedelta
+
+from event_index import day_start, normalize_key, tokenize
+from event_model import Event, location_id
+from events_log import get_logger
+
+logger = get_logger('event_db')
+
+# Rows per executemany call; a generation is still written in one transaction
+BATCH_SIZE = 500
+
+
+class MissingGeneration(LookupError):
+    """The table does not hold the epoch and generation asked for (not written yet, or replaced)"""
+
+
+COLUMNS = ('id', 'contentHash', 'position', 'epoch', 'generation', 'title', 'description', 'dateText',
+           'timeText', 'startTs', 'endTs', 'location', 'locationId', 'categories', 'link', 'image', 'source',
+           'strategy', 'scrapedAt')
+
+# What `prisma db push` creates for the Event model, so either side can create the table first
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS "Event" ('
+    '"id" TEXT NOT NULL PRIMARY KEY, "contentHash" TEXT NOT NULL, "position" INTEGER NOT NULL, '
+    '"epoch" TEXT NOT NULL, "generation" INTEGER NOT NULL, "title" TEXT NOT NULL, "description" TEXT NOT NULL, '
+    '"dateText" TEXT NOT NULL, "timeText" TEXT NOT NULL, "startTs" INTEGER, "endTs" INTEGER, '
+    '"location" TEXT NOT NULL, "locationId" TEXT NOT NULL, "categories" TEXT NOT NULL, "link" TEXT NOT NULL, '
+    '"image" TEXT NOT NULL, "source" TEXT NOT NULL, "strategy" TEXT NOT NULL, "scrapedAt" TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS "Event_startTs_idx" ON "Event"("startTs")',
+    'CREATE INDEX IF NOT EXISTS "Event_locationId_startTs_idx" ON "Event"("locationId", "startTs")',
+    'CREATE INDEX IF NOT EXISTS "Event_contentHash_idx" ON "Event"("contentHash")'
+)
+
+UPSERT = 'INSERT INTO "Event" ({}) VALUES ({}) ON CONFLICT("id") DO UPDATE SET {}'.format(
+    ', '.join(f'"{column}"' for column in COLUMNS),
+    ', '.join('?' for _ in COLUMNS),
+    ', '.join(f'"{column}" = excluded."{column}"' for column in COLUMNS[1:])
+)
+
+
+def event_row(event, position, epoch, generation):
+    """Event table row (COLUMNS order) for a record at position in epoch and generation"""
+    return (event.id, event.fingerprint, position, epoch, generation, event.title, event.description,
+            event.date_text, event.time_text, event.start, event.end, event.location, event.location_id,
+            json.dumps(list(event.categories)), event.link, event.image, event.source, event.strategy,
+            event.scraped_at)
+
+
+def row_event(row):
+    """(position, Event) from a row selected in COLUMNS order"""
+    values = dict(zip(COLUMNS, row))
+    return values['position'], Event(
+        title=values['title'],
+        description=values['description'],
+        date_text=values['dateText'],
+        time_text=values['timeText'],
+        location=values['location'],
+        location_id=values['locationId'],
+        start=values['startTs'],
+        end=values['endTs'],
+        link=values['link'],
+        image=values['image'],
+        source=values['source'],
+        strategy=values['strategy'],
+        categories=tuple(json.loads(values['categories'])),
+        scraped_at=values['scrapedAt'],
+        id=values['id'],
+        fingerprint=values['contentHash']
+    )
+
+
+class EventDatabase:
+    """The Event table of one SQLite file, holding the newest saved generation of one store epoch.
+
+    Like SQLiteCache, each process opens one WAL-mode connection on first
+    use and serializes its statements; readers (Prisma included) keep
+    seeing the previous generation until a write commits.
+    """
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            columns = {row[1] for row in conn.execute('PRAGMA table_info("Event")')}
+            missing = set(COLUMNS) - columns
+            if columns and missing:
+                if missing != {'epoch'}:
+                    conn.close()
+                    raise sqlite3.OperationalError(f'the Event table in {self.path} is not the events model; '
+                                                   'run npm run db:push or point EVENTS_DB_FILE elsewhere')
+                # Created before rows carried the store epoch; the next write replaces its rows
+                conn.execute('ALTER TABLE "Event" ADD COLUMN "epoch" TEXT NOT NULL DEFAULT \'\'')
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _state(conn):
+        row = conn.execute('SELECT "epoch", "generation" FROM "Event" ORDER BY "generation" DESC LIMIT 1'
+                           ).fetchone()
+        return (row[0], row[1]) if row else ('', 0)
+
+    def state(self):
+        """(epoch, generation) currently in the table (('', 0) when empty)"""
+        with self._lock:
+            return self._state(self._connection())
+
+    def write(self, epoch, generation, events):
+        """Upsert events as epoch and generation and delete every other row, in one transaction
+
+        Skipped (returns False) when the table already holds this generation
+        of epoch or a newer one, e.g. written by another worker. Rows of
+        another epoch are all replaced, whatever their generation.
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                current_epoch, current = self._state(conn)
+                if current_epoch == epoch and current >= generation:
+                    conn.execute('ROLLBACK')
+                    return False
+                for first in range(0, len(events), BATCH_SIZE):
+                    conn.executemany(UPSERT, [event_row(event, first + offset, epoch, generation)
+                                              for offset, event in enumerate(events[first:first + BATCH_SIZE])])
+                conn.execute('DELETE FROM "Event" WHERE "epoch" != ? OR "generation" != ?', (epoch, generation))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        logger.info('Wrote %d events as generation %d to %s', len(events), generation, self.path)
+        return True
+
+    def search(self, epoch, generation, start=None, end=None, location=None, category=None, q=None):
+        """(position, Event) pairs of generation matching every filter, in cache order
+
+        Same semantics as EventIndex.search: dates and location go through the
+        table's indexes, category and the exact word match of q are checked
+        on the selected rows. Raises MissingGeneration when the table does
+        not hold generation of epoch.
+        """
+        words = set(tokenize(q))
+        if q is not None and not words:
+            return []
+        clauses = ['"epoch" = ?', '"generation" = ?']
+        params = [epoch, generation]
+        if start is not None:
+            clauses.append('"startTs" >= ?')
+            params.append(day_start(start))
+        if end is not None:
+            clauses.append('"startTs" < ?')
+            params.append(day_start(end + timedelta(days=1)))
+        if location:
+            clauses.append('"locationId" = ?')
+            params.append(location_id(location))
+        for word in words:
+            clauses.append('("title" LIKE ? OR "description" LIKE ?)')
+            params.extend([f'%{word}%'] * 2)
+        select = 'SELECT {} FROM "Event" WHERE {} ORDER BY "position"'.format(
+            ', '.join(f'"{column}"' for column in COLUMNS), ' AND '.join(clauses))
+
+        with self._lock:
+            conn = self._connection()
+            # One read transaction: a concurrent write cannot swap generations between the two queries
+            conn.execute('BEGIN')
+            try:
+                present = conn.execute('SELECT 1 FROM "Event" WHERE "epoch" = ? AND "generation" = ? LIMIT 1',
+                                       (epoch, generation)).fetchone()
+                rows = conn.execute(select, params).fetchall() if present else None
+            finally:
+                conn.execute('COMMIT')
+        if rows is None:
+            raise MissingGeneration(f"events database does not hold generation {generation} of epoch {epoch!r}")
+
+        matches = [row_event(row) for row in rows]
+        if category:
+            key = normalize_key(category)
+            matches = [(position, event) for position, event in matches
+                       if any(normalize_key(value) == key for value in event.categories)]
+        if words:
+            matches = [(position, event) for position, event in matches
+                       if words <= set(tokenize(event.title) + tokenize(event.description))]
+        return matches
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Event Enrichment - fills description, image and exact times from detail pages
+Each event's link is fetched through a bounded thread pool; parsed fields are
+cached per URL with a TTL and the page's ETag/Last-Modified, so an unchanged
+detail page is never downloaded or parsed again
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+from crawler import HostThrottle
+from event_sources import event_items, first_image, structured_times
+from events_log import get_logger
+from extraction import make_soup
+
+logger = get_logger('enrichment')
+
+# What the listing parsers put in description when the listing has none
+PLACEHOLDER_DESCRIPTION = 'UCF Event - Click for details'
+PLACEHOLDER_DESCRIPTIONS = {'', PLACEHOLDER_DESCRIPTION, 'No description available'}
+UNKNOWN_DATES = {'', 'Date TBD', 'Today'}
+UNKNOWN_TIMES = {'', 'Time TBD'}
+
+# Cached pages are reused without a request for this long, then revalidated
+DETAIL_TTL = 12 * 60 * 60
+
+# What refreshing one stale detail page came to
+FETCHED = 'fetched'
+REVALIDATED = 'revalidated'
+FAILED = 'failed'
+
+DESCRIPTION_SELECTORS = ['.event-description', '.description', '[itemprop="description"]', '.summary',
+                         'article p', 'main p']
+
+
+def needs_enrichment(event):
+    """Check if an event still lacks a description, image or exact start"""
+    return bool(event.get('link')) and (
+        (event.get('description') or '') in PLACEHOLDER_DESCRIPTIONS
+        or not event.get('image')
+        or (event.get('date') or '') in UNKNOWN_DATES
+        or (event.get('time') or '') in UNKNOWN_TIMES
+    )
+
+
+def json_ld_event(soup):
+    """First JSON-LD Event object on a page, or None"""
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        for item in event_items(data):
+            return item
+    return None
+
+
+def parse_detail_page(content, url):
+    """Description, image, start and end (ISO strings) found on a detail page"""
+    return detail_fields(make_soup(content), url)
+
+
+def detail_fields(soup, url):
+    """parse_detail_page on an already parsed page"""
+    details = {}
+    data = json_ld_event(soup)
+    if data:
+        details['description'] = ' '.join(str(data.get('description') or '').split())
+        details['image'] = first_image(data.get('image'))
+        details['start'] = data.get('startDate') or ''
+        details['end'] = data.get('endDate') or ''
+
+    if not details.get('description'):
+        meta = soup.find('meta', attrs={'property': 'og:description'}) or soup.find('meta', attrs={'name': 'description'})
+        text = meta.get('content', '') if meta else ''
+        for selector in DESCRIPTION_SELECTORS:
+            if text:
+                break
+            element = soup.select_one(selector)
+            text = element.get_text(' ', strip=True) if element else ''
+        details['description'] = ' '.join(text.split())
+    if not details.get('image'):
+        meta = soup.find('meta', attrs={'property': 'og:image'})
+        details['image'] = meta.get('content', '') if meta else ''
+    if not details.get('start'):
+        times = [element.get('datetime') for element in soup.find_all('time') if element.get('datetime')]
+        details['start'] = times[0] if times else ''
+        details['end'] = times[1] if len(times) > 1 else ''
+
+    if details['image']:
+        details['image'] = urljoin(url, details['image'])
+    return {key: value for key, value in details.items() if value}
+
+
+def apply_details(event, details):
+    """Fill the event's missing fields from parsed detail-page fields"""
+    if details.get('description') and (event.get('description') or '') in PLACEHOLDER_DESCRIPTIONS:
+        event['description'] = details['description']
+    if details.get('image') and not event.get('image'):
+        event['image'] = details['image']
+
+    date_text, time_text = structured_times(details.get('start'), details.get('end'))
+    if date_text:
+        event['date'] = date_text
+    if time_text:
+        event['time'] = time_text
+    return event
+
+
+def pending_links(cache, events):
+    """({link: events needing it}, links the cache can't answer without a request)"""
+    cache.load()
+    pending = {}
+    for event in events:
+        if event and needs_enrichment(event) and urlparse(event['link']).scheme in ('http', 'https'):
+            pending.setdefault(event['link'], []).append(event)
+    stale = []
+    for url in pending:
+        entry = cache.get(url)
+        if entry is None or not cache.is_fresh(entry):
+            stale.append(url)
+    return pending, stale
+
+
+def revalidation_headers(entry):
+    """If-None-Match/If-Modified-Since for a cached detail page"""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def apply_cached(cache, events, pending, outcomes, started):
+    """Fill pending events from the cache, prune and save it; returns events
+
+    outcomes holds FETCHED, REVALIDATED or FAILED per stale link refreshed.
+    """
+    for url, url_events in pending.items():
+        entry = cache.get(url)
+        if entry:
+            for event in url_events:
+                apply_details(event, entry['details'])
+
+    cache.retain({event.get('link') for event in events if event})
+    cache.save()
+    counts = Counter(outcomes)
+    logger.info('Enriched %d events: %d detail pages fetched, %d revalidated, %d failed, %d cached in %.2fs',
+                len(pending), counts[FETCHED], counts[REVALIDATED], counts[FAILED], len(pending) - len(outcomes),
+                time.monotonic() - started)
+    return events
+
+
+class DetailCache:
+    """Parsed detail-page fields per URL with their validators and fetch time.
+
+    Saved as a JSON file (written to a temp file and renamed into place) so
+    the cache survives restarts; only the refreshing worker writes it.
+    """
+
+    def __init__(self, path=None, ttl=DETAIL_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        """Read the cache file once (missing or corrupt files start empty)"""
+        if self._loaded or not self.path:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning('Ignoring unreadable detail cache %s: %s', self.path, e)
+
+    def save(self):
+        """Atomically replace the cache file"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                with self._lock:
+                    json.dump(self.entries, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, url):
+        with self._lock:
+            return self.entries.get(url)
+
+    def is_fresh(self, entry):
+        """Check if an entry can be used without asking upstream"""
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, url, details, response):
+        """Remember the fields parsed from a 200 response"""
+        with self._lock:
+            self.entries[url] = {
+                'fetched_at': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'details': details
+            }
+
+    def touch(self, url):
+        """Restart the TTL of an entry upstream confirmed unchanged (304)"""
+        with self._lock:
+            self.entries[url]['fetched_at'] = time.time()
+
+    def retain(self, urls):
+        """Drop entries for links no longer in the scrape"""
+        with self._lock:
+            self.entries = {url: entry for url, entry in self.entries.items() if url in urls}
+
+
+class EventEnricher:
+    """Fill in events from their detail pages, fetching only what the cache can't answer"""
+
+    def __init__(self, session, cache=None, max_workers=8, per_host_delay=0.25, max_per_host=4, timeout=15,
+                 parse_pool=None):
+        # Shared with the scraper, which sizes its connection pool
+        self.session = session
+        self.cache = cache or DetailCache()
+        # ParsePool to parse fetched pages in; None parses in the fetch threads
+        self.parse_pool = parse_pool
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.throttle = HostThrottle(per_host_delay, max_per_host)
+
+    def enrich(self, events):
+        """Fill missing fields of events in place and return them"""
+        started = time.monotonic()
+        pending, stale = pending_links(self.cache, events)
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='events-enrich') as pool:
+                outcomes = list(pool.map(self.refresh, stale))
+        else:
+            outcomes = []
+        return apply_cached(self.cache, events, pending, outcomes, started)
+
+    def parse(self, content, url):
+        if self.parse_pool is not None:
+            return self.parse_pool.parse_detail_fields(content, url).result()
+        return parse_detail_page(content, url)
+
+    def refresh(self, url):
+        """Revalidate or fetch one detail page; returns FETCHED, REVALIDATED or FAILED"""
+        entry = self.cache.get(url)
+        headers = revalidation_headers(entry)
+
+        host = urlparse(url).netloc
+        self.throttle.acquire(host)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if entry and response.status_code == 304:
+                self.cache.touch(url)
+                return REVALIDATED
+            response.raise_for_status()
+        except Exception as e:
+            # A stale entry is still better than nothing
+            logger.warning('Detail fetch failed for %s: %s', url, e)
+            return FAILED
+        finally:
+            self.throttle.release(host)
+
+        # Parsed once the host slot is free again, so parsing never holds up fetches
+        try:
+            self.cache.put(url, self.parse(response.content, url), response)
+        except Exception as e:
+            logger.warning('Detail parse failed for %s: %s', url, e)
+            return FAILED
+        return FETCHED
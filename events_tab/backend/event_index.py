@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Event Index - per-generation lookup structures behind /api/events queries
+Token, start-time, location and category indexes plus pre-serialized events,
+so a filtered page costs what its matches and page size cost
+"""
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from event_model import as_event, from_timestamp, location_id, to_timestamp
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Largest page a client may ask for
+MAX_LIMIT = 500
+
+
+def public_event(event):
+    """Public API shape of one event record"""
+    return {
+        'id': event.id,
+        'title': event.title,
+        'description': event.description,
+        'date': event.date_text,
+        'time': event.time_text,
+        'start': from_timestamp(event.start).isoformat() if event.start is not None else None,
+        'end': from_timestamp(event.end).isoformat() if event.end is not None else None,
+        'location': event.location,
+        'location_id': event.location_id,
+        'categories': list(event.categories),
+        'link': event.link,
+        'image': event.image,
+        'source': event.source,
+        'strategy': event.strategy,
+        'scraped_at': event.scraped_at
+    }
+
+
+def event_fragment(event):
+    """Serialized public JSON of one event record"""
+    return json.dumps(public_event(event), separators=(',', ':')).encode('utf-8')
+
+
+def generation_tag(epoch, generation):
+    """Generation qualified by its store epoch, as sent to clients and used in ETags and cache keys"""
+    return f"{epoch}.{generation}" if epoch else str(generation)
+
+
+def parse_generation_tag(tag):
+    """(epoch, generation) of a generation_tag (ValueError when malformed)"""
+    epoch, _, generation = tag.rpartition('.')
+    if not generation.isdigit():
+        raise ValueError(f"{tag!r} is not a generation from an earlier response")
+    return epoch, int(generation)
+
+
+def transform_events(events):
+    """Shape cached events into the public API format"""
+    return [public_event(as_event(event)) for event in events]
+
+
+def tokenize(text):
+    """Lowercase word tokens of text"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def normalize_key(text):
+    """Hash key for a category (case and spacing insensitive)"""
+    return ' '.join(str(text).lower().split())
+
+
+def parse_query_date(value):
+    """YYYY-MM-DD query parameter as a date (ValueError when malformed)"""
+    return date.fromisoformat(value) if value else None
+
+
+def day_start(day):
+    """Wall-clock timestamp of midnight starting day"""
+    return to_timestamp(datetime.combine(day, datetime.min.time()))
+
+
+class EventIndex:
+    """Indexes over one cache generation, built once and then read-only.
+
+    Events are addressed by their position in the generation; every index
+    maps a key to ascending positions, so filters intersect as sets and the
+    result stays in cache order for cursor pagination. Given the previous
+    generation's index, unchanged events (same id and fingerprint) reuse
+    their serialized JSON and tokens, so only what a scrape changed is redone.
+    """
+
+    def __init__(self, events, generation=0, scraped_at=None, previous=None, epoch=''):
+        self.generation = generation
+        self.epoch = epoch
+        self.tag = generation_tag(epoch, generation)
+        self.scraped_at = scraped_at
+        self.records = [as_event(event) for event in events]
+        self.fragments = []
+        self.entries = {}
+        self.positions = {}
+        self.tokens = defaultdict(list)
+        self.locations = defaultdict(list)
+        self.categories = defaultdict(list)
+        self._full_body = None
+        reusable = previous.entries if previous is not None else {}
+        dated = []
+
+        for position, event in enumerate(self.records):
+            entry = reusable.get(event.id)
+            if entry is None or entry[0] != event.fingerprint:
+                entry = (event.fingerprint, event_fragment(event), frozenset(tokenize(event.title) + tokenize(event.description)))
+            self.entries[event.id] = entry
+            self.positions[event.id] = position
+            self.fragments.append(entry[1])
+            for token in entry[2]:
+                self.tokens[token].append(position)
+            self.locations[event.location_id].append(position)
+            for category in event.categories:
+                self.categories[normalize_key(category)].append(position)
+            if event.start is not None:
+                dated.append((event.start, position))
+
+        dated.sort()
+        self.date_keys = [start for start, _ in dated]
+        self.date_positions = [position for _, position in dated]
+
+    def __len__(self):
+        return len(self.records)
+
+    def search(self, start=None, end=None, location=None, category=None, q=None):
+        """Ascending positions of events matching every given filter
+
+        start/end are inclusive dates (events starting on them count);
+        location is a location string or ID; q matches when every word of it
+        is a word of the title or description.
+        """
+        candidates = []
+        if start is not None or end is not None:
+            lo = bisect_left(self.date_keys, day_start(start)) if start else 0
+            hi = bisect_left(self.date_keys, day_start(end + timedelta(days=1))) if end else len(self.date_keys)
+            candidates.append(self.date_positions[lo:hi])
+        if location:
+            candidates.append(self.locations.get(location_id(location), []))
+        if category:
+            candidates.append(self.categories.get(normalize_key(category), []))
+        for token in set(tokenize(q)):
+            candidates.append(self.tokens.get(token, []))
+        if q is not None and not tokenize(q):
+            candidates.append([])
+
+        if not candidates:
+            return range(len(self.records))
+        # Intersect from the most selective filter up
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for positions in candidates[1:]:
+            if not matches:
+                break
+            matches.intersection_update(positions)
+        return sorted(matches)
+
+    def page(self, positions, limit=None, cursor=None):
+        """Slice of positions after cursor, and the cursor for the next slice"""
+        return page_positions(positions, self.tag, limit, cursor)
+
+    def full_body(self):
+        """/api/events JSON body with every event (built once)"""
+        if self._full_body is None:
+            self._full_body = self.body(range(len(self.records)))
+        return self._full_body
+
+    def body(self, positions, total=None, next_cursor=None):
+        """/api/events JSON body for the events at positions"""
+        return events_body(self.tag, self.scraped_at, [self.fragments[position] for position in positions],
+                           total, next_cursor)
+
+    def changes_body(self, since, added, updated, removed):
+        """/api/events/changes JSON body for ID sets from ChangeLog.since"""
+        head = {
+            'success': True,
+            'full': False,
+            'since': since,
+            'generation': self.tag,
+            'scraped_at': self.scraped_at,
+            'removed': sorted(removed)
+        }
+        return compose_body(head, added=self.fragments_for(added), updated=self.fragments_for(updated))
+
+    def snapshot_body(self, since):
+        """/api/events/changes JSON body when a delta is not possible: every event"""
+        head = {
+            'success': True,
+            'full': True,
+            'since': since,
+            'generation': self.tag,
+            'scraped_at': self.scraped_at
+        }
+        return compose_body(head, events=self.fragments)
+
+    def fragments_for(self, ids):
+        """Serialized events for ids, in cache order"""
+        return [self.fragments[position] for position in sorted(self.positions[i] for i in ids if i in self.positions)]
+
+
+def page_positions(positions, tag, limit=None, cursor=None):
+    """Slice of ascending positions after cursor, and the cursor for the next slice
+
+    Cursors are "<generation_tag>.<last position>", so one from another
+    generation or store epoch is refused.
+    """
+    first = 0
+    if cursor:
+        cursor_tag, _, last = cursor.rpartition('.')
+        if cursor_tag != tag or not last.isdigit():
+            raise ValueError('cursor is from another cache generation, start again without it')
+        first = bisect_right(positions, int(last))
+    if limit is None:
+        return positions[first:], None
+    selected = positions[first:first + limit]
+    more = first + limit < len(positions)
+    return selected, f"{tag}.{selected[-1]}" if more and selected else None
+
+
+def events_body(tag, scraped_at, fragments, total=None, next_cursor=None):
+    """/api/events JSON body of serialized events from the generation named by tag"""
+    head = {
+        'success': True,
+        'count': len(fragments),
+        'generation': tag,
+        'scraped_at': scraped_at,
+        'cached': True
+    }
+    if total is not None:
+        head['total'] = total
+        head['next_cursor'] = next_cursor
+    return compose_body(head, events=fragments)
+
+
+def compose_body(head, **arrays):
+    """JSON object of head plus arrays of already-serialized items"""
+    parts = [json.dumps(head, separators=(',', ':'))[:-1].encode('utf-8')]
+    for key, items in arrays.items():
+        parts.append(f',"{key}":['.encode('utf-8'))
+        parts.append(b','.join(items))
+        parts.append(b']')
+    parts.append(b'}')
+    return b''.join(parts)
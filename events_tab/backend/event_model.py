@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Event Model - the typed event record built once per scrape
+Parses the free-form date/time/location strings from the scrapers into
+timestamps and a canonical location ID, gives each event a stable ID and
+diffs one scrape against the previous one
+"""
+
+import hashlib
+import json
+import re
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+ISO_DATE_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}))?')
+DATE_FORMATS = ['%B %d, %Y', '%b %d, %Y', '%m/%d/%Y', '%A, %B %d, %Y']
+CLOCK_PATTERN = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?', re.I)
+BARE_CLOCK_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+NAMED_TIMES = {'morning': (9, 0), 'afternoon': (13, 0), 'evening': (18, 0), 'night': (20, 0)}
+
+# Timestamps are wall-clock seconds since this (campus local time, no zone)
+EPOCH = datetime(1970, 1, 1)
+
+DEFAULT_LOCATION_ID = 'ucf-campus'
+UNKNOWN_LOCATIONS = {'', 'tbd', 'tba', 'ucf-campus', 'campus', 'ucf'}
+
+# Query parameters that do not change which event a link points at
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_')
+
+
+def to_timestamp(moment):
+    """Wall-clock seconds for a naive datetime"""
+    return int((moment - EPOCH).total_seconds())
+
+
+def from_timestamp(seconds):
+    """Naive datetime for wall-clock seconds"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def parse_date(text, scraped_at=None):
+    """(date, time-of-day or None) from a date string like 'Today', ISO or 'October 30, 2024'"""
+    text = (text or '').strip()
+    if text.lower() == 'today':
+        text = (scraped_at or '')[:10]
+    match = ISO_DATE_PATTERN.match(text)
+    if match:
+        year, month, day, hour, minute = match.groups()
+        try:
+            day_of = date(int(year), int(month), int(day))
+        except ValueError:
+            return None, None
+        return day_of, (int(hour), int(minute)) if hour else None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date(), None
+        except ValueError:
+            continue
+    return None, None
+
+
+def parse_clock(text):
+    """(hour, minute) times in text, in order ('10:00 AM - 2:00 PM' gives two)"""
+    text = text or ''
+    times = []
+    for hour, minute, meridiem in CLOCK_PATTERN.findall(text):
+        hour = int(hour) % 12 + (12 if meridiem.lower() == 'p' else 0)
+        times.append((hour, int(minute or 0)))
+    if not times:
+        match = BARE_CLOCK_PATTERN.match(text.strip())
+        if match:
+            times.append((int(match.group(1)), int(match.group(2))))
+        else:
+            lowered = text.lower()
+            times.extend(value for name, value in NAMED_TIMES.items() if name in lowered)
+    return [(hour, minute) for hour, minute in times if hour < 24 and minute < 60]
+
+
+def location_id(location):
+    """Canonical ID for a location string ('Student Union: Room 218' -> 'student-union-room-218')"""
+    slug = re.sub(r'[^a-z0-9]+', '-', (location or '').lower().replace('&', ' and ')).strip('-')
+    if slug.startswith('ucf-') and slug != 'ucf-campus':
+        slug = slug[4:]
+    return DEFAULT_LOCATION_ID if slug in UNKNOWN_LOCATIONS else slug
+
+
+def canonical_url(link):
+    """Link without scheme, fragment, tracking parameters or trailing slash"""
+    parts = urlsplit((link or '').strip())
+    if not parts.netloc:
+        return parts.path.strip()
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith(TRACKING_PARAMS))
+    path = parts.path.rstrip('/') or '/'
+    return parts.netloc.lower() + path + ('?' + urlencode(query) if query else '')
+
+
+def event_id(link, title, start):
+    """Deterministic ID from the canonical URL (or the title without one) and start time"""
+    key = canonical_url(link) or 'title:' + ' '.join(title.lower().split())
+    return hashlib.sha1(f"{key}\x1f{start}".encode('utf-8')).hexdigest()[:16]
+
+
+class Event:
+    """One event: display strings as scraped plus parsed, comparable fields.
+
+    start/end are wall-clock seconds (None when the date is unknown). id
+    names the event (URL and start time) and stays the same across scrapes;
+    fingerprint hashes everything shown, so it changes when the event is edited.
+    """
+
+    __slots__ = ('title', 'description', 'date_text', 'time_text', 'location', 'location_id', 'start', 'end',
+                 'link', 'image', 'source', 'strategy', 'categories', 'scraped_at', 'id', 'fingerprint')
+
+    def __init__(self, title, description='No description available', date_text='Date TBD', time_text='Time TBD',
+                 location='UCF Campus', location_id=DEFAULT_LOCATION_ID, start=None, end=None, link='', image='',
+                 source='KnightConnect', strategy='html', categories=(), scraped_at='', id='', fingerprint=''):
+        self.title = title
+        self.description = description
+        self.date_text = date_text
+        self.time_text = time_text
+        self.location = location
+        self.location_id = location_id
+        self.start = start
+        self.end = end
+        self.link = link
+        self.image = image
+        self.source = source
+        # Which source strategy found the event (json-ld, json-feed, ical or html)
+        self.strategy = strategy
+        self.categories = categories
+        self.scraped_at = scraped_at
+        self.id = id or event_id(link, title, start)
+        self.fingerprint = fingerprint or self.content_hash()
+
+    def content_hash(self):
+        """Hash of every displayed field (scrape time excluded)"""
+        content = [self.title, self.description, self.date_text, self.time_text, self.location,
+                   self.start, self.end, self.link, self.image, self.source, self.strategy, list(self.categories)]
+        return hashlib.sha1(json.dumps(content).encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def from_scraped(cls, raw):
+        """Build the record from a scraper dict, parsing date, time and location"""
+        scraped_at = raw.get('scraped_at') or datetime.now().isoformat()
+        date_text = raw.get('date') or 'Date TBD'
+        time_text = raw.get('time') or 'Time TBD'
+        day, iso_time = parse_date(date_text, scraped_at)
+
+        start = end = None
+        if day is not None:
+            clock = parse_clock(time_text)
+            if iso_time:
+                clock.insert(0, iso_time)
+            start_moment = datetime.combine(day, datetime.min.time())
+            if clock:
+                start_moment = start_moment.replace(hour=clock[0][0], minute=clock[0][1])
+            start = to_timestamp(start_moment)
+            if len(clock) > 1:
+                end_moment = start_moment.replace(hour=clock[1][0], minute=clock[1][1])
+                if end_moment < start_moment:
+                    end_moment += timedelta(days=1)
+                end = to_timestamp(end_moment)
+
+        location = raw.get('location') or 'UCF Campus'
+        return cls(
+            title=(raw.get('title') or 'Untitled Event').strip(),
+            description=raw.get('description') or 'No description available',
+            date_text=date_text,
+            time_text=time_text,
+            location=location,
+            location_id=location_id(location),
+            start=start,
+            end=end,
+            link=raw.get('link') or '',
+            image=raw.get('image') or '',
+            source=raw.get('source') or 'KnightConnect',
+            strategy=raw.get('strategy') or 'html',
+            categories=tuple(raw.get('categories') or ()),
+            scraped_at=scraped_at
+        )
+
+    @classmethod
+    def from_stored(cls, stored):
+        """Rebuild a record saved with to_dict (no re-parsing)"""
+        # Records saved before fingerprints existed carry a content hash as id
+        current = 'fingerprint' in stored
+        return cls(
+            title=stored['title'],
+            description=stored['description'],
+            date_text=stored['date'],
+            time_text=stored['time'],
+            location=stored['location'],
+            location_id=stored['location_id'],
+            start=stored['start_ts'],
+            end=stored['end_ts'],
+            link=stored['link'],
+            image=stored['image'],
+            source=stored['source'],
+            strategy=stored.get('strategy', 'html'),
+            categories=tuple(stored['categories']),
+            scraped_at=stored['scraped_at'],
+            id=stored['id'] if current else '',
+            fingerprint=stored['fingerprint'] if current else ''
+        )
+
+    def to_dict(self):
+        """JSON-ready dict: the original keys plus the parsed fields"""
+        return {
+            'id': self.id,
+            'fingerprint': self.fingerprint,
+            'title': self.title,
+            'description': self.description,
+            'date': self.date_text,
+            'time': self.time_text,
+            'start': from_timestamp(self.start).isoformat() if self.start is not None else None,
+            'end': from_timestamp(self.end).isoformat() if self.end is not None else None,
+            'start_ts': self.start,
+            'end_ts': self.end,
+            'location': self.location,
+            'location_id': self.location_id,
+            'categories': list(self.categories),
+            'link': self.link,
+            'image': self.image,
+            'source': self.source,
+            'strategy': self.strategy,
+            'scraped_at': self.scraped_at
+        }
+
+
+def as_event(value):
+    """Event from a record, a stored dict or a raw scraper dict"""
+    if isinstance(value, Event):
+        return value
+    if 'location_id' in value and 'start_ts' in value:
+        return Event.from_stored(value)
+    return Event.from_scraped(value)
+
+
+def normalize_events(events):
+    """Typed records for a scrape, dropping repeats of the same event"""
+    records = []
+    seen = set()
+    for raw in events:
+        if not raw or not raw.get('title'):
+            continue
+        event = Event.from_scraped(raw)
+        if event.id in seen:
+            continue
+        seen.add(event.id)
+        records.append(event)
+    return records
+
+
+class EventDiff:
+    """What one scrape changed: added and updated records, removed IDs"""
+
+    __slots__ = ('added', 'updated', 'removed')
+
+    def __init__(self, added=None, updated=None, removed=None):
+        self.added = added if added is not None else []
+        self.updated = updated if updated is not None else []
+        self.removed = removed if removed is not None else []
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def summary(self):
+        return f"+{len(self.added)} ~{len(self.updated)} -{len(self.removed)}"
+
+
+def diff_events(previous, current):
+    """Diff two generations of records by ID, comparing fingerprints"""
+    before = {event.id: event.fingerprint for event in previous}
+    diff = EventDiff()
+    current_ids = set()
+    for event in current:
+        current_ids.add(event.id)
+        fingerprint = before.get(event.id)
+        if fingerprint is None:
+            diff.added.append(event)
+        elif fingerprint != event.fingerprint:
+            diff.updated.append(event)
+    diff.removed = [event.id for event in previous if event.id not in current_ids]
+    return diff
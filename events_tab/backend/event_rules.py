@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Event Classification Rules - every keyword and regex rule used to recognise
+UCF events, compiled once at import into combined regexes
+"""
+
+import re
+
+# Exact benchmark event titles (matched as lowercase substrings)
+BENCHMARK_TITLES = [
+    'ace personal training certification course',
+    'innovation tournament 2025',
+    'ucf alumknights give back',
+    'knight for a day open house',
+    'ucf volleyball vs. texas tech',
+    'spanish cinema now + 2025: por donde pasa el silencio',
+    'urinetown: the musical | theatre ucf'
+]
+
+# Looser key terms that also identify a benchmark title
+BENCHMARK_KEY_TERMS = [
+    'ace personal training',
+    'innovation tournament',
+    'alumknights give back',
+    'knight for a day',
+    'volleyball vs texas tech',
+    'spanish cinema now',
+    'urinetown musical',
+    'theatre ucf'
+]
+
+# Text that marks a page block as holding a benchmark event
+BENCHMARK_KEYWORDS = [
+    'ace personal training', 'innovation tournament', 'alumknights give back',
+    'knight for a day', 'volleyball vs', 'spanish cinema', 'urinetown'
+]
+SECTION_KEYWORDS = ['ace personal training', 'innovation tournament', 'alumknights give back']
+
+# Benchmark title shapes (searched anywhere in the lowercase title)
+BENCHMARK_PATTERNS = [
+    r'ace.*personal.*training',              # ACE Personal Training Certification Course
+    r'innovation.*tournament',               # Innovation Tournament 2025
+    r'ucf.*alumknights.*give.*back',         # UCF AlumKnights Give Back
+    r'knight.*for.*a.*day.*open.*house',     # Knight for a Day Open House
+    r'ucf.*volleyball.*vs',                  # UCF Volleyball vs. Texas Tech
+    r'spanish.*cinema.*now',                 # Spanish Cinema Now
+    r'urinetown.*musical',                   # Urinetown: The Musical
+    r'theatre.*ucf'                          # Theatre UCF
+]
+
+EVENT_INDICATORS = [
+    'training', 'course', 'workshop', 'seminar', 'conference', 'session',
+    'fair', 'expo', 'symposium', 'lecture', 'presentation', 'talk',
+    'discussion', 'meeting', 'tournament', 'tour', 'open house', 'certification',
+    'competition', 'show', 'performance', 'concert', 'game', 'match', 'vs',
+    'volleyball', 'basketball', 'football', 'soccer', 'tennis', 'swimming',
+    'cinema', 'movie', 'film', 'musical', 'theater', 'theatre', 'play',
+    'give back', 'volunteer', 'service', 'community', 'alumni', 'alumknights',
+    'ace', 'personal', 'innovation', 'knight', 'spanish', 'urinetown'
+]
+
+# Navigation and UI text that is not an event title (when the title is short)
+NAVIGATION_KEYWORDS = [
+    'login', 'register', 'sign up', 'contact', 'about', 'home', 'menu',
+    'navigation', 'footer', 'header', 'search', 'filter', 'sort', 'view',
+    'calendar', 'today', 'events', 'ucf', 'university', 'orlando',
+    'october', 'november', 'december', 'january', 'february', 'march',
+    'april', 'may', 'june', 'july', 'august', 'september',
+    'loading', 'error', 'warning', 'notice', 'alert', 'message'
+]
+
+# Calendar and navigation shapes (matched at the start of the title)
+CALENDAR_PATTERNS = [
+    r'^[A-Za-z]{3,9}\d{4}$',  # MonthYear like "October2025"
+    r'^[A-Za-z]{2}\d+[A-Za-z]{2}\d+',  # Calendar grid like "SuMTuWThFSa2829301234567891011121314"
+    r'^\d{1,2}:\d{2}$',  # Just time like "12:00"
+    r'^[A-Za-z]{3,9}$',  # Just month names like "October"
+    r'^\d{1,2}$',  # Just day numbers
+    r'^[A-Za-z]{2,3}$'  # Day abbreviations like "Su", "MT", "Tu"
+]
+STRICT_CALENDAR_PATTERNS = CALENDAR_PATTERNS + [
+    r'^\d+$',  # Just numbers
+    r'^[A-Za-z]+$',  # Just letters (single words)
+    r'^[A-Za-z]+\d+$',  # Letters followed by numbers
+    r'^\d+[A-Za-z]+$',  # Numbers followed by letters
+]
+
+
+# Below this many keywords plain substring tests beat a combined regex
+REGEX_MIN_KEYWORDS = 16
+
+
+def alternation(keywords):
+    """Regex alternation of keywords, longest first"""
+    return '|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+
+
+def keyword_matcher(keywords):
+    """Predicate telling whether text, lowercased, contains any of keywords"""
+    keywords = tuple(sorted(set(keywords), key=len, reverse=True))
+    if len(keywords) >= REGEX_MIN_KEYWORDS:
+        search = re.compile(alternation(keywords)).search
+        return lambda text: search(text.lower()) is not None
+
+    def contains(text):
+        lowered = text.lower()
+        for keyword in keywords:
+            if keyword in lowered:
+                return True
+        return False
+    return contains
+
+
+class KeywordRules:
+    """Named keyword lists compiled once into matchers.
+
+    Lowercases the text once per check; big keyword sets are answered by a
+    single combined regex search, small ones by substring tests.
+    rules_matching() tells which rules hit from one match of a pattern with
+    a lookahead group per rule.
+    """
+
+    def __init__(self, rules):
+        self._keywords = {name: list(keywords) for name, keywords in rules.items()}
+        self._matchers = {}
+        self._scanners = {}
+
+    def _matcher(self, names):
+        # Built on first use for each combination of rules, then reused
+        matcher = self._matchers.get(names)
+        if matcher is None:
+            matcher = self._matchers[names] = keyword_matcher(k for name in names for k in self._keywords[name])
+        return matcher
+
+    def _scanner(self, names):
+        scanner = self._scanners.get(names)
+        if scanner is None:
+            # Each optional lookahead searches the whole text for its rule and captures the first hit
+            pattern = ''.join(f'(?=.*?({alternation(self._keywords[name])}))?' for name in names)
+            scanner = self._scanners[names] = re.compile(pattern, re.DOTALL).match
+        return scanner
+
+    def rules_matching(self, text, names=None):
+        """Names of the rules (all, or only names) with a keyword in text"""
+        names = tuple(names or self._keywords)
+        groups = self._scanner(names)(text.lower()).groups()
+        return {name for name, group in zip(names, groups) if group is not None}
+
+    def matcher(self, *names):
+        """Predicate on text for the named rules, for call sites that check many texts"""
+        return self._matcher(names)
+
+    def matches(self, text, *names):
+        """Check if any of the named rules has a keyword in text"""
+        matcher = self._matchers.get(names)
+        if matcher is None:
+            matcher = self._matcher(names)
+        return matcher(text)
+
+    def contains_any(self, text):
+        """Check if text contains a keyword of any rule"""
+        return self.matches(text, *self._keywords)
+
+
+class PatternRules:
+    """Regex list compiled into one alternation of named groups"""
+
+    def __init__(self, patterns, flags=0, anchored=False):
+        self.patterns = list(patterns)
+        self._compiled = [re.compile(pattern, flags) for pattern in self.patterns]
+        self._combined = re.compile(
+            '|'.join(f'(?P<rule{i}>{pattern})' for i, pattern in enumerate(self.patterns)),
+            flags
+        )
+        self._find = self._combined.match if anchored else self._combined.search
+        self._anchored = anchored
+
+    def first(self, text):
+        """Pattern of the rule that matched (leftmost match), or None"""
+        match = self._find(text)
+        if not match:
+            return None
+        return self.patterns[int(match.lastgroup[4:])]
+
+    def matching(self, text):
+        """Every pattern that matches text (individual checks only after a combined hit)"""
+        if not self._find(text):
+            return []
+        find = 'match' if self._anchored else 'search'
+        return [p for p, regex in zip(self.patterns, self._compiled) if getattr(regex, find)(text)]
+
+
+# Compiled once at import, shared by every scraper instance
+TITLE_RULES = KeywordRules({
+    'benchmark_title': BENCHMARK_TITLES,
+    'benchmark_term': BENCHMARK_KEY_TERMS,
+    'benchmark_keyword': BENCHMARK_KEYWORDS,
+    'event_indicator': EVENT_INDICATORS,
+    'navigation': NAVIGATION_KEYWORDS
+})
+BLOCK_RULES = KeywordRules({'benchmark_keyword': BENCHMARK_KEYWORDS})
+SECTION_RULES = KeywordRules({'section_keyword': SECTION_KEYWORDS})
+BENCHMARK_TITLE_PATTERNS = PatternRules(BENCHMARK_PATTERNS)
+CALENDAR_TITLE_PATTERNS = PatternRules(CALENDAR_PATTERNS, anchored=True)
+STRICT_CALENDAR_TITLE_PATTERNS = PatternRules(STRICT_CALENDAR_PATTERNS, anchored=True)
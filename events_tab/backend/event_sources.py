@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Event Sources - structured sources tried before the HTML heuristics
+JSON-LD blocks in the page, then the calendar's JSON and iCal feeds (parsed
+as streams, one item at a time); each event records the strategy that found it
+"""
+
+import json
+import re
+from datetime import datetime
+from urllib.parse import urljoin
+
+from events_log import get_logger
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        CAMPUS_TIMEZONE = ZoneInfo('America/New_York')
+    except ZoneInfoNotFoundError:  # No tz database (Windows without tzdata)
+        CAMPUS_TIMEZONE = None
+except ImportError:
+    CAMPUS_TIMEZONE = None
+
+logger = get_logger('sources')
+
+STRATEGY_JSON_LD = 'json-ld'
+STRATEGY_JSON_FEED = 'json-feed'
+STRATEGY_ICAL = 'ical'
+STRATEGY_HTML = 'html'
+
+# Feeds tried relative to the listing page when it doesn't advertise any
+DEFAULT_FEED_PATHS = ['feed.json', 'feed.ics']
+FEED_TYPES = {
+    'application/json': STRATEGY_JSON_FEED,
+    'application/feed+json': STRATEGY_JSON_FEED,
+    'text/calendar': STRATEGY_ICAL
+}
+
+JSON_LD_PATTERN = re.compile(r'<script\b[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>', re.I | re.S)
+LINK_TAG_PATTERN = re.compile(r'<link\b[^>]*>', re.I)
+ATTRIBUTE_PATTERN = re.compile(r'([a-z-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+ICAL_DATE_PATTERN = re.compile(r'^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})(\d{2})?(Z)?)?$')
+ICAL_ESCAPES = {'n': '\n', 'N': '\n', ',': ',', ';': ';', '\\': '\\'}
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+
+def parse_iso_moment(value):
+    """Campus wall-clock datetime of an ISO 8601 string, or None"""
+    try:
+        moment = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    if moment.tzinfo is not None and CAMPUS_TIMEZONE is not None:
+        moment = moment.astimezone(CAMPUS_TIMEZONE)
+    return moment.replace(tzinfo=None)
+
+
+def format_clock(moment):
+    """'2:30 PM' style time of day"""
+    return moment.strftime('%I:%M %p').lstrip('0')
+
+
+def structured_times(start, end=None):
+    """(date text, time text) for ISO start/end in the forms event_model parses
+
+    Either is None when unknown; time text is 'start - end' when both fall
+    on the same day.
+    """
+    moment = parse_iso_moment(start) if start else None
+    if moment is None:
+        return None, None
+    start = str(start).strip()
+    if 'T' not in start and ' ' not in start:
+        return moment.date().isoformat(), None
+    clock = format_clock(moment)
+    finish = parse_iso_moment(end) if end else None
+    if finish is not None and finish > moment and finish.date() == moment.date():
+        clock += ' - ' + format_clock(finish)
+    return moment.date().isoformat(), clock
+
+
+def first_image(value):
+    """Image URL from a string, a list or an ImageObject"""
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('url') or value.get('contentUrl') or ''
+    return value if isinstance(value, str) else ''
+
+
+def location_name(value):
+    """Display name of a Place, an address or a plain string"""
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('title') or location_name(value.get('address'))
+        if isinstance(value, dict):
+            value = value.get('streetAddress') or ''
+    return ' '.join(str(value or '').split())
+
+
+def is_event_type(item):
+    """Check if a JSON-LD object is an Event (or a subtype like SocialEvent)"""
+    types = item.get('@type') if isinstance(item, dict) else None
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(name, str) and name.endswith('Event') for name in types)
+
+
+def event_items(data):
+    """Event objects in one JSON-LD document (a single object, a list or an @graph)"""
+    if isinstance(data, dict) and '@graph' in data:
+        data = data['@graph']
+    for item in data if isinstance(data, list) else [data]:
+        if is_event_type(item):
+            yield item
+
+
+def json_ld_documents(html):
+    """Decoded JSON-LD blocks of a page, found without building a DOM"""
+    for match in JSON_LD_PATTERN.finditer(html):
+        try:
+            yield json.loads(match.group(1))
+        except ValueError:
+            continue
+
+
+def structured_event(strategy, title, description='', start=None, end=None, location='', link='',
+                     image='', categories=None):
+    """Scraper-shaped event dict from structured fields"""
+    date_text, time_text = structured_times(start, end)
+    event = {
+        'title': ' '.join(str(title or '').split()) or 'Untitled Event',
+        'description': ' '.join(str(description or '').split()) or 'No description available',
+        'date': date_text or 'Date TBD',
+        'time': time_text or 'Time TBD',
+        'location': location or 'UCF Campus',
+        'link': link or '',
+        'image': image or '',
+        'source': 'UCF Events',
+        'strategy': strategy,
+        'scraped_at': datetime.now().isoformat()
+    }
+    if categories:
+        event['categories'] = [categories] if isinstance(categories, str) else [str(c) for c in categories]
+    return event
+
+
+def event_from_json_ld(item):
+    """Event from a schema.org Event object"""
+    return structured_event(
+        STRATEGY_JSON_LD,
+        item.get('name'),
+        item.get('description'),
+        item.get('startDate'),
+        item.get('endDate'),
+        location_name(item.get('location')),
+        item.get('url') or '',
+        first_image(item.get('image'))
+    )
+
+
+def event_from_feed_item(item):
+    """Event from one item of a JSON feed (UCF Events or JSON Feed field names)"""
+    return structured_event(
+        STRATEGY_JSON_FEED,
+        item.get('title') or item.get('name'),
+        item.get('description') or item.get('summary') or item.get('content_text'),
+        item.get('starts') or item.get('start') or item.get('startDate') or item.get('date_published'),
+        item.get('ends') or item.get('end') or item.get('endDate'),
+        location_name(item.get('location')),
+        item.get('url') or item.get('link') or '',
+        first_image(item.get('image') or item.get('thumbnail')),
+        item.get('category') or item.get('tags')
+    )
+
+
+def ical_moment(value):
+    """ISO string for an iCal DATE or DATE-TIME value"""
+    match = ICAL_DATE_PATTERN.match(value.strip())
+    if not match:
+        return None
+    year, month, day, hour, minute, second, utc = match.groups()
+    if hour is None:
+        return f"{year}-{month}-{day}"
+    return f"{year}-{month}-{day}T{hour}:{minute}:{second or '00'}" + ('+00:00' if utc else '')
+
+
+def event_from_ical(properties):
+    """Event from the properties of one VEVENT"""
+    categories = properties.get('CATEGORIES')
+    return structured_event(
+        STRATEGY_ICAL,
+        properties.get('SUMMARY'),
+        properties.get('DESCRIPTION'),
+        ical_moment(properties.get('DTSTART', '')),
+        ical_moment(properties.get('DTEND', '')),
+        properties.get('LOCATION', ''),
+        properties.get('URL', ''),
+        properties.get('IMAGE') or properties.get('ATTACH', ''),
+        [name.strip() for name in categories.split(',') if name.strip()] if categories else None
+    )
+
+
+def iter_json_items(chunks):
+    """Items of a top-level JSON array, decoded one at a time as text chunks arrive
+
+    Feeds wrapped in an object ({"events": [...]}) have no item boundaries to
+    stream on and are decoded whole.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.lstrip():
+            break
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+    if buffer[0] != '[':
+        data = json.loads(buffer + ''.join(chunks))
+        for key in ('events', 'items', 'data'):
+            if isinstance(data, dict) and isinstance(data.get(key), list):
+                yield from data[key]
+                return
+        return
+
+    buffer = buffer[1:]
+    exhausted = False
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+        if buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield item
+                buffer = buffer[end:]
+                continue
+        if exhausted:
+            return
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buffer += chunk
+
+
+def unfold_ical_lines(lines):
+    """Logical iCal content lines (continuation lines joined back on)"""
+    current = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def split_content_line(line):
+    """(NAME, value) of a content line, skipping parameters (which may quote colons)"""
+    quoted = False
+    for position, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ':' and not quoted:
+            return line[:position].partition(';')[0].upper(), line[position + 1:]
+    return line.upper(), ''
+
+
+def unescape_ical(value):
+    return re.sub(r'\\(.)', lambda match: ICAL_ESCAPES.get(match.group(1), match.group(1)), value)
+
+
+def iter_ical_events(lines):
+    """Property dicts of each VEVENT, yielded as soon as its END line is read"""
+    properties = None
+    for line in unfold_ical_lines(lines):
+        name, value = split_content_line(line)
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            properties = {}
+        elif name == 'END' and value.upper() == 'VEVENT' and properties is not None:
+            yield properties
+            properties = None
+        elif properties is not None:
+            properties.setdefault(name, unescape_ical(value))
+
+
+def discover_feeds(html, page_url):
+    """(url, strategy) of the JSON and iCal feeds a page advertises"""
+    feeds = []
+    for tag in LINK_TAG_PATTERN.findall(html):
+        attributes = {name.lower(): first or second for name, first, second in ATTRIBUTE_PATTERN.findall(tag)}
+        strategy = FEED_TYPES.get(attributes.get('type', '').lower())
+        if strategy and 'alternate' in attributes.get('rel', '').lower() and attributes.get('href'):
+            feeds.append((urljoin(page_url, attributes['href']), strategy))
+    return feeds
+
+
+class SourceChain:
+    """Structured sources tried in order before the HTML heuristics.
+
+    The first source that yields events wins: JSON-LD in the listing page,
+    then the feeds it advertises, then the default feed paths.
+    """
+
+    def __init__(self, session, feed_paths=None, timeout=30):
+        self.session = session
+        self.feed_paths = DEFAULT_FEED_PATHS if feed_paths is None else feed_paths
+        self.timeout = timeout
+
+    def structured_events(self, html, page_url):
+        """(events, strategy) from the first structured source with events, or ([], None)"""
+        events = [event_from_json_ld(item) for document in json_ld_documents(html) for item in event_items(document)]
+        if events:
+            return self.resolve_links(events, page_url), STRATEGY_JSON_LD
+        return self.feed_events(discover_feeds(html, page_url), page_url)
+
+    def feed_events(self, feeds, page_url):
+        """(events, strategy) from the first advertised or default feed with events, or ([], None)"""
+        feeds = list(feeds)
+        for path in self.feed_paths:
+            strategy = STRATEGY_ICAL if path.endswith('.ics') else STRATEGY_JSON_FEED
+            feeds.append((urljoin(page_url, path), strategy))
+        seen = set()
+        for url, strategy in feeds:
+            if url in seen:
+                continue
+            seen.add(url)
+            events = self.fetch_feed(url, strategy)
+            if events:
+                return self.resolve_links(events, url), strategy
+        return [], None
+
+    def fetch_feed(self, url, strategy):
+        """Stream one feed and parse its events as they arrive ([] if unavailable)"""
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                if response.status_code != 200:
+                    logger.debug('No feed at %s (HTTP %d)', url, response.status_code)
+                    return []
+                content_type = response.headers.get('Content-Type', '')
+                if 'html' in content_type:
+                    return []
+                response.encoding = response.encoding or 'utf-8'
+                if strategy == STRATEGY_ICAL:
+                    items = iter_ical_events(response.iter_lines(decode_unicode=True))
+                    events = [event_from_ical(properties) for properties in items]
+                else:
+                    items = iter_json_items(response.iter_content(FEED_CHUNK_SIZE, decode_unicode=True))
+                    events = [event_from_feed_item(item) for item in items if isinstance(item, dict)]
+        except Exception as e:
+            logger.warning('Feed %s unusable: %s', url, e)
+            return []
+        logger.info('Read %d events from %s', len(events), url)
+        return [event for event in events if event['title'] != 'Untitled Event']
+
+    def resolve_links(self, events, base_url):
+        """Make relative event links and images absolute"""
+        for event in events:
+            for key in ('link', 'image'):
+                if event[key]:
+                    event[key] = urljoin(base_url, event[key])
+        return events
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Event Store - memory-mapped on-disk cache for scraped events
+Each generation is written to a temp file and atomically renamed into place,
+readers map it read-only so every worker shares one page-cached copy
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+# File layout:
+#   header  magic, version, generation, record count, index offset, meta length
+#   meta    JSON object (last_scrape_date, ...)
+#   records u32 length + compact JSON bytes, appended one after another
+#   index   u64 absolute offset of each record
+MAGIC = b'KHEV'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQIQI')
+RECORD_LENGTH = struct.Struct('<I')
+INDEX_ENTRY = struct.Struct('<Q')
+
+
+class EventStoreError(Exception):
+    """Raised when a store file is missing or corrupt"""
+
+
+def write_store(path, events, generation, meta=None):
+    """Write events as a new store generation and atomically replace path"""
+    meta_bytes = json.dumps(meta or {}, separators=(',', ':')).encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, generation, len(events), 0, len(meta_bytes)))
+            f.write(meta_bytes)
+
+            offsets = []
+            for event in events:
+                record = json.dumps(event, separators=(',', ':')).encode('utf-8')
+                offsets.append(f.tell())
+                f.write(RECORD_LENGTH.pack(len(record)))
+                f.write(record)
+
+            index_offset = f.tell()
+            f.write(b''.join(INDEX_ENTRY.pack(offset) for offset in offsets))
+
+            # Header is only valid once the index location is known
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, generation, len(events), index_offset, len(meta_bytes)))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+        _fsync_directory(directory)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _fsync_directory(directory):
+    """Persist the rename itself (not supported on every platform)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class EventStore:
+    """Read-only, memory-mapped view of one store generation.
+
+    Behaves like a sequence of event dicts; records are only decoded when
+    they are accessed, and raw record bytes are available without copying.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            stat = os.fstat(self._file.fileno())
+            self._identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if stat.st_size < HEADER.size:
+                raise EventStoreError(f"Store file too small: {path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        self._view = memoryview(self._map)
+        magic, version, _, generation, count, index_offset, meta_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise EventStoreError(f"Not an event store file: {path}")
+        if index_offset + count * INDEX_ENTRY.size > stat.st_size:
+            self.close()
+            raise EventStoreError(f"Truncated event store file: {path}")
+
+        self.generation = generation
+        self._count = count
+        self._index_offset = index_offset
+        self.meta = json.loads(self._map[HEADER.size:HEADER.size + meta_length])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        return json.loads(self.record_bytes(i).tobytes())
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def record_bytes(self, i):
+        """Get the raw JSON bytes of record i as a zero-copy memoryview"""
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('event store index out of range')
+        offset, = INDEX_ENTRY.unpack_from(self._map, self._index_offset + i * INDEX_ENTRY.size)
+        length, = RECORD_LENGTH.unpack_from(self._map, offset)
+        start = offset + RECORD_LENGTH.size
+        return self._view[start:start + length]
+
+    def is_stale(self):
+        """Check if the file on disk has been replaced by a newer generation"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._identity
+
+    def close(self):
+        """Release the mapping (views handed out must no longer be used)"""
+        try:
+            self._view.release()
+        except (AttributeError, BufferError):
+            pass
+        try:
+            self._map.close()
+        except (AttributeError, BufferError):
+            pass
+        self._file.close()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Event Stream - Server-Sent Events push of new cache generations
+One condition variable per process wakes every open stream when a
+generation is committed; streams cost a greenlet each under the gevent worker
+and are closed right away on thread-per-connection servers
+"""
+
+import json
+import threading
+import time
+
+from event_index import generation_tag
+
+try:
+    from gevent import monkey
+except ImportError:  # No gevent: every stream holds a thread
+    monkey = None
+
+# Seconds between keep-alive comments (also how often other workers' stores are checked)
+HEARTBEAT_INTERVAL = 15
+# Streams are closed after this long; EventSource reconnects with Last-Event-ID
+MAX_STREAM_AGE = 10 * 60
+
+
+class GenerationBroadcaster:
+    """Latest committed (epoch, generation) plus a way to wait for the next one"""
+
+    def __init__(self, check_interval=HEARTBEAT_INTERVAL):
+        self.epoch = ''
+        self.generation = 0
+        self.check_interval = check_interval
+        self.closed = False
+        self._condition = threading.Condition()
+        self._last_check = time.monotonic()
+
+    def current(self):
+        """(epoch, generation) last published"""
+        with self._condition:
+            return self.epoch, self.generation
+
+    def publish(self, epoch, generation):
+        """Wake every waiter if generation is newer than the last one or from a new store epoch"""
+        with self._condition:
+            if epoch != self.epoch or generation > self.generation:
+                self.epoch = epoch
+                self.generation = generation
+                self._condition.notify_all()
+
+    def wait(self, after, timeout):
+        """(epoch, generation) once it differs from after, or None on timeout or close"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._passed(after) or self.closed, timeout)
+            return (self.epoch, self.generation) if self._passed(after) and not self.closed else None
+
+    def _passed(self, after):
+        """True once a generation other than after was published"""
+        return self.generation > 0 and (self.epoch, self.generation) != after
+
+    def due_for_check(self):
+        """True for one caller per check_interval (rate-limits store staleness checks)"""
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+            return True
+
+    def close(self):
+        """End every open stream"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+def cooperative_streams():
+    """Check if open streams cost a greenlet (gevent-patched threading) rather than a thread"""
+    return monkey is not None and monkey.is_module_patched('threading')
+
+
+def format_message(tag, data, event='generation'):
+    """One SSE message with a generation_tag as its id (data must be single-line JSON)"""
+    return f"id: {tag}\nevent: {event}\ndata: {data}\n\n"
+
+
+def stream_generations(service, since=None, send_delta=False, heartbeat=HEARTBEAT_INTERVAL,
+                       max_age=MAX_STREAM_AGE):
+    """Yield SSE messages for every generation after since, an (epoch, generation) pair
+
+    Each message carries the generation and its change counts, or the whole
+    /api/events/changes delta when send_delta is set. A since from another
+    store epoch is answered with the current generation (a full snapshot as
+    delta). Once max_age is used up (at once for max_age=0) only generations
+    already committed are sent.
+    """
+    broadcaster = service.broadcaster
+    started = time.monotonic()
+    last = since
+    yield f"retry: {heartbeat * 1000}\n\n"
+    current = broadcaster.current()
+    if last is None or (last[0] == current[0] and last[1] > current[1]):
+        last = current
+        tag = generation_tag(*last)
+        yield format_message(tag, json.dumps({'generation': tag}), event='hello')
+
+    if broadcaster.due_for_check():
+        service.sync_from_store()
+    while not broadcaster.closed:
+        remaining = max_age - (time.monotonic() - started)
+        generation = broadcaster.wait(last, max(0, min(heartbeat, remaining)))
+        if generation is None:
+            if broadcaster.closed or remaining <= 0:
+                break
+            if broadcaster.due_for_check():
+                # Another worker may have committed a generation; loading it publishes it
+                service.sync_from_store()
+            yield ": keep-alive\n\n"
+            continue
+
+        if send_delta:
+            body, _ = service.changes_response(last)
+            data = body.decode('utf-8')
+        else:
+            data = json.dumps(service.generation_summary(*generation))
+        yield format_message(generation_tag(*generation), data)
+        last = generation
@@ -5,26 +5,61 @@ Scrapes UCF events once per day and caches results
 """
 
 import requests
-from bs4 import BeautifulSoup
 import json
+import logging
 import re
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from flask import Flask, jsonify
+from urllib.parse import urlparse
+from flask import Blueprint, Flask, Response, current_app, g, jsonify, request, stream_with_context
 from flask_cors import CORS
+from requests.adapters import HTTPAdapter
 import os
-import pickle
 
-app = Flask(__name__)
-CORS(app)
+from async_scraper import AsyncUCFEventsScraper, aiohttp
+from crawler import EventsCrawler
+from event_db import EventDatabase
+from event_enrichment import PLACEHOLDER_DESCRIPTION, DetailCache, EventEnricher
+from event_sources import STRATEGY_HTML, SourceChain, event_from_json_ld, event_items
+from event_index import MAX_LIMIT, parse_generation_tag, parse_query_date, tokenize
+from event_stream import MAX_STREAM_AGE, cooperative_streams, stream_generations
+from events_log import configure_logging, get_logger
+from events_metrics import CONTENT_TYPE, FALLBACKS, REGISTRY, REQUEST_SECONDS, REQUESTS
+from events_service import EventsService
+from event_rules import (BENCHMARK_KEYWORDS, BENCHMARK_TITLE_PATTERNS, BLOCK_RULES, CALENDAR_TITLE_PATTERNS,
+                         SECTION_RULES, STRICT_CALENDAR_TITLE_PATTERNS, TITLE_RULES)
+from extraction import PageIndex, SinglePassExtractor, make_soup
+from incremental_extraction import STREAM_THRESHOLD, StreamingExtractor, read_page
+from parse_pool import ParsePool
+from response_cache import ResponseCache
+from scrape_trace import ScrapeTrace, load_trace, maybe_span, traced
 
-# Global variables for caching
-cached_events = []
-last_scrape_date = None
-cache_file = 'events_cache.pkl'
+configure_logging()
+logger = get_logger('api')
+
+events_bp = Blueprint('events', __name__)
+
+# Title predicates checked once per candidate event, bound once
+IS_BENCHMARK_TITLE = TITLE_RULES.matcher('benchmark_title')
+MATCHES_BENCHMARK_TITLE = TITLE_RULES.matcher('benchmark_title', 'benchmark_term')
+HAS_EVENT_INDICATOR = TITLE_RULES.matcher('event_indicator')
 
 class UCFEventsScraper:
-    def __init__(self):
-        self.base_url = "https://events.ucf.edu/"
+    def __init__(self, base_url=None, crawl=False, crawl_workers=8, crawl_delay=0.25, single_pass=True,
+                 enrich=True, enrich_workers=8, detail_cache_file=None, detail_ttl=12 * 60 * 60,
+                 feed_paths=None, stream_threshold=STREAM_THRESHOLD, tracing=False, parse_processes=0):
+        self.base_url = base_url or "https://events.ucf.edu/"
+        self.used_fallback = False
+        # Extract with the one-walk engine instead of the per-helper DOM walks
+        self.single_pass = single_pass
+        # Crawler mode: fetch day/week/month/category listings and detail pages
+        self.crawl = crawl
+        self.crawl_workers = crawl_workers
+        self.crawl_delay = crawl_delay
+        # Upstream ETag/Last-Modified per URL for conditional requests
+        self.validators = {}
+        self.not_modified = False
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -34,64 +69,210 @@ class UCFEventsScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
+        # One pool for the session, sized so crawl and enrichment threads reuse its connections
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(crawl_workers, enrich_workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # JSON-LD and JSON/iCal feeds, tried before the HTML heuristics
+        self.sources = SourceChain(self.session, feed_paths=feed_paths)
+        # Listing pages larger than this are parsed block by block as they stream in
+        self.stream_threshold = stream_threshold
+        # Seconds spent per stage (fetch, parse, extract, validate, enrich) in the last scrape
+        self.timings = {}
+        # Record a ScrapeTrace of each scrape (stages, selectors, helpers) in self.trace
+        self.tracing = tracing
+        self.trace = None
+        # Worker processes that parse crawled and detail pages (0: parse in the fetch threads)
+        self.parse_pool = ParsePool(parse_processes) if parse_processes else None
+        # Detail-page stage that fills descriptions, images and exact times
+        self.enricher = None
+        if enrich:
+            self.enricher = EventEnricher(self.session, DetailCache(detail_cache_file, detail_ttl),
+                                          max_workers=enrich_workers, per_host_delay=crawl_delay,
+                                          parse_pool=self.parse_pool)
     
     def scrape_events(self):
         """High-quality scraping of UCF events from events.ucf.edu"""
+        if self.crawl:
+            return self.crawl_events()
         try:
-            print("High-quality scraping of UCF events from events.ucf.edu...")
-            
-            # Enhanced request with better headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
-            
-            response = self.session.get(self.base_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Verify we got the right page
-            if 'events.ucf.edu' not in response.url:
-                print("ERROR: Redirected to wrong page, using fallback")
-                return self.get_fallback_events()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            events = []
-            
-            # High-quality content cleaning
-            self.clean_page_content(soup)
-            
-            # Focus ONLY on Today's Events section with enhanced targeting
-            todays_events = self.extract_todays_events_enhanced(soup)
-            if todays_events:
-                events.extend(todays_events)
-                print(f"INFO Found {len(todays_events)} events from Today's Events section")
-            
-            # If no events found, use fallback
-            if not events:
-                events = self.get_fallback_events()
-                print(f"INFO Using {len(events)} fallback events")
-            
-            # High-quality validation and cleaning
-            cleaned_events = self.high_quality_validation(events)
-            print(f"SUCCESS High-quality extraction: {len(cleaned_events)} clean events")
+            logger.info('Scraping UCF events from %s', self.base_url)
+            headers = self.listing_headers(self.base_url)
+            
+            self.start_scrape()
+            with self.stage('fetch'):
+                response = self.session.get(self.base_url, headers=headers, timeout=30, stream=True)
+            with response:
+                if response.status_code == 304:
+                    logger.info('Events page not modified, keeping cached events')
+                    self.not_modified = True
+                    return None
+                response.raise_for_status()
+                
+                # Verify we got the right page
+                if urlparse(self.base_url).netloc not in response.url:
+                    logger.warning('Redirected to %s, using fallback', response.url)
+                    self.used_fallback = True
+                    return self.get_fallback_events()
+                
+                encoding = response.encoding or 'utf-8'
+                with self.stage('fetch'):
+                    content, chunks = read_page(response, self.stream_threshold)
+                cleaned_events = self.extract_page(content, chunks, response.url, encoding)
+            if not self.used_fallback:
+                cleaned_events = self.enrich_events(cleaned_events)
+                self.remember_validators(self.base_url, response)
             return cleaned_events
             
         except requests.exceptions.RequestException as e:
-            print(f"ERROR Network error: {str(e)}")
+            logger.error('Network error: %s', e)
+            self.used_fallback = True
             return self.get_fallback_events()
-        except Exception as e:
-            print(f"ERROR Unexpected error: {str(e)}")
+        except Exception:
+            logger.exception('Unexpected error while scraping')
+            self.used_fallback = True
             return self.get_fallback_events()
     
+    def listing_headers(self, url):
+        """Browser-like request headers for a listing page, plus its conditional headers"""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Sec-Fetch-Dest': 'document',
+            'Sec-Fetch-Mode': 'navigate',
+            'Sec-Fetch-Site': 'none'
+        }
+        headers.update(self.conditional_headers(url))
+        return headers
+    
+    def start_scrape(self):
+        """Reset the per-scrape state (fallback and 304 flags, timings, trace)"""
+        self.used_fallback = False
+        self.not_modified = False
+        self.timings = {}
+        self.trace = ScrapeTrace(self.base_url) if self.tracing else None
+    
+    @contextmanager
+    def stage(self, name):
+        """Add the time spent in the with block to timings[name] (and the trace)"""
+        started = time.perf_counter()
+        try:
+            with maybe_span(self.trace, name):
+                yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+    
+    def extract_page(self, content, chunks, page_url, encoding):
+        """Events of a fetched listing page (content, or chunks when it is streamed)"""
+        if chunks is not None:
+            return self.extract_streamed_events(chunks, page_url, encoding)
+        # Structured data first; the DOM heuristics only run when it has nothing
+        with self.stage('extract'), maybe_span(self.trace, 'structured_events'):
+            events, strategy = self.sources.structured_events(content.decode(encoding, errors='replace'), page_url)
+        if events:
+            logger.info('Found %d events via %s', len(events), strategy)
+            return events
+        return self.extract_html_events(content)
+    
+    def extract_html_events(self, content):
+        """Today's Events found by the HTML heuristics, validated (fallback list if none)"""
+        with self.stage('parse'):
+            soup = make_soup(content)
+        
+        # Focus ONLY on Today's Events section with enhanced targeting
+        with self.stage('extract'):
+            todays_events = self.extract_todays_events(soup)
+        if todays_events:
+            logger.info("Found %d events from Today's Events section", len(todays_events))
+        return self.validate_html_events(todays_events)
+    
+    def extract_streamed_events(self, chunks, page_url, encoding):
+        """Events of a large page parsed as it streams in, without building its DOM"""
+        # Fetching the rest of the page, parsing and extracting are interleaved here
+        with self.stage('extract'):
+            events, strategy = StreamingExtractor(self).extract(chunks, page_url, encoding)
+        if events and strategy != STRATEGY_HTML:
+            logger.info('Found %d events via %s', len(events), strategy)
+            return events
+        return self.validate_html_events(events)
+    
+    def validate_html_events(self, events):
+        """Validate heuristically found events (fallback list if none)"""
+        events = list(events)
+        
+        # If no events found, use fallback
+        if not events:
+            events = self.get_fallback_events()
+            self.used_fallback = True
+            logger.warning('Using %d fallback events', len(events))
+        
+        # High-quality validation and cleaning
+        with self.stage('validate'):
+            cleaned_events = self.high_quality_validation(events)
+        logger.info('High-quality extraction: %d clean events', len(cleaned_events))
+        return cleaned_events
+    
+    def extract_todays_events(self, soup):
+        """Extract Today's Events with the single-pass engine or the original helpers"""
+        if self.single_pass:
+            return SinglePassExtractor(self).extract(soup)
+        
+        # High-quality content cleaning
+        self.clean_page_content(soup)
+        return self.extract_todays_events_enhanced(soup)
+    
+    def conditional_headers(self, url):
+        """Build If-None-Match/If-Modified-Since headers from the last response for url"""
+        headers = {}
+        validator = self.validators.get(url)
+        if validator:
+            if validator.get('etag'):
+                headers['If-None-Match'] = validator['etag']
+            if validator.get('last_modified'):
+                headers['If-Modified-Since'] = validator['last_modified']
+        return headers
+    
+    def remember_validators(self, url, response):
+        """Keep the upstream ETag/Last-Modified of a successfully parsed response"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.validators[url] = {'etag': etag, 'last_modified': last_modified}
+        else:
+            self.validators.pop(url, None)
+    
+    def crawl_events(self):
+        """Crawl listing and detail pages concurrently (crawler mode)"""
+        try:
+            self.start_scrape()
+            crawler = EventsCrawler(self, max_workers=self.crawl_workers, per_host_delay=self.crawl_delay)
+            with self.stage('crawl'):
+                events = crawler.crawl()
+            if self.not_modified:
+                return events
+            if events:
+                return self.enrich_events(events)
+            logger.warning('Crawl found no events, using fallback')
+        except Exception:
+            logger.exception('Crawl failed')
+        self.used_fallback = True
+        return self.get_fallback_events()
+    
+    def enrich_events(self, events):
+        """Fill descriptions, images and exact times from detail pages (when enabled)"""
+        if self.enricher is None or not events:
+            return events
+        try:
+            with self.stage('enrich'):
+                return self.enricher.enrich(events)
+        except Exception:
+            logger.exception('Enrichment failed, keeping listing fields')
+            return events
+    
     def clean_page_content(self, soup):
         """Minimal content cleaning to preserve event content"""
         try:
@@ -99,57 +280,58 @@ class UCFEventsScraper:
             for element in soup(["script", "style", "noscript"]):
                 element.decompose()
             
-            print("CLEAN Minimal content cleaning completed")
+            logger.debug('Minimal content cleaning completed')
             
         except Exception as e:
-            print(f"ERROR Error during content cleaning: {str(e)}")
+            logger.warning('Error during content cleaning: %s', e)
     
     def extract_todays_events_enhanced(self, soup):
         """Enhanced extraction targeting benchmark events with full details"""
         events = []
         try:
-            print("TARGET Targeting benchmark events with full details...")
+            logger.debug('Targeting benchmark events with full details')
             
             # Find the "Today's Events" section
             todays_section = self.find_todays_events_section(soup)
             if not todays_section:
-                print("ERROR Could not find Today's Events section")
+                logger.error("Could not find Today's Events section")
                 return []
             
             # Find all event blocks in the section
             event_blocks = self.find_event_blocks_in_section(todays_section)
-            print(f"INFO Found {len(event_blocks)} potential event blocks")
+            logger.info('Found %d potential event blocks', len(event_blocks))
             
             # Process each event block
             seen_titles = set()
             for i, block in enumerate(event_blocks):
-                print(f"SEARCH Processing event block {i+1}...")
+                logger.debug('Processing event block %d', i + 1)
                 event = self.parse_event_block_detailed(block)
                 if event and self.is_benchmark_event(event.get('title', '')):
                     title = event.get('title', '')
                     if title not in seen_titles:
                         events.append(event)
                         seen_titles.add(title)
-                        print(f"SUCCESS Parsed benchmark event: {title}")
+                        logger.debug('Parsed benchmark event: %s', title)
                     else:
-                        print(f"ERROR Duplicate event skipped: {title}")
+                        logger.debug('Duplicate event skipped: %s', title)
                 elif event:
-                    print(f"ERROR Not a benchmark event: {event.get('title', 'Unknown')}")
+                    logger.debug('Not a benchmark event: %s', event.get('title', 'Unknown'))
             
-            print(f"INFO Successfully found {len(events)} benchmark events with details")
+            logger.info('Found %d benchmark events with details', len(events))
             return events
             
-        except Exception as e:
-            print(f"ERROR Error in enhanced extraction: {str(e)}")
+        except Exception:
+            logger.exception('Error in enhanced extraction')
             return []
     
+    @traced
     def find_todays_events_section(self, soup):
         """Find the Today's Events section in the page"""
         # Look for "Today's Events" heading
         for tag in ['h1', 'h2', 'h3', 'h4']:
             headings = soup.find_all(tag, string=lambda text: text and 'Today' in text and 'Event' in text)
             if headings:
-                print(f"INFO Found 'Today's Events' heading: {headings[0].get_text()}")
+                logger.debug("Found 'Today's Events' heading: %s", headings[0].get_text())
                 # Find the parent container
                 parent = headings[0].find_parent()
                 if parent:
@@ -161,14 +343,13 @@ class UCFEventsScraper:
         ))
         
         for container in event_containers:
-            if any(keyword in container.get_text().lower() for keyword in [
-                'ace personal training', 'innovation tournament', 'alumknights give back'
-            ]):
-                print("INFO Found event container with benchmark content")
+            if SECTION_RULES.contains_any(container.get_text()):
+                logger.debug('Found event container with benchmark content')
                 return container
         
         return None
     
+    @traced
     def find_event_blocks_in_section(self, section):
         """Find individual event blocks within the Today's Events"""
         event_blocks = []
@@ -178,7 +359,7 @@ class UCFEventsScraper:
         while soup.parent:
             soup = soup.parent
         
-        print("INFO Searching for individual event items...")
+        logger.debug('Searching for individual event items')
         
         # Look for different types of event containers
         selectors = [
@@ -190,41 +371,42 @@ class UCFEventsScraper:
             'li'
         ]
         
+        # Every selector walks the whole page; only counted when tracing
+        page_nodes = len(soup.find_all(True)) if self.trace else 0
         for selector in selectors:
-            elements = soup.select(selector)
-            print(f"INFO Found {len(elements)} elements with selector: {selector}")
-            
-            for element in elements:
-                text = element.get_text().lower()
-                if any(keyword in text for keyword in [
-                    'ace personal training', 'innovation tournament', 'alumknights give back',
-                    'knight for a day', 'volleyball vs', 'spanish cinema', 'urinetown'
-                ]):
-                    event_blocks.append(element)
-                    print(f"SUCCESS Found event in {selector}: {text[:100]}...")
+            with maybe_span(self.trace, f"select {selector}"):
+                elements = soup.select(selector)
+                logger.debug('Found %d elements with selector: %s', len(elements), selector)
+                
+                for element in elements:
+                    text = element.get_text().lower()
+                    if BLOCK_RULES.contains_any(text):
+                        event_blocks.append(element)
+                        logger.debug('Found event in %s: %.100s', selector, text)
+                if self.trace:
+                    self.trace.add_nodes(page_nodes + len(elements))
         
         # If still no events found, try a different approach
         if not event_blocks:
-            print("INFO Trying alternative approach - looking for text patterns...")
-            # Find all text nodes that contain benchmark events
-            all_text = soup.get_text()
-            lines = all_text.split('\n')
-            
-            for i, line in enumerate(lines):
-                line_lower = line.lower()
-                if any(keyword in line_lower for keyword in [
-                    'ace personal training', 'innovation tournament', 'alumknights give back',
-                    'knight for a day', 'volleyball vs', 'spanish cinema', 'urinetown'
-                ]):
-                    # Find the parent element of this text
-                    for element in soup.find_all():
-                        if element.get_text().strip() == line.strip():
-                            event_blocks.append(element)
-                            print(f"SUCCESS Found event via text pattern: {line[:100]}...")
-                            break
+            event_blocks = self.find_event_blocks_by_text(soup)
+        
+        return event_blocks
+    
+    @traced
+    def find_event_blocks_by_text(self, soup):
+        """Fallback: find elements whose whole text is a line naming a benchmark event"""
+        logger.debug('Trying alternative approach - looking for text patterns')
+        # One pass over the page's text nodes instead of a find_all() per matching line
+        page = PageIndex(soup)
+        event_blocks = []
+        for index in page.find_text_blocks(BENCHMARK_KEYWORDS):
+            event_blocks.append(page.elements[index])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Found event via text pattern: %.100s', page.element_text(index).strip())
         
         return event_blocks
     
+    @traced
     def parse_event_block_detailed(self, block):
         """Parse a detailed event block to extract all information"""
         try:
@@ -248,14 +430,15 @@ class UCFEventsScraper:
             # No date field needed - all events are from Today's Events
             
             # Add metadata
-            event['description'] = 'UCF Event - Click for details'
+            # Filled in from the detail page by the enrichment stage
+            event['description'] = PLACEHOLDER_DESCRIPTION
             event['source'] = 'UCF Events'
             event['scraped_at'] = datetime.now().isoformat()
             
             return event
             
         except Exception as e:
-            print(f"ERROR Error parsing event block: {str(e)}")
+            logger.warning('Error parsing event block: %s', e)
             return None
     
     def extract_event_title(self, block):
@@ -286,8 +469,11 @@ class UCFEventsScraper:
     
     def extract_event_time(self, block):
         """Extract the event time from a block"""
-        text = block.get_text()
-        
+        return self.match_event_time(block.get_text())
+    
+    @traced
+    def match_event_time(self, text):
+        """Find the event time in a block's text"""
         # Look for time patterns
         time_patterns = [
             r'at\s+\d{1,2}:\d{2}\s*(AM|PM|am|pm)',
@@ -311,8 +497,11 @@ class UCFEventsScraper:
     
     def extract_event_location(self, block):
         """Extract the event location from a block"""
-        text = block.get_text()
-        
+        return self.match_event_location(block.get_text())
+    
+    @traced
+    def match_event_location(self, text):
+        """Find the event location in a block's text"""
         # UCF-specific location patterns
         location_patterns = [
             r'RWC:\s*\d+',
@@ -336,14 +525,18 @@ class UCFEventsScraper:
         """Extract the event link from a block"""
         link = block.find('a', href=True)
         if link:
-            href = link.get('href')
-            if href:
-                if href.startswith('/'):
-                    return f"https://events.ucf.edu{href}"
-                elif href.startswith('http'):
-                    return href
-                else:
-                    return f"https://events.ucf.edu/{href}"
+            return self.normalize_event_link(link.get('href'))
+        return ''
+    
+    def normalize_event_link(self, href):
+        """Make an event href absolute"""
+        if href:
+            if href.startswith('/'):
+                return f"https://events.ucf.edu{href}"
+            elif href.startswith('http'):
+                return href
+            else:
+                return f"https://events.ucf.edu/{href}"
         return ''
     
     def is_benchmark_event(self, title):
@@ -351,23 +544,7 @@ class UCFEventsScraper:
         if not title:
             return False
         
-        title_lower = title.lower()
-        
-        benchmark_events = [
-            'ace personal training certification course',
-            'innovation tournament 2025',
-            'ucf alumknights give back',
-            'knight for a day open house',
-            'ucf volleyball vs. texas tech',
-            'spanish cinema now + 2025: por donde pasa el silencio',
-            'urinetown: the musical | theatre ucf'
-        ]
-        
-        for benchmark in benchmark_events:
-            if benchmark in title_lower:
-                return True
-        
-        return False
+        return IS_BENCHMARK_TITLE(title)
     
     def find_event_blocks_with_colored_lines(self, container):
         """Find event blocks that have colored vertical lines (benchmark structure)"""
@@ -379,10 +556,7 @@ class UCFEventsScraper:
         for block in potential_blocks:
             # Check if this block contains event-like content
             text = block.get_text()
-            if any(keyword in text.lower() for keyword in [
-                'ace personal training', 'innovation tournament', 'alumknights give back',
-                'knight for a day', 'volleyball vs', 'spanish cinema', 'urinetown'
-            ]):
+            if BLOCK_RULES.contains_any(text):
                 event_blocks.append(block)
         
         return event_blocks
@@ -416,7 +590,7 @@ class UCFEventsScraper:
             return event
             
         except Exception as e:
-            print(f"ERROR Error parsing benchmark event: {str(e)}")
+            logger.warning('Error parsing benchmark event: %s', e)
             return None
     
     def extract_benchmark_title(self, block):
@@ -516,7 +690,7 @@ class UCFEventsScraper:
                     'scraped_at': datetime.now().isoformat()
                 }
                 events.append(event)
-                print(f"SUCCESS Found benchmark event: {event_title}")
+                logger.debug('Found benchmark event: %s', event_title)
         
         return events
     
@@ -533,20 +707,20 @@ class UCFEventsScraper:
                 # Try alternative selectors
                 event_blocks = section.find_all(['div', 'article'])
             
-            print(f"INFO Found {len(event_blocks)} potential event blocks in section")
+            logger.debug('Found %d potential event blocks in section', len(event_blocks))
             
             for i, block in enumerate(event_blocks):
                 event = self.parse_event_high_quality(block)
                 if event and self.is_high_quality_event(event):
                     events.append(event)
-                    print(f"SUCCESS High-quality event {i+1}: {event.get('title', 'Unknown')}")
+                    logger.debug('High-quality event %d: %s', i + 1, event.get('title', 'Unknown'))
                 elif event:
-                    print(f"ERROR Rejected event {i+1}: {event.get('title', 'Unknown')}")
+                    logger.debug('Rejected event %d: %s', i + 1, event.get('title', 'Unknown'))
             
             return events
             
-        except Exception as e:
-            print(f"ERROR Error extracting from section: {str(e)}")
+        except Exception:
+            logger.exception('Error extracting from section')
             return []
     
     def parse_event_high_quality(self, block):
@@ -578,7 +752,7 @@ class UCFEventsScraper:
             return event
             
         except Exception as e:
-            print(f"ERROR Error parsing event: {str(e)}")
+            logger.warning('Error parsing event: %s', e)
             return None
     
     def extract_title_high_quality(self, block):
@@ -687,20 +861,7 @@ class UCFEventsScraper:
             return False
         
         # Must not be calendar/navigation content
-        invalid_patterns = [
-            r'^[A-Za-z]{3,9}\d{4}$',  # MonthYear
-            r'^[A-Za-z]{2}\d+[A-Za-z]{2}\d+',  # Calendar grid
-            r'^\d{1,2}:\d{2}$',  # Just time
-            r'^[A-Za-z]{3,9}$',  # Just month
-            r'^\d{1,2}$',  # Just day
-            r'^[A-Za-z]{2,3}$'  # Day abbreviation
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.match(pattern, title):
-                return False
-        
-        return True
+        return CALENDAR_TITLE_PATTERNS.first(title) is None
     
     def is_high_quality_event(self, event):
         """High-quality event validation based on benchmark events"""
@@ -709,131 +870,72 @@ class UCFEventsScraper:
         
         title = event.get('title', '').strip().lower()
         
-        # Benchmark event patterns - must match these specific patterns
-        benchmark_patterns = [
-            # ACE Personal Training Certification Course
-            r'.*ace.*personal.*training.*',
-            # Innovation Tournament 2025
-            r'.*innovation.*tournament.*',
-            # UCF AlumKnights Give Back
-            r'.*ucf.*alumknights.*give.*back.*',
-            # Knight for a Day Open House
-            r'.*knight.*for.*a.*day.*open.*house.*',
-            # UCF Volleyball vs. Texas Tech
-            r'.*ucf.*volleyball.*vs.*',
-            # Spanish Cinema Now
-            r'.*spanish.*cinema.*now.*',
-            # Urinetown: The Musical
-            r'.*urinetown.*musical.*',
-            # Theatre UCF
-            r'.*theatre.*ucf.*'
-        ]
-        
         # Check if title matches any benchmark pattern
-        for pattern in benchmark_patterns:
-            if re.search(pattern, title):
-                print(f"SUCCESS Matches benchmark pattern: {pattern}")
-                return True
+        pattern = BENCHMARK_TITLE_PATTERNS.first(title)
+        if pattern:
+            logger.debug('Matches benchmark pattern: %s', pattern)
+            return True
         
         # Fallback: check for key event indicators
-        event_indicators = [
-            'training', 'course', 'workshop', 'seminar', 'conference', 'session',
-            'fair', 'expo', 'symposium', 'lecture', 'presentation', 'talk',
-            'discussion', 'meeting', 'tournament', 'tour', 'open house', 'certification',
-            'competition', 'show', 'performance', 'concert', 'game', 'match', 'vs',
-            'volleyball', 'basketball', 'football', 'soccer', 'tennis', 'swimming',
-            'cinema', 'movie', 'film', 'musical', 'theater', 'theatre', 'play',
-            'give back', 'volunteer', 'service', 'community', 'alumni', 'alumknights',
-            'ace', 'personal', 'innovation', 'knight', 'spanish', 'urinetown'
-        ]
-        
-        has_indicator = any(indicator in title for indicator in event_indicators)
+        has_indicator = HAS_EVENT_INDICATOR(title)
         if has_indicator:
-            print(f"SUCCESS Contains event indicator: {title}")
+            logger.debug('Contains event indicator: %s', title)
         else:
-            print(f"ERROR No event indicators found: {title}")
+            logger.debug('No event indicators found: %s', title)
         
         return has_indicator
     
+    @traced
     def high_quality_validation(self, events):
         """High-quality validation and cleaning with benchmark matching"""
         cleaned_events = []
         seen_titles = set()
         
-        print(f"CLEAN High-quality validation of {len(events)} events...")
+        logger.debug('High-quality validation of %d events', len(events))
         
         for i, event in enumerate(events):
             if not event:
-                print(f"ERROR Event {i+1} is empty")
+                logger.debug('Event %d is empty', i + 1)
                 continue
             
             title = event.get('title', '').strip()
             if not title:
-                print(f"ERROR Event {i+1} has no title")
+                logger.debug('Event %d has no title', i + 1)
                 continue
                 
             if title in seen_titles:
-                print(f"ERROR Event {i+1} is duplicate: {title}")
+                logger.debug('Event %d is duplicate: %s', i + 1, title)
                 continue
             
             # Accept all events that were found (they're already benchmark events)
             seen_titles.add(title)
             
-            # Ensure all required fields
+            # Ensure all required fields, keeping whatever the parser found
             cleaned_event = {
                 'title': title,
                 'time': event.get('time', 'Time TBD'),
                 'location': event.get('location', 'UCF Campus'),
                 'link': event.get('link', ''),
-                'description': 'UCF Event - Click for details',
+                'description': event.get('description') or PLACEHOLDER_DESCRIPTION,
                 'source': 'UCF Events',
+                'strategy': event.get('strategy') or STRATEGY_HTML,
                 'scraped_at': datetime.now().isoformat()
             }
+            for key in ('date', 'image', 'categories'):
+                if event.get(key):
+                    cleaned_event[key] = event[key]
             
             cleaned_events.append(cleaned_event)
-            print(f"SUCCESS Accepted event: {title}")
+            logger.debug('Accepted event: %s', title)
         
-        print(f"TARGET Final result: {len(cleaned_events)} events")
+        logger.debug('Validation kept %d events', len(cleaned_events))
         return cleaned_events
     
     def matches_benchmark_event(self, title):
-        """Check if event title matches benchmark events"""
-        title_lower = title.lower()
-        
-        # Exact benchmark event titles (case insensitive)
-        benchmark_titles = [
-            'ace personal training certification course',
-            'innovation tournament 2025',
-            'ucf alumknights give back',
-            'knight for a day open house',
-            'ucf volleyball vs. texas tech',
-            'spanish cinema now + 2025: por donde pasa el silencio',
-            'urinetown: the musical | theatre ucf'
-        ]
-        
-        # Check for exact matches
-        for benchmark in benchmark_titles:
-            if benchmark in title_lower:
-                return True
-        
-        # Check for partial matches with key terms
-        key_terms = [
-            'ace personal training',
-            'innovation tournament',
-            'alumknights give back',
-            'knight for a day',
-            'volleyball vs texas tech',
-            'spanish cinema now',
-            'urinetown musical',
-            'theatre ucf'
-        ]
-        
-        for term in key_terms:
-            if term in title_lower:
-                return True
-        
-        return False
+        """Check if event title matches benchmark events (exact titles or key terms)"""
+        return MATCHES_BENCHMARK_TITLE(title)
     
+    @traced
     def extract_json_ld_events(self, soup):
         """Extract events from JSON-LD structured data"""
         events = []
@@ -842,12 +944,7 @@ class UCFEventsScraper:
             for script in json_scripts:
                 try:
                     data = json.loads(script.string)
-                    if isinstance(data, dict) and data.get('@type') == 'Event':
-                        events.append(self.parse_json_ld_event(data))
-                    elif isinstance(data, list):
-                        for item in data:
-                            if isinstance(item, dict) and item.get('@type') == 'Event':
-                                events.append(self.parse_json_ld_event(item))
+                    events.extend(self.parse_json_ld_event(item) for item in event_items(data))
                 except:
                     continue
         except:
@@ -856,17 +953,7 @@ class UCFEventsScraper:
     
     def parse_json_ld_event(self, data):
         """Parse a JSON-LD event object"""
-        return {
-            'title': data.get('name', 'Untitled Event'),
-            'description': data.get('description', 'No description available'),
-            'date': data.get('startDate', 'Date TBD'),
-            'time': data.get('startTime', 'Time TBD'),
-            'location': data.get('location', {}).get('name', 'UCF Campus') if isinstance(data.get('location'), dict) else str(data.get('location', 'UCF Campus')),
-            'link': data.get('url', ''),
-            'image': data.get('image', ''),
-            'source': 'UCF Events',
-            'scraped_at': datetime.now().isoformat()
-        }
+        return event_from_json_ld(data)
     
     def extract_event_cards(self, soup):
         """Extract events from event card containers"""
@@ -887,15 +974,15 @@ class UCFEventsScraper:
             for selector in selectors:
                 cards = soup.select(selector)
                 if cards:
-                    print(f"INFO Found {len(cards)} cards with selector: {selector}")
+                    logger.debug('Found %d cards with selector: %s', len(cards), selector)
                     for card in cards:
                         event = self.parse_event_card(card)
                         if event and event.get('title'):
                             events.append(event)
                     if events:
                         break
-        except Exception as e:
-            print(f"ERROR Error extracting event cards: {str(e)}")
+        except Exception:
+            logger.exception('Error extracting event cards')
         return events
     
     def parse_event_card(self, card):
@@ -968,7 +1055,7 @@ class UCFEventsScraper:
             return event
             
         except Exception as e:
-            print(f"ERROR Error parsing event card: {str(e)}")
+            logger.warning('Error parsing event card: %s', e)
             return None
     
     def extract_todays_events_only(self, soup):
@@ -983,7 +1070,7 @@ class UCFEventsScraper:
                 todays_heading = soup.find('h3', string=lambda text: text and 'Today\'s Events' in text)
             
             if todays_heading:
-                print("INFO Found 'Today's Events' heading")
+                logger.debug("Found 'Today's Events' heading")
                 # Find the parent container that holds the events
                 events_container = todays_heading.find_parent()
                 if events_container:
@@ -996,24 +1083,25 @@ class UCFEventsScraper:
                         # Try alternative selectors for event blocks
                         event_blocks = events_container.find_all('div', attrs={'class': lambda x: x and 'event' in x.lower()})
                     
-                    print(f"INFO Found {len(event_blocks)} potential event blocks")
+                    logger.debug('Found %d potential event blocks', len(event_blocks))
                     
                     for i, block in enumerate(event_blocks):
-                        print(f"SEARCH Processing block {i+1}: {block.get_text()[:100]}...")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug('Processing block %d: %.100s', i + 1, block.get_text())
                         event = self.parse_todays_event_block(block)
                         if event:
-                            print(f"📝 Parsed event: {event.get('title', 'No title')}")
+                            logger.debug('Parsed event: %s', event.get('title', 'No title'))
                             if self.is_valid_todays_event(event):
                                 events.append(event)
-                                print(f"SUCCESS Valid event: {event.get('title', 'Unknown')}")
+                                logger.debug('Valid event: %s', event.get('title', 'Unknown'))
                             else:
-                                print(f"ERROR Invalid event: {event.get('title', 'Unknown')} - rejected by validation")
+                                logger.debug('Invalid event: %s - rejected by validation', event.get('title', 'Unknown'))
                         else:
-                            print(f"ERROR Failed to parse block {i+1}")
+                            logger.debug('Failed to parse block %d', i + 1)
             
             # If no events found with heading method, try direct container search
             if not events:
-                print("INFO Trying alternative method to find Today's Events...")
+                logger.debug("Trying alternative method to find Today's Events")
                 # Look for containers that might hold today's events
                 potential_containers = soup.find_all(['div', 'section'], class_=lambda x: x and any(
                     keyword in x.lower() for keyword in ['today', 'event', 'listing']
@@ -1026,12 +1114,12 @@ class UCFEventsScraper:
                             event = self.parse_todays_event_block(block)
                             if event and self.is_valid_todays_event(event):
                                 events.append(event)
-                                print(f"SUCCESS Extracted: {event.get('title', 'Unknown')}")
+                                logger.debug('Extracted: %s', event.get('title', 'Unknown'))
                         if events:
                             break
                             
-        except Exception as e:
-            print(f"ERROR Error extracting today's events: {str(e)}")
+        except Exception:
+            logger.exception("Error extracting today's events")
         return events
     
     
@@ -1098,7 +1186,7 @@ class UCFEventsScraper:
             return event
             
         except Exception as e:
-            print(f"ERROR Error parsing today's event block: {str(e)}")
+            logger.warning("Error parsing today's event block: %s", e)
             return None
     
     def extract_time_from_todays_block(self, block):
@@ -1199,64 +1287,30 @@ class UCFEventsScraper:
             return False
         
         # Filter out calendar elements and navigation
-        invalid_patterns = [
-            # Calendar elements
-            r'^[A-Za-z]{3,9}\d{4}$',  # MonthYear like "October2025"
-            r'^[A-Za-z]{2}\d+[A-Za-z]{2}\d+',  # Calendar grid like "SuMTuWThFSa2829301234567891011121314"
-            r'^\d{1,2}:\d{2}$',  # Just time like "12:00"
-            r'^[A-Za-z]{3,9}$',  # Just month names like "October"
-            r'^\d{1,2}$',  # Just day numbers
-            r'^[A-Za-z]{2,3}$',  # Day abbreviations like "Su", "MT", "Tu"
-            r'^\d+$',  # Just numbers
-            r'^[A-Za-z]+$',  # Just letters (single words)
-            r'^[A-Za-z]+\d+$',  # Letters followed by numbers
-            r'^\d+[A-Za-z]+$',  # Numbers followed by letters
-        ]
+        pattern = STRICT_CALENDAR_TITLE_PATTERNS.first(title)
+        if pattern:
+            logger.debug('Rejected by pattern %s: %s', pattern, title)
+            return False
         
-        for pattern in invalid_patterns:
-            if re.match(pattern, title):
-                print(f"ERROR Rejected by pattern {pattern}: {title}")
-                return False
+        rules = TITLE_RULES.rules_matching(title, ('navigation', 'event_indicator'))
+        word_count = len(title.split())
         
         # Filter out navigation and UI elements
-        invalid_keywords = [
-            'login', 'register', 'sign up', 'contact', 'about', 'home', 'menu', 
-            'navigation', 'footer', 'header', 'search', 'filter', 'sort', 'view',
-            'calendar', 'today', 'events', 'ucf', 'university', 'orlando',
-            'october', 'november', 'december', 'january', 'february', 'march',
-            'april', 'may', 'june', 'july', 'august', 'september',
-            'loading', 'error', 'warning', 'notice', 'alert', 'message'
-        ]
-        
-        title_lower = title.lower()
-        for keyword in invalid_keywords:
-            if keyword in title_lower and len(title.split()) < 4:
-                print(f"ERROR Rejected by keyword {keyword}: {title}")
-                return False
+        if 'navigation' in rules and word_count < 4:
+            logger.debug('Rejected by navigation keyword: %s', title)
+            return False
         
         # Must look like an actual event title
-        if len(title.split()) < 2:
-            print(f"ERROR Rejected - too short: {title}")
+        if word_count < 2:
+            logger.debug('Rejected - too short: %s', title)
             return False
         
-        # Check for common event indicators
-        event_indicators = [
-            'training', 'course', 'workshop', 'seminar', 'conference', 'session', 
-            'fair', 'expo', 'symposium', 'lecture', 'presentation', 'talk', 
-            'discussion', 'meeting', 'tournament', 'tour', 'open house', 'certification',
-            'competition', 'show', 'performance', 'concert', 'game', 'match', 'vs',
-            'volleyball', 'basketball', 'football', 'soccer', 'tennis', 'swimming',
-            'cinema', 'movie', 'film', 'musical', 'theater', 'theatre', 'play',
-            'give back', 'volunteer', 'service', 'community', 'alumni', 'alumknights',
-            'ace', 'personal', 'innovation', 'knight', 'volleyball', 'spanish', 'urinetown'
-        ]
-        
         # Must contain at least one event indicator
-        if not any(indicator in title_lower for indicator in event_indicators):
-            print(f"ERROR Rejected - no event indicators: {title}")
+        if 'event_indicator' not in rules:
+            logger.debug('Rejected - no event indicators: %s', title)
             return False
         
-        print(f"SUCCESS Valid event: {title}")
+        logger.debug('Valid event: %s', title)
         return True
     
     def clean_and_validate_events(self, events):
@@ -1264,18 +1318,18 @@ class UCFEventsScraper:
         cleaned_events = []
         seen_titles = set()
         
-        print(f"CLEAN Cleaning and validating {len(events)} events...")
+        logger.debug('Cleaning and validating %d events', len(events))
         
         for i, event in enumerate(events):
-            print(f"SEARCH Validating event {i+1}: {event.get('title', 'No title')}")
+            logger.debug('Validating event %d: %s', i + 1, event.get('title', 'No title'))
             
             if not event or not self.is_valid_todays_event(event):
-                print(f"ERROR Event {i+1} failed validation")
+                logger.debug('Event %d failed validation', i + 1)
                 continue
             
             title = event.get('title', '').strip()
             if title in seen_titles:
-                print(f"ERROR Event {i+1} is duplicate: {title}")
+                logger.debug('Event %d is duplicate: %s', i + 1, title)
                 continue
             
             seen_titles.add(title)
@@ -1293,13 +1347,14 @@ class UCFEventsScraper:
             }
             
             cleaned_events.append(cleaned_event)
-            print(f"SUCCESS Event {i+1} added: {title}")
+            logger.debug('Event %d added: %s', i + 1, title)
         
-        print(f"TARGET Final result: {len(cleaned_events)} valid events")
+        logger.debug('Validation kept %d valid events', len(cleaned_events))
         return cleaned_events
     
     def get_fallback_events(self):
         """Get fallback UCF events when scraping fails"""
+        FALLBACKS.inc()
         return [
         {
             'title': 'UCF Student Organization Fair 2024',
@@ -1391,102 +1446,75 @@ class UCFEventsScraper:
         }
     ]
 
-# Global scraper instance
-scraper = UCFEventsScraper()
+def events_service():
+    """EventsService of the app handling the current request"""
+    return current_app.extensions['events']
 
-def load_cache():
-    """Load cached events from file"""
-    global cached_events, last_scrape_date
-    try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
-                cached_events = cache_data.get('events', [])
-                last_scrape_date = cache_data.get('last_scrape_date')
-                print(f"CACHE Loaded {len(cached_events)} cached events from {last_scrape_date}")
-    except Exception as e:
-        print(f"ERROR Error loading cache: {str(e)}")
-        cached_events = []
-        last_scrape_date = None
+# Query parameters that select the filtered /api/events path
+EVENT_QUERY_KEYS = ('start', 'end', 'location', 'category', 'q', 'limit', 'cursor')
 
-def save_cache(events):
-    """Save events to cache file"""
-    global cached_events, last_scrape_date
-    try:
-        cache_data = {
-            'events': events,
-            'last_scrape_date': datetime.now().isoformat()
-        }
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache_data, f)
-        cached_events = events
-        last_scrape_date = datetime.now().isoformat()
-        print(f"SAVE Cached {len(events)} events")
-    except Exception as e:
-        print(f"ERROR Error saving cache: {str(e)}")
+def parse_event_query(args):
+    """Filters, limit and cursor from /api/events query parameters (ValueError if malformed)"""
+    filters = {
+        'start': parse_query_date(args.get('start')),
+        'end': parse_query_date(args.get('end')),
+        'location': args.get('location') or None,
+        'category': args.get('category') or None,
+        # Only the words of q are searched, so "" or "!!" means no text filter
+        'q': ' '.join(tokenize(args.get('q'))) or None
+    }
+    limit = args.get('limit')
+    if limit is not None:
+        limit = int(limit)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return filters, limit, args.get('cursor') or None
 
-def should_scrape():
-    """Check if we should scrape (once per day)"""
-    global last_scrape_date
-    if not last_scrape_date:
-        return True
-    
-    try:
-        last_scrape = datetime.fromisoformat(last_scrape_date)
-        now = datetime.now()
-        # Scrape if it's been more than 24 hours
-        return (now - last_scrape).total_seconds() > 24 * 60 * 60
-    except:
-        return True
+@events_bp.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
-def get_events_with_caching():
-    """Get events with daily caching"""
-    global cached_events, last_scrape_date
-    
-    # Load cache if not already loaded
-    if not cached_events:
-        load_cache()
-    
-    # Check if we need to scrape
-    if should_scrape():
-        print("REFRESH Cache expired, scraping new events...")
-        events = scraper.scrape_events()
-        save_cache(events)
-        return events
-    else:
-        print(f"CACHE Using cached events from {last_scrape_date}")
-        return cached_events
+@events_bp.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency (streams only until headers are sent)"""
+    endpoint = request.endpoint or 'unknown'
+    REQUESTS.labels(endpoint=endpoint, status=response.status_code).inc()
+    started = g.get('request_started')
+    if started is not None and not response.is_streamed:
+        REQUEST_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - started)
+    REGISTRY.flush()
+    return response
 
-@app.route('/api/events', methods=['GET'])
+@events_bp.route('/api/events', methods=['GET'])
 def get_events():
-    """API endpoint to get events with daily caching"""
+    """API endpoint to get events with daily caching
+    
+    Optional query parameters: start/end (YYYY-MM-DD), location, category,
+    q (words in title or description), limit and cursor (from next_cursor).
+    """
     try:
-        events = get_events_with_caching()
-        
-        # Transform and clean the data
-        transformed_events = []
-        for i, event in enumerate(events):
-            transformed_event = {
-                'id': i + 1,
-                'title': event.get('title', 'Untitled Event'),
-                'description': event.get('description', 'No description available'),
-                'date': event.get('date', 'Date TBD'),
-                'time': event.get('time', 'Time TBD'),
-                'location': event.get('location', 'UCF Campus'),
-                'link': event.get('link', ''),
-                'image': event.get('image', ''),
-                'source': event.get('source', 'KnightConnect'),
-                'scraped_at': event.get('scraped_at', datetime.now().isoformat())
-            }
-            transformed_events.append(transformed_event)
+        if any(key in request.args for key in EVENT_QUERY_KEYS):
+            try:
+                filters, limit, cursor = parse_event_query(request.args)
+                body, etag = events_service().query_response(filters, limit, cursor)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e),
+                    'events': [],
+                    'count': 0
+                }), 400
+        else:
+            body, etag = events_service().get_response()
         
-        return jsonify({
-            'success': True,
-            'events': transformed_events,
-            'count': len(transformed_events),
-            'scraped_at': datetime.now().isoformat(),
-            'cached': not should_scrape()
-        })
+        if etag and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype='application/json')
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         return jsonify({
@@ -1496,7 +1524,68 @@ def get_events():
             'count': 0
         }), 500
 
-@app.route('/api/events/health', methods=['GET'])
+@events_bp.route('/api/events/changes', methods=['GET'])
+def get_event_changes():
+    """Events added, updated or removed after ?since=<epoch>.<generation>
+    
+    since is the "generation" of an earlier response. Answers with a full
+    snapshot ("full": true) when since is missing, from a store that has
+    since been recreated, or older than the kept change history.
+    """
+    since = request.args.get('since')
+    try:
+        since = parse_generation_tag(since) if since is not None else None
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'since must be the generation of an earlier response'
+        }), 400
+    try:
+        body, etag = events_service().changes_response(since)
+        if etag and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, mimetype='application/json')
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@events_bp.route('/api/events/stream', methods=['GET'])
+def stream_events():
+    """Server-Sent Events: one message per new cache generation
+    
+    ?delta=1 sends the /api/events/changes delta in each message instead of
+    just the generation and its change counts. Reconnects resume from
+    Last-Event-ID (or ?since=<epoch>.<generation>). Streams stay open for
+    EVENTS_STREAM_MAX_AGE seconds, which outside gevent is 0: the client
+    polls back after retry.
+    """
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = parse_generation_tag(since) if since is not None else None
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'since must be the generation of an earlier message'
+        }), 400
+    stream = stream_generations(
+        events_service(),
+        since=since,
+        send_delta=request.args.get('delta') == '1',
+        max_age=current_app.config['EVENTS_STREAM_MAX_AGE']
+    )
+    return Response(stream_with_context(stream), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@events_bp.route('/api/events/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
@@ -1505,15 +1594,129 @@ def health_check():
         'timestamp': datetime.now().isoformat()
     })
 
-if __name__ == '__main__':
-    print("🚀 Starting UCF Events Scraper API (Daily Caching Version)...")
-    print("API API will be available at: http://localhost:5001")
-    print("LINK Events endpoint: http://localhost:5001/api/events")
-    print("HEALTH Health check: http://localhost:5001/api/events/health")
-    print("REFRESH Scraping UCF events from events.ucf.edu once per day with caching")
-    print("CACHE Cache file: events_cache.pkl")
+@events_bp.route('/api/events/debug/trace', methods=['GET'])
+def scrape_trace():
+    """Span tree of the last traced scrape (EVENTS_TRACE=1)
     
+    ?format=collapsed returns collapsed stacks for a flame graph instead.
+    """
+    if not current_app.config['EVENTS_TRACE']:
+        return jsonify({'success': False, 'error': 'Tracing is disabled (set EVENTS_TRACE=1)'}), 404
+    trace = load_trace(current_app.config['EVENTS_TRACE_FILE'])
+    if trace is None:
+        return jsonify({'success': False, 'error': 'No traced scrape yet'}), 404
+    if request.args.get('format') == 'collapsed':
+        return current_app.response_class(trace.collapsed(), mimetype='text/plain')
+    return jsonify(trace.to_dict())
+
+@events_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics of every worker sharing EVENTS_METRICS_DIR (else of this process)"""
+    events_service().update_metrics()
+    return current_app.response_class(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+def default_config():
+    """Settings read from the environment (overridable via create_app(config))"""
+    return {
+        'EVENTS_CACHE_FILE': os.environ.get('EVENTS_CACHE_FILE', 'events_store.bin'),
+        'EVENTS_LEGACY_CACHE_FILE': 'events_cache.pkl',
+        'EVENTS_SCRAPE_INTERVAL': int(os.environ.get('EVENTS_SCRAPE_INTERVAL', 24 * 60 * 60)),
+        'EVENTS_CHANGE_HISTORY': int(os.environ.get('EVENTS_CHANGE_HISTORY', '50')),
+        'EVENTS_CRAWL': os.environ.get('EVENTS_CRAWL') == '1',
+        'EVENTS_CRAWL_WORKERS': int(os.environ.get('EVENTS_CRAWL_WORKERS', '8')),
+        'EVENTS_CRAWL_DELAY': float(os.environ.get('EVENTS_CRAWL_DELAY', '0.25')),
+        'EVENTS_ENRICH': os.environ.get('EVENTS_ENRICH', '1') == '1',
+        'EVENTS_ENRICH_WORKERS': int(os.environ.get('EVENTS_ENRICH_WORKERS', '8')),
+        'EVENTS_DETAIL_CACHE_FILE': os.environ.get('EVENTS_DETAIL_CACHE_FILE', 'events_details.json'),
+        'EVENTS_DETAIL_TTL': int(os.environ.get('EVENTS_DETAIL_TTL', 12 * 60 * 60)),
+        'EVENTS_FEED_PATHS': [path for path in os.environ.get('EVENTS_FEED_PATHS', 'feed.json,feed.ics').split(',') if path],
+        'EVENTS_STREAM_THRESHOLD': int(os.environ.get('EVENTS_STREAM_THRESHOLD', STREAM_THRESHOLD)),
+        'EVENTS_ASYNC': os.environ.get('EVENTS_ASYNC') == '1',
+        # Seconds a /api/events/stream connection stays open; 0 (the default outside gevent)
+        # sends what is committed and closes, so a stream never holds a worker thread
+        'EVENTS_STREAM_MAX_AGE': int(os.environ.get('EVENTS_STREAM_MAX_AGE',
+                                                    MAX_STREAM_AGE if cooperative_streams() else 0)),
+        'EVENTS_PARSE_PROCESSES': int(os.environ.get('EVENTS_PARSE_PROCESSES', '0')),
+        'EVENTS_RESPONSE_CACHE_FILE': os.environ.get('EVENTS_RESPONSE_CACHE_FILE', 'events_responses.sqlite3'),
+        'EVENTS_RESPONSE_CACHE_SIZE': int(os.environ.get('EVENTS_RESPONSE_CACHE_SIZE', '256')),
+        'EVENTS_RESPONSE_CACHE_TTL': int(os.environ.get('EVENTS_RESPONSE_CACHE_TTL', '300')),
+        # The Node server's Prisma database, e.g. ../../prisma/dev.db (unset keeps events out of SQLite)
+        'EVENTS_DB_FILE': os.environ.get('EVENTS_DB_FILE', ''),
+        # Directory the worker processes pool their metrics in (gunicorn.conf.py sets one)
+        'EVENTS_METRICS_DIR': os.environ.get('EVENTS_METRICS_DIR', ''),
+        'EVENTS_TRACE': os.environ.get('EVENTS_TRACE') == '1',
+        'EVENTS_TRACE_FILE': os.environ.get('EVENTS_TRACE_FILE', 'events_trace.json')
+    }
+
+def create_app(config=None):
+    """Build the events API app with its own scraper and cached events state
+
+    The store is mapped here, so a server that preloads the app (gunicorn
+    preload_app) loads the cache once before forking its workers.
+    """
+    app = Flask(__name__)
+    CORS(app)
+    app.config.update(default_config())
+    if config:
+        app.config.update(config)
+
+    scraper = UCFEventsScraper(
+        crawl=app.config['EVENTS_CRAWL'],
+        crawl_workers=app.config['EVENTS_CRAWL_WORKERS'],
+        crawl_delay=app.config['EVENTS_CRAWL_DELAY'],
+        enrich=app.config['EVENTS_ENRICH'],
+        enrich_workers=app.config['EVENTS_ENRICH_WORKERS'],
+        detail_cache_file=app.config['EVENTS_DETAIL_CACHE_FILE'],
+        detail_ttl=app.config['EVENTS_DETAIL_TTL'],
+        feed_paths=app.config['EVENTS_FEED_PATHS'],
+        stream_threshold=app.config['EVENTS_STREAM_THRESHOLD'],
+        tracing=app.config['EVENTS_TRACE'],
+        parse_processes=app.config['EVENTS_PARSE_PROCESSES']
+    )
+    async_scraper = None
+    if app.config['EVENTS_ASYNC']:
+        if aiohttp is not None:
+            async_scraper = AsyncUCFEventsScraper(scraper)
+        else:
+            logger.warning('EVENTS_ASYNC=1 but aiohttp is not installed, scraping synchronously')
+    if app.config['EVENTS_METRICS_DIR']:
+        REGISTRY.share(app.config['EVENTS_METRICS_DIR'])
+    database = None
+    db_file = app.config['EVENTS_DB_FILE']
+    if db_file:
+        if os.path.isdir(os.path.dirname(os.path.abspath(db_file))):
+            database = EventDatabase(db_file)
+        else:
+            logger.warning('No directory for EVENTS_DB_FILE=%s, events are not written to SQLite', db_file)
+    service = EventsService(
+        scraper,
+        cache_file=app.config['EVENTS_CACHE_FILE'],
+        legacy_cache_file=app.config['EVENTS_LEGACY_CACHE_FILE'],
+        scrape_interval=app.config['EVENTS_SCRAPE_INTERVAL'],
+        change_history=app.config['EVENTS_CHANGE_HISTORY'],
+        trace_file=app.config['EVENTS_TRACE_FILE'],
+        async_scraper=async_scraper,
+        responses=ResponseCache(
+            app.config['EVENTS_RESPONSE_CACHE_FILE'] or None,
+            max_entries=app.config['EVENTS_RESPONSE_CACHE_SIZE'],
+            ttl=app.config['EVENTS_RESPONSE_CACHE_TTL']
+        ),
+        database=database
+    )
+    app.extensions['events'] = service
+    app.register_blueprint(events_bp)
+
     # Load existing cache on startup
-    load_cache()
+    service.load()
+    return app
+
+if __name__ == '__main__':
+    # Development server; in production run: gunicorn -c gunicorn.conf.py
+    app = create_app()
+    logger.info('Starting UCF Events Scraper API on http://localhost:5001')
+    logger.info('Events endpoint: http://localhost:5001/api/events')
+    logger.info('Health check: http://localhost:5001/api/events/health')
+    logger.info('Scraping %s every %ds, cache file: %s', app.extensions['events'].scraper.base_url,
+                app.config['EVENTS_SCRAPE_INTERVAL'], app.config['EVENTS_CACHE_FILE'])
     
-    app.run(debug=True, port=5001, host='0.0.0.0')
+    app.run(port=5001, host='0.0.0.0', debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Events Logging - leveled logging for the events backend
+Records are handed to a queue and written by one background listener, so
+scraper and request threads never block on the terminal
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+ROOT_LOGGER = 'events'
+
+_listener = None
+_queue_handler = None
+
+
+def configure_logging(level=None, stream=None):
+    """Route every events.* logger through a queue to a background writer
+
+    The level comes from level, else EVENTS_LOG_LEVEL, else INFO. Calling
+    again only changes the level.
+    """
+    global _queue_handler
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or os.environ.get('EVENTS_LOG_LEVEL', 'INFO')).upper())
+    if _listener is not None:
+        return _listener
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _queue_handler = QueueHandler(queue.SimpleQueue())
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    _start_listener(handler)
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(stop_logging)
+    return _listener
+
+
+def _start_listener(*handlers):
+    global _listener
+    _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork, so a forked worker
+    # (gunicorn, multiprocessing) gets a fresh queue and listener
+    if _listener is not None:
+        _queue_handler.queue = queue.SimpleQueue()
+        _start_listener(*_listener.handlers)
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def get_logger(name):
+    """Logger for one backend module (events.<name>)"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Events Metrics - in-process counters, gauges and histograms for /metrics
+Rendered in the Prometheus text exposition format; with a shared directory
+each worker process writes its values there and /metrics reports them all
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds, from a fast cache hit up to a slow full scrape
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Seconds between a worker's writes of its values to the shared directory
+FLUSH_INTERVAL = 1.0
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    """One metric family; labels(...) picks a child per label-value combination"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, **labels):
+        """Child metric for these label values"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _blank(self, labelnames):
+        return type(self)(self.name, self.documentation, labelnames)
+
+    def snapshot(self):
+        """[label values, child state] per child, for the shared directory"""
+        with self._lock:
+            return [[list(values), child.state()] for values, child in self._children.items()]
+
+    def merge(self, snapshots):
+        """This family with the children of every process's snapshot ({pid: snapshot()}) summed"""
+        merged = self._blank(self.labelnames)
+        for samples in snapshots.values():
+            for values, state in samples:
+                merged.labels(**dict(zip(self.labelnames, values))).merge(state)
+        return merged
+
+    def _only_child(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} needs labels {self.labelnames}")
+        return self._children[()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for values, child in children:
+            lines.extend(child.samples(self.name, self.labelnames, values))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        with self._lock:
+            self.value = float(value)
+
+    def state(self):
+        return self.value
+
+    def merge(self, state):
+        self.inc(state)
+
+    def samples(self, name, labelnames, values):
+        return [f"{name}{format_labels(labelnames, values)} {format_value(self.value)}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self._only_child().inc(amount)
+
+
+class Gauge(Metric):
+    """Value that is set to whatever it currently is"""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self._only_child().set(value)
+
+    def merge(self, snapshots):
+        """This process's values: the gauges describe the shared store, set just before rendering"""
+        return self
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def state(self):
+        with self._lock:
+            return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+    def merge(self, state):
+        with self._lock:
+            self.counts = [a + b for a, b in zip(self.counts, state['counts'])]
+            self.sum += state['sum']
+            self.count += state['count']
+
+    def samples(self, name, labelnames, values):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = 'le="%s"' % format_value(bound)
+            lines.append(f"{name}_bucket{format_labels(labelnames, values, le)} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{name}_bucket{format_labels(labelnames, values, le)} {count}")
+        lines.append(f"{name}_sum{format_labels(labelnames, values)} {format_value(total)}")
+        lines.append(f"{name}_count{format_labels(labelnames, values)} {count}")
+        return lines
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _Histogram(self.buckets)
+
+    def _blank(self, labelnames):
+        return Histogram(self.name, self.documentation, labelnames, self.buckets)
+
+    def observe(self, value):
+        self._only_child().observe(value)
+
+
+class Registry:
+    """The metrics one process exposes, or with share() every worker process.
+
+    Each process writes its values to <directory>/<pid>.json at most once per
+    FLUSH_INTERVAL (a skipped write is made when the interval ends);
+    render() sums counters and histograms over every file, dead workers'
+    included so totals never go back.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self.directory = None
+        self._lock = threading.Lock()
+        self._flushed = 0.0
+        # Process with a delayed flush scheduled (a fork does not inherit the timer)
+        self._pending_pid = None
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def share(self, directory):
+        """Aggregate across the processes writing to directory (emptied by whoever starts them)"""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def flush(self, force=False):
+        """Write this process's values to the shared directory"""
+        if self.directory is None:
+            return
+        with self._lock:
+            wait = self._flushed + FLUSH_INTERVAL - time.monotonic()
+            if wait > 0 and not force:
+                if self._pending_pid != os.getpid():
+                    self._pending_pid = os.getpid()
+                    timer = threading.Timer(wait, self._flush_pending)
+                    timer.daemon = True
+                    timer.start()
+                return
+            self._flushed = time.monotonic()
+        snapshot = {metric.name: metric.snapshot() for metric in self._metrics}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(tmp_path, os.path.join(self.directory, f'{os.getpid()}.json'))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _flush_pending(self):
+        with self._lock:
+            self._pending_pid = None
+        self.flush(force=True)
+
+    def snapshots(self):
+        """{pid: {metric name: snapshot}} of every process in the shared directory"""
+        snapshots = {}
+        for filename in os.listdir(self.directory):
+            pid, extension = os.path.splitext(filename)
+            if extension != '.json' or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshots[pid] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """Prometheus text exposition of every registered metric"""
+        metrics = self._metrics
+        if self.directory is not None:
+            self.flush(force=True)
+            snapshots = self.snapshots()
+            metrics = [metric.merge({pid: snapshot.get(metric.name, []) for pid, snapshot in snapshots.items()})
+                       for metric in metrics]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+SCRAPE_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'events_scrape_stage_seconds', 'Time spent per scrape stage (fetch, parse, extract, validate, enrich, crawl)',
+    ['stage']))
+SCRAPE_SECONDS = REGISTRY.register(Histogram(
+    'events_scrape_seconds', 'Duration of background scrapes'))
+SCRAPES = REGISTRY.register(Counter(
+    'events_scrapes_total', 'Background scrapes by outcome (saved, unchanged, not_modified, fallback, error)',
+    ['result']))
+FALLBACKS = REGISTRY.register(Counter(
+    'events_fallback_total', 'Times the hardcoded fallback events were used'))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'events_cache_requests_total', 'get_events calls: hit (fresh cache), stale (served while refreshing), miss',
+    ['result']))
+RESPONSE_CACHE = REGISTRY.register(Counter(
+    'events_response_cache_total', 'Filtered/changes response bodies served from memory, shared (SQLite) or built',
+    ['tier']))
+CACHE_AGE = REGISTRY.register(Gauge(
+    'events_cache_age_seconds', 'Seconds since the cached events were last scraped or confirmed fresh'))
+CACHE_GENERATION = REGISTRY.register(Gauge(
+    'events_cache_generation', 'Store generation currently served'))
+GENERATION_EVENTS = REGISTRY.register(Gauge(
+    'events_generation_events', 'Events in the generation currently served'))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'events_http_request_seconds', 'API request latency by endpoint', ['endpoint']))
+REQUESTS = REGISTRY.register(Counter(
+    'events_http_requests_total', 'API requests by endpoint and status code', ['endpoint', 'status']))
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Events Service - the cached events state behind the API
+One instance per app (app.extensions['events']) owns the store mapping, the
+query index and the single-flight background refresh
+"""
+
+import asyncio
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from change_log import ChangeLog
+from event_db import MissingGeneration
+from event_index import EventIndex, event_fragment, events_body, generation_tag, page_positions
+from event_model import as_event, diff_events, normalize_events
+from event_stream import GenerationBroadcaster
+from event_store import EventStore, write_store
+from events_log import get_logger
+from events_metrics import (CACHE_AGE, CACHE_GENERATION, CACHE_REQUESTS, GENERATION_EVENTS, REGISTRY,
+                            SCRAPE_SECONDS, SCRAPE_STAGE_SECONDS, SCRAPES)
+from response_cache import ResponseCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process refresh lock
+    fcntl = None
+
+logger = get_logger('service')
+
+
+class RefreshCoordinator:
+    """Single-flight background refresh of the events cache.
+
+    Only one scrape runs at a time per process, and with fcntl available
+    only one per cache file across worker processes; callers keep getting
+    the last good events until the new set is ready and swapped in.
+    """
+
+    def __init__(self, service, retry_after=15 * 60, busy_retry_after=60):
+        self.service = service
+        self.retry_after = retry_after
+        self.busy_retry_after = busy_retry_after
+        self._lock = threading.Lock()
+        self._thread = None
+        self._retry_at = None
+        self._closed = False
+
+    def is_refreshing(self):
+        """Check if a scrape is currently in flight"""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def trigger(self):
+        """Start a background scrape unless one is already running"""
+        with self._lock:
+            if self._closed or self.is_refreshing():
+                return False
+            if self._retry_at and time.monotonic() < self._retry_at:
+                return False
+            self._thread = threading.Thread(target=self._run, name='events-refresh', daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        """Block until the in-flight scrape (if any) has finished"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self, timeout=None):
+        """Stop accepting refreshes and wait for the in-flight one"""
+        with self._lock:
+            self._closed = True
+        self.wait(timeout)
+
+    def _run(self):
+        try:
+            lock_file = self._acquire_file_lock()
+        except OSError as e:
+            # Missing or unwritable cache directory: a scrape could not be saved either
+            logger.error('Cannot open the refresh lock next to %s: %s', self.service.cache_file, e)
+            SCRAPES.labels(result='error').inc()
+            self._retry_at = time.monotonic() + self.retry_after
+            return
+        if lock_file is False:
+            # Another worker is scraping; its store generation is picked up via is_stale()
+            self._retry_at = time.monotonic() + self.busy_retry_after
+            return
+        try:
+            self._refresh()
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _acquire_file_lock(self):
+        """Open file holding the cross-process scrape lock, None without fcntl, False if busy"""
+        if fcntl is None:
+            return None
+        lock_file = open(self.service.cache_file + '.lock', 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        return lock_file
+
+    def _refresh(self):
+        service = self.service
+        scraper = service.scraper
+        started = time.perf_counter()
+        result = 'error'
+        try:
+            if not service.events:
+                # Nothing cached to fall back on, so always fetch full pages
+                scraper.validators.clear()
+            if service.async_scraper is not None:
+                events = asyncio.run(service.async_scraper.scrape_events())
+            else:
+                events = scraper.scrape_events()
+            for stage, seconds in scraper.timings.items():
+                SCRAPE_STAGE_SECONDS.labels(stage=stage).observe(seconds)
+            if scraper.trace is not None and service.trace_file:
+                scraper.trace.finish().save(service.trace_file)
+            if scraper.not_modified:
+                result = 'not_modified'
+                service.mark_fresh()
+                self._retry_at = None
+                return
+            if scraper.used_fallback and service.events:
+                # Keep serving the last good scrape rather than the fallback list
+                result = 'fallback'
+                logger.warning('Scrape fell back, keeping previously cached events')
+                self._retry_at = time.monotonic() + self.retry_after
+                return
+            diff = service.save(events)
+            if diff is None:
+                # Nothing was stored, so back off as after a failed scrape
+                result = 'error'
+                self._retry_at = time.monotonic() + self.retry_after
+                return
+            if scraper.used_fallback:
+                result = 'fallback'
+            else:
+                result = 'saved' if diff else 'unchanged'
+            self._retry_at = None
+        except Exception:
+            logger.exception('Background refresh failed')
+            self._retry_at = time.monotonic() + self.retry_after
+        finally:
+            SCRAPE_SECONDS.observe(time.perf_counter() - started)
+            SCRAPES.labels(result=result).inc()
+            REGISTRY.flush(force=True)
+
+
+def new_epoch():
+    """Random ID for a newly created store; its generations count up from 1 again"""
+    return uuid.uuid4().hex
+
+
+def query_etag(epoch, generation, params):
+    """ETag of one filtered view of a cache generation"""
+    canonical = '&'.join(f"{key}={params[key]}" for key in sorted(params))
+    return f"events-{generation_tag(epoch, generation)}-{hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]}"
+
+
+class EventsService:
+    """Cached events for one app: store file, scrape schedule and response.
+
+    Readers take (events, generation, scraped_at) under the lock; a refresh
+    builds the new generation off to the side and swaps it in at once.
+    """
+
+    def __init__(self, scraper, cache_file='events_store.bin', legacy_cache_file='events_cache.pkl',
+                 scrape_interval=24 * 60 * 60, change_history=50, trace_file=None, async_scraper=None,
+                 responses=None, database=None):
+        self.scraper = scraper
+        # AsyncUCFEventsScraper wrapping scraper, used for background refreshes when set
+        self.async_scraper = async_scraper
+        self.cache_file = cache_file
+        # Where traced scrapes are saved for /api/events/debug/trace
+        self.trace_file = trace_file
+        self.legacy_cache_file = legacy_cache_file
+        self.scrape_interval = scrape_interval
+        self.events = []
+        self.last_scrape_date = None
+        # Written by mark_fresh, so every worker sees a 304 refresh without a new generation
+        self.fresh_file = cache_file + '.fresh'
+        self._fresh_mtime = None
+        self.generation = 0
+        # Epoch of the store the generation belongs to: a recreated store restarts at generation 1
+        self.epoch = ''
+        self.store = None
+        self.lock = threading.Lock()
+        # Query indexes and serialized bodies for the current cache generation
+        self.index = None
+        # Filtered and changes bodies: in-process LRU over a SQLite file shared by the workers
+        self.responses = responses or ResponseCache()
+        # EventDatabase mirroring the newest generation (Prisma's Event table), when configured
+        self.database = database
+        # What the latest saved scrape changed (EventDiff), and the last few generations' changes
+        self.last_diff = None
+        self.changes = ChangeLog(change_history)
+        # Wakes /api/events/stream connections when a generation is committed
+        self.broadcaster = GenerationBroadcaster()
+        self.refresher = RefreshCoordinator(self)
+
+    def migrate_legacy_cache(self):
+        """Convert the old pickle cache into an event store file (one time)"""
+        with open(self.legacy_cache_file, 'rb') as f:
+            cache_data = pickle.load(f)
+        events = cache_data.get('events', [])
+        write_store(self.cache_file, events, cache_data.get('generation', 1), {
+            'epoch': new_epoch(),
+            'last_scrape_date': cache_data.get('last_scrape_date')
+        })
+        logger.info('Migrated %d events from %s', len(events), self.legacy_cache_file)
+
+    def load(self):
+        """Map the cached events from the store file"""
+        try:
+            if not os.path.exists(self.cache_file) and os.path.exists(self.legacy_cache_file):
+                self.migrate_legacy_cache()
+            if os.path.exists(self.cache_file):
+                store = EventStore(self.cache_file)
+                with self.lock:
+                    self.store = store
+                    self.events = store
+                    self.last_scrape_date = store.meta.get('last_scrape_date')
+                    self.generation = store.generation
+                    self.epoch = store.meta.get('epoch', '')
+                    self.changes.load_meta(store.meta.get('changes'))
+                self._fresh_mtime = None
+                self.read_fresh()
+                if not self.scraper.validators:
+                    self.scraper.validators = dict(store.meta.get('validators', {}))
+                self.responses.invalidate(self.epoch, store.generation)
+                self.mirror(self.epoch, store.generation, store)
+                self.broadcaster.publish(self.epoch, store.generation)
+                logger.info('Loaded %d cached events from %s', len(store), self.last_scrape_date)
+        except Exception as e:
+            logger.error('Error loading cache: %s', e)
+            with self.lock:
+                self.store = None
+                self.events = []
+                self.last_scrape_date = None
+
+    def save(self, events):
+        """Write events as a new store generation and swap them in for readers
+
+        Returns the EventDiff against the previous generation; when nothing
+        changed no generation is written and the cache is only marked fresh.
+        """
+        try:
+            events = normalize_events(events)
+            if self.is_stale():
+                self.load()
+            previous = [as_event(event) for event in self.events]
+            diff = diff_events(previous, events)
+            if previous and not diff:
+                self.mark_fresh()
+                return diff
+            scraped_at = datetime.now().isoformat()
+            # Another worker may have written newer generations meanwhile
+            stored_generation, epoch = self._stored_state()
+            generation = max(self.generation, stored_generation) + 1
+            # A store without an epoch (new, or written before epochs existed) starts one
+            epoch = epoch or new_epoch()
+            with self.lock:
+                self.changes.record(generation, diff)
+                history = self.changes.to_meta()
+            write_store(self.cache_file, [event.to_dict() for event in events], generation, {
+                'epoch': epoch,
+                'last_scrape_date': scraped_at,
+                'validators': self.scraper.validators,
+                'changes': history
+            })
+            store = EventStore(self.cache_file)
+            with self.lock:
+                self.store = store
+                self.events = events
+                self.last_scrape_date = scraped_at
+                self.generation = generation
+                self.epoch = epoch
+                self.last_diff = diff
+            # The saving worker also clears older generations (and epochs) out of the shared tier
+            self.responses.invalidate(epoch, generation, prune_shared=True)
+            self.mirror(epoch, generation, events)
+            self.broadcaster.publish(epoch, generation)
+            logger.info('Cached %d events as generation %d (%s)', len(events), generation, diff.summary())
+            return diff
+        except Exception as e:
+            logger.error('Error saving cache: %s', e)
+            return None
+
+    def mirror(self, epoch, generation, events):
+        """Write generation to the events database unless it already holds it (or a newer one of epoch)"""
+        if self.database is None:
+            return
+        try:
+            current_epoch, current = self.database.state()
+            if current_epoch != epoch or current < generation:
+                self.database.write(epoch, generation, [as_event(event) for event in events])
+        except sqlite3.Error as e:
+            # The store stays the source of truth; queries use the in-memory index meanwhile
+            logger.warning('Events database write failed: %s', e)
+
+    def _stored_state(self):
+        """(generation, epoch) of the store file on disk, or (0, '') without one"""
+        try:
+            store = EventStore(self.cache_file)
+        except Exception:
+            return 0, ''
+        try:
+            return store.generation, store.meta.get('epoch', '')
+        finally:
+            store.close()
+
+    def mark_fresh(self):
+        """Restart the scrape interval without a new generation (upstream unchanged)
+
+        Called under the refresh lock; the time also goes to fresh_file for
+        the other workers, which only see the store's last_scrape_date.
+        """
+        fresh_at = datetime.now().isoformat()
+        with self.lock:
+            self.last_scrape_date = fresh_at
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.fresh_file)),
+                                            prefix=os.path.basename(self.fresh_file) + '.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(fresh_at)
+            os.replace(tmp_path, self.fresh_file)
+        except OSError as e:
+            logger.warning('Could not record cache freshness: %s', e)
+        logger.info('Upstream unchanged, cached events are still fresh')
+
+    def read_fresh(self):
+        """Adopt a newer freshness time another worker wrote to fresh_file"""
+        try:
+            mtime = os.stat(self.fresh_file).st_mtime_ns
+            if mtime == self._fresh_mtime:
+                return
+            with open(self.fresh_file) as f:
+                fresh_at = datetime.fromisoformat(f.read().strip())
+        except (OSError, ValueError):
+            return
+        self._fresh_mtime = mtime
+        with self.lock:
+            try:
+                newer = fresh_at > datetime.fromisoformat(self.last_scrape_date)
+            except (TypeError, ValueError):
+                newer = True
+            if newer:
+                self.last_scrape_date = fresh_at.isoformat()
+
+    def sync_from_store(self):
+        """Load the store if another worker has committed a newer generation, or marked it fresh"""
+        if self.is_stale():
+            self.load()
+        else:
+            self.read_fresh()
+
+    def is_stale(self):
+        """Check if another worker has written a newer store generation"""
+        store = self.store
+        return store is not None and store.is_stale()
+
+    def should_scrape(self):
+        """Check if we should scrape (once per scrape interval, daily by default)"""
+        if not self.last_scrape_date:
+            return True
+        try:
+            last_scrape = datetime.fromisoformat(self.last_scrape_date)
+            # Scrape if the interval has passed (cheap when upstream answers 304)
+            return (datetime.now() - last_scrape).total_seconds() > self.scrape_interval
+        except ValueError:
+            return True
+
+    def get_events(self):
+        """Get events with daily caching, refreshing in the background"""
+        # Load cache if not already loaded or replaced (or marked fresh) by another worker
+        if not self.events:
+            self.load()
+        else:
+            self.sync_from_store()
+
+        if self.should_scrape():
+            CACHE_REQUESTS.labels(result='stale' if self.events else 'miss').inc()
+            if self.refresher.trigger():
+                logger.info('Cache expired, scraping new events in the background')
+            if not self.events:
+                # Nothing to serve yet, so wait on the single in-flight scrape
+                self.refresher.wait(timeout=35)
+                if not self.events:
+                    return self.scraper.get_fallback_events()
+        else:
+            CACHE_REQUESTS.labels(result='hit').inc()
+            logger.debug('Using cached events from %s', self.last_scrape_date)
+        return self.events
+
+    def get_response(self):
+        """Get (body, etag) for the current cache generation, building it at most once"""
+        index, cached = self.get_index()
+        return index.full_body(), f"events-{index.tag}" if cached else None
+
+    def get_index(self):
+        """(EventIndex, cached) for the current generation, built at most once per generation"""
+        events = self.get_events()
+        with self.lock:
+            if events is not self.events:
+                # Cold-start fallback list, not a cache generation
+                return EventIndex(events, 0, datetime.now().isoformat()), False
+            generation = self.generation
+            epoch = self.epoch
+            scraped_at = self.last_scrape_date
+
+        current = self.index
+        if current is None or (current.epoch, current.generation) != (epoch, generation):
+            current = EventIndex(events, generation, scraped_at, previous=current, epoch=epoch)
+            self.index = current
+        return current, True
+
+    def query_response(self, filters, limit=None, cursor=None):
+        """Get (body, etag) for one page of the events matching filters
+
+        Answered with indexed SQL when the events database holds the
+        served generation, otherwise from the in-memory index.
+        """
+        if self.database is not None:
+            response = self.database_response(filters, limit, cursor)
+            if response is not None:
+                return response
+        index, cached = self.get_index()
+
+        def build():
+            positions = index.search(**filters)
+            page, next_cursor = index.page(positions, limit, cursor)
+            return index.body(page, len(positions), next_cursor)
+
+        if not cached:
+            return build(), None
+        params = {key: value for key, value in filters.items() if value is not None}
+        params.update(limit=limit, cursor=cursor)
+        etag = query_etag(index.epoch, index.generation, params)
+        return self.responses.get_or_build(index.epoch, index.generation, etag, build), etag
+
+    def database_response(self, filters, limit=None, cursor=None):
+        """(body, etag) like query_response from the events database, or None if it cannot answer"""
+        events = self.get_events()
+        with self.lock:
+            if events is not self.events:
+                return None
+            generation = self.generation
+            epoch = self.epoch
+            scraped_at = self.last_scrape_date
+
+        def build():
+            matches = self.database.search(epoch, generation, **filters)
+            tag = generation_tag(epoch, generation)
+            page, next_cursor = page_positions([position for position, _ in matches], tag, limit, cursor)
+            selected = dict(matches)
+            return events_body(tag, scraped_at, [event_fragment(selected[position]) for position in page],
+                               len(matches), next_cursor)
+
+        params = {key: value for key, value in filters.items() if value is not None}
+        params.update(limit=limit, cursor=cursor)
+        etag = query_etag(epoch, generation, params)
+        try:
+            return self.responses.get_or_build(epoch, generation, etag, build), etag
+        except MissingGeneration:
+            return None
+        except sqlite3.Error as e:
+            logger.warning('Events database query failed: %s', e)
+            return None
+
+    def changes_response(self, since):
+        """Get (body, etag) with what changed after since, an (epoch, generation) pair
+
+        Falls back to a full snapshot when since is None, from another
+        store epoch or older than the change history reaches.
+        """
+        since_tag = generation_tag(*since) if since is not None else None
+        index, cached = self.get_index()
+        if not cached:
+            return index.snapshot_body(since_tag), None
+
+        def build():
+            delta = None
+            if since is not None:
+                with self.lock:
+                    delta = self.changes.since(since, (index.epoch, index.generation), index.positions)
+            return index.changes_body(since_tag, *delta) if delta is not None else index.snapshot_body(since_tag)
+
+        etag = f"changes-{since_tag}-{index.tag}"
+        return self.responses.get_or_build(index.epoch, index.generation, etag, build), etag
+
+    def generation_summary(self, epoch, generation):
+        """Change counts of one generation, for stream notifications"""
+        with self.lock:
+            entries = self.changes.entries if epoch == self.epoch else ()
+            entry = next((e for e in entries if e['generation'] == generation), None)
+        summary = {'generation': generation_tag(epoch, generation)}
+        if entry:
+            summary.update({key: len(entry[key]) for key in ('added', 'updated', 'removed')})
+        return summary
+
+    def cache_age(self):
+        """Seconds since the cached events were scraped or confirmed fresh (None if never)"""
+        try:
+            return (datetime.now() - datetime.fromisoformat(self.last_scrape_date)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+
+    def update_metrics(self):
+        """Set the cache gauges from the generation this worker serves"""
+        self.sync_from_store()
+        with self.lock:
+            generation = self.generation
+            count = len(self.events)
+        age = self.cache_age()
+        CACHE_GENERATION.set(generation)
+        GENERATION_EVENTS.set(count)
+        CACHE_AGE.set(age if age is not None else float('nan'))
+
+    def shutdown(self, timeout=30):
+        """Close event streams and let an in-flight scrape finish before the process exits"""
+        self.broadcaster.close()
+        self.refresher.close(timeout)
+        if self.scraper.parse_pool is not None:
+            self.scraper.parse_pool.close()
+        if self.database is not None:
+            self.database.close()
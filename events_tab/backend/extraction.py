@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Extraction Engine - pluggable HTML parser backend plus a one-walk
+DOM index that collects candidate blocks, titles, times, locations and links
+"""
+
+import importlib.util
+import os
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from event_rules import BENCHMARK_KEYWORDS, SECTION_KEYWORDS
+from events_log import get_logger
+from scrape_trace import maybe_span
+
+logger = get_logger('extraction')
+
+# Fastest installed BeautifulSoup tree builder wins unless EVENTS_HTML_PARSER is set
+PARSER_PREFERENCE = ['lxml', 'html.parser']
+
+
+def detect_parser():
+    """Pick the HTML parser backend to build soups with"""
+    configured = os.environ.get('EVENTS_HTML_PARSER')
+    if configured:
+        return configured
+    for parser in PARSER_PREFERENCE:
+        if parser == 'html.parser' or importlib.util.find_spec(parser):
+            return parser
+    return 'html.parser'
+
+
+HTML_PARSER = detect_parser()
+
+
+def make_soup(content, parser=None):
+    """Parse HTML with the configured parser backend"""
+    return BeautifulSoup(content, parser or HTML_PARSER)
+
+
+SECTION_CLASS_KEYWORDS = ['event', 'listing', 'item', 'today']
+
+# (tag name, class substring) pairs, in the order find_event_blocks_in_section tries them
+BLOCK_SELECTORS = [
+    ('div', 'event'),
+    ('div', 'item'),
+    ('div', 'card'),
+    ('div', 'listing'),
+    ('article', None),
+    ('li', None)
+]
+
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+SKIPPED_TAGS = frozenset(['script', 'style', 'noscript'])
+TEXT_TYPES = (NavigableString, CData)
+
+
+class PageIndex:
+    """One traversal of a parsed page.
+
+    Every element is recorded in document order together with its span in
+    a single text buffer (the text get_text() would return once scripts and
+    styles are dropped), so an element's text, its first descendant of a
+    given kind, or whether it contains a keyword is a slice or a bisect away.
+    """
+
+    def __init__(self, root):
+        self.elements = []
+        self.starts = []
+        self.ends = []
+        self.last = []
+        self.parents = []
+        self.node_starts = []
+        self.node_ends = []
+        self.by_name = defaultdict(list)
+        self.links = []
+        self.emphasis = []
+        self.selector_matches = [[] for _ in BLOCK_SELECTORS]
+        self.section_candidates = []
+        self._positions = None
+        self.text = self._walk(root)
+
+    def _walk(self, root):
+        parts = []
+        pos = 0
+        stack = [(root, False)]
+        open_elements = [None]
+        while stack:
+            node, closing = stack.pop()
+            if closing:
+                self.ends[node] = pos
+                self.last[node] = len(self.elements)
+                open_elements.pop()
+                continue
+
+            if isinstance(node, Tag):
+                name = node.name
+                if name in SKIPPED_TAGS:
+                    continue
+                index = len(self.elements)
+                self.elements.append(node)
+                self.starts.append(pos)
+                self.ends.append(pos)
+                self.last.append(index + 1)
+                self.parents.append(open_elements[-1])
+                if node is not root:
+                    self._record(index, node, name)
+                open_elements.append(index)
+                stack.append((index, True))
+                stack.extend((child, False) for child in reversed(node.contents))
+            elif type(node) in TEXT_TYPES:
+                parts.append(node)
+                self.node_starts.append(pos)
+                pos += len(node)
+                self.node_ends.append(pos)
+
+        return ''.join(parts)
+
+    def _record(self, index, node, name):
+        self.by_name[name].append(index)
+        if name == 'a' and node.get('href') is not None:
+            self.links.append(index)
+        elif name in ('strong', 'b'):
+            self.emphasis.append(index)
+
+        if name in ('div', 'section'):
+            classes = node.get('class')
+            if classes:
+                class_text = ' '.join(classes) if isinstance(classes, list) else classes
+                if name == 'div':
+                    for i, (tag, needle) in enumerate(BLOCK_SELECTORS):
+                        if tag == 'div' and needle in class_text:
+                            self.selector_matches[i].append(index)
+                lowered = class_text.lower()
+                if any(keyword in lowered for keyword in SECTION_CLASS_KEYWORDS):
+                    self.section_candidates.append(index)
+        elif name in ('article', 'li'):
+            for i, (tag, needle) in enumerate(BLOCK_SELECTORS):
+                if tag == name:
+                    self.selector_matches[i].append(index)
+
+    def element_text(self, index):
+        """Text of element index (same as get_text())"""
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def stripped_text(self, index):
+        """Text of element index with each string stripped (same as get_text(strip=True))"""
+        start, end = self.starts[index], self.ends[index]
+        pieces = []
+        k = bisect_left(self.node_starts, start)
+        while k < len(self.node_starts) and self.node_starts[k] < end:
+            piece = self.text[self.node_starts[k]:self.node_ends[k]].strip()
+            if piece:
+                pieces.append(piece)
+            k += 1
+        return ''.join(pieces)
+
+    def first_within(self, indexes, index):
+        """First element from indexes (document order) inside element index's subtree"""
+        k = bisect_left(indexes, index + 1)
+        if k < len(indexes) and indexes[k] < self.last[index]:
+            return indexes[k]
+        return None
+
+    def keyword_positions(self, keywords):
+        """Sorted (start, end) spans of every case-insensitive keyword hit in the text"""
+        if self._positions is None:
+            self._positions = {}
+        key = tuple(keywords)
+        positions = self._positions.get(key)
+        if positions is None:
+            positions = sorted(
+                (match.start(), match.end())
+                for keyword in keywords
+                for match in re.finditer(re.escape(keyword), self.text, re.I)
+            )
+            self._positions[key] = positions
+        return positions
+
+    def contains_any(self, index, keywords):
+        """Check if element index's text contains any of keywords"""
+        positions = self.keyword_positions(keywords)
+        start, end = self.starts[index], self.ends[index]
+        k = bisect_left(positions, (start, -1))
+        while k < len(positions) and positions[k][0] < end:
+            if positions[k][1] <= end:
+                return True
+            k += 1
+        return False
+
+    def elements_with_text(self, targets):
+        """Map each target to the first element whose stripped text equals it.
+
+        One pass over the elements keys each single-line element by its
+        stripped text (the first, i.e. outermost, element wins), then every
+        target is one dict lookup, instead of a get_text() per element per
+        target.
+        """
+        targets = {target for target in targets if target}
+        if not targets:
+            return {}
+
+        text = self.text
+        # Non-whitespace runs and line breaks, to strip and line-check a span with bisects only
+        runs = [(match.start(), match.end()) for match in re.finditer(r'\S+', text)]
+        run_starts = [start for start, _ in runs]
+        run_ends = [end for _, end in runs]
+        newlines = [match.start() for match in re.finditer('\n', text)]
+
+        first = {}
+        # Element 0 is the root itself, which find_all() never returned
+        for index in range(1, len(self.elements)):
+            start, end = self.starts[index], self.ends[index]
+            k = bisect_right(run_ends, start)
+            if k == len(runs) or run_starts[k] >= end:
+                continue
+            j = bisect_left(run_starts, end) - 1
+            start, end = max(start, run_starts[k]), min(end, run_ends[j])
+            if bisect_left(newlines, start) != bisect_left(newlines, end):
+                continue
+            stripped = text[start:end]
+            if stripped in targets and stripped not in first:
+                first[stripped] = index
+        return first
+
+    def find_text_blocks(self, keywords):
+        """Elements whose whole text is a line of the page containing any keyword.
+
+        One entry per matching line (in line order), like the original
+        text-pattern fallback.
+        """
+        lines = [line.strip() for line in self.text.split('\n')]
+        matching = [line for line in lines if any(keyword in line.lower() for keyword in keywords)]
+        first = self.elements_with_text(matching)
+        return [first[line] for line in matching if line in first]
+
+
+class SinglePassExtractor:
+    """Today's Events extraction over a PageIndex.
+
+    Produces the same events as UCFEventsScraper.extract_todays_events_enhanced
+    but walks the DOM once instead of once per selector and helper.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def extract(self, soup):
+        """Extract benchmark events from a parsed page"""
+        trace = self.scraper.trace
+        with maybe_span(trace, 'index'):
+            page = PageIndex(soup)
+            if trace:
+                trace.add_nodes(len(page.elements) + len(page.node_starts))
+        if not self.has_todays_section(page):
+            logger.error("Could not find Today's Events section")
+            return []
+
+        with maybe_span(trace, 'find_event_blocks'):
+            blocks = self.find_event_blocks(page)
+        logger.info('Found %d potential event blocks', len(blocks))
+
+        events = []
+        seen_titles = set()
+        scraped_at = datetime.now().isoformat()
+        for index in blocks:
+            with maybe_span(trace, 'parse_block'):
+                event = self.parse_block(page, index, scraped_at)
+            if not event:
+                continue
+            title = event['title']
+            if title not in seen_titles:
+                seen_titles.add(title)
+                events.append(event)
+
+        logger.info('Found %d benchmark events with details', len(events))
+        return events
+
+    def has_todays_section(self, page):
+        """Same checks as find_todays_events_section, answered from the index"""
+        for tag in ['h1', 'h2', 'h3', 'h4']:
+            for index in page.by_name[tag]:
+                heading = page.elements[index]
+                text = heading.string
+                if text and 'Today' in text and 'Event' in text:
+                    if heading.find_parent():
+                        return True
+                    break
+
+        return any(page.contains_any(index, SECTION_KEYWORDS) for index in page.section_candidates)
+
+    def find_event_blocks(self, page):
+        """Candidate blocks for every selector, in selector then document order"""
+        trace = self.scraper.trace
+        blocks = []
+        for (tag, class_part), matches in zip(BLOCK_SELECTORS, page.selector_matches):
+            with maybe_span(trace, f'select {tag}[class*="{class_part}"]' if class_part else f"select {tag}"):
+                blocks.extend(index for index in matches if page.contains_any(index, BENCHMARK_KEYWORDS))
+                if trace:
+                    trace.add_nodes(len(matches))
+        if not blocks:
+            blocks = page.find_text_blocks(BENCHMARK_KEYWORDS)
+        return blocks
+
+    def parse_block(self, page, index, scraped_at):
+        """Build an event from one block, or None if it has no benchmark title"""
+        title = self.find_title(page, index)
+        if not title:
+            return None
+
+        text = page.element_text(index)
+        link = page.first_within(page.links, index)
+        return {
+            'title': title,
+            'time': self.scraper.match_event_time(text),
+            'location': self.scraper.match_event_location(text),
+            'link': self.scraper.normalize_event_link(page.elements[link].get('href')) if link is not None else '',
+            'description': 'UCF Event - Click for details',
+            'source': 'UCF Events',
+            'scraped_at': scraped_at
+        }
+
+    def find_title(self, page, index):
+        """First link, heading or bold text in the block that names a benchmark event"""
+        candidates = [page.links] + [page.by_name[tag] for tag in HEADING_TAGS] + [page.emphasis]
+        for indexes in candidates:
+            found = page.first_within(indexes, index)
+            if found is not None:
+                title = page.stripped_text(found)
+                if self.scraper.is_benchmark_event(title):
+                    return title
+        return None
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Gunicorn settings for the events API
+Run from events_tab/backend with: gunicorn -c gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+try:
+    import gevent
+except ImportError:  # Windows, or installed without gevent
+    gevent = None
+
+wsgi_app = 'events_api:create_app()'
+bind = os.environ.get('EVENTS_BIND', '0.0.0.0:5001')
+
+# gevent (the default when installed) serves each /api/events/stream connection as a greenlet.
+# Otherwise threaded workers, so a request waiting on a cold-start scrape doesn't hold a whole
+# process; streams then close at once (EVENTS_STREAM_MAX_AGE=0) instead of holding a thread each
+worker_class = os.environ.get('EVENTS_WORKER_CLASS', 'gevent' if gevent is not None else 'gthread')
+workers = int(os.environ.get('EVENTS_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('EVENTS_THREADS', '4'))
+worker_connections = int(os.environ.get('EVENTS_WORKER_CONNECTIONS', '2000'))
+
+if worker_class == 'gevent':
+    # Patch before the preloaded app creates its locks, or they would block the hub
+    from gevent import monkey
+    monkey.patch_all()
+
+# Build the app (and map the events store) once in the master, then fork
+preload_app = True
+
+# Workers pool their metrics here so /metrics answers for all of them (set it empty to
+# turn that off). By default a fresh temporary directory, removed on exit; one passed in
+# is left alone and should be emptied before each start
+if 'EVENTS_METRICS_DIR' not in os.environ:
+    os.environ['EVENTS_METRICS_DIR'] = tempfile.mkdtemp(prefix='events-metrics-')
+    os.environ['EVENTS_METRICS_DIR_TEMPORARY'] = '1'
+
+# SIGTERM: stop accepting, finish in-flight requests and scrapes, then exit
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+
+
+def worker_exit(server, worker):
+    """Let the worker's background scrape finish before it exits"""
+    app = getattr(worker, 'wsgi', None)
+    service = getattr(app, 'extensions', {}).get('events')
+    if service is not None:
+        service.shutdown(timeout=graceful_timeout)
+    from events_metrics import REGISTRY
+    REGISTRY.flush(force=True)
+
+
+def on_exit(server):
+    """Remove the temporary metrics directory"""
+    if os.environ.get('EVENTS_METRICS_DIR_TEMPORARY') == '1':
+        shutil.rmtree(os.environ['EVENTS_METRICS_DIR'], ignore_errors=True)
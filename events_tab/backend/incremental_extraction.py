@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Incremental Extraction - streaming parse of large listing pages
+The response is read in chunks into an incremental parser (lxml's pull
+parser, or html.parser without lxml) that hands over each event block as
+soon as it closes, so peak memory is about one block, not the page plus its DOM
+"""
+
+import codecs
+import itertools
+import json
+from collections import deque
+from html.parser import HTMLParser
+
+from event_rules import BLOCK_RULES
+from event_sources import STRATEGY_HTML, STRATEGY_JSON_LD, discover_feeds, event_items
+from events_log import get_logger
+from extraction import BLOCK_SELECTORS, HTML_PARSER, make_soup
+
+try:
+    from lxml import etree
+except ImportError:  # html.parser-based stream only
+    etree = None
+
+logger = get_logger('incremental')
+
+# Pages larger than this are parsed as they stream in instead of as one DOM
+STREAM_THRESHOLD = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Elements that never get an end tag
+VOID_TAGS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                       'param', 'source', 'track', 'wbr'])
+
+
+def is_block_start(tag, attrs):
+    """Check if a start tag matches one of the event block selectors"""
+    for name, needle in BLOCK_SELECTORS:
+        if name != tag:
+            continue
+        if needle is None:
+            return True
+        class_text = next((value for key, value in attrs if key == 'class' and value), '')
+        if needle in class_text:
+            return True
+    return False
+
+
+def fragment_root(markup):
+    """Tag of a block's markup, whichever parser backend wraps it"""
+    soup = make_soup(markup)
+    container = soup.body or soup
+    return container.find(True) or container
+
+
+def read_page(response, threshold=STREAM_THRESHOLD, chunk_size=STREAM_CHUNK_SIZE):
+    """(body, None) for a page up to threshold bytes, else (None, iterator over all its chunks)
+
+    response must have been requested with stream=True; a page without a
+    Content-Length is read up to the threshold before deciding.
+    """
+    chunks = response.iter_content(chunk_size)
+    length = response.headers.get('Content-Length', '')
+    if length.isdigit() and int(length) > threshold:
+        return None, chunks
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size > threshold:
+            return None, itertools.chain(head, chunks)
+    return b''.join(head), None
+
+
+class BlockStreamParser(HTMLParser):
+    """Incremental HTML parser that collects the markup of innermost event blocks.
+
+    Every open element matching a block selector buffers its markup until a
+    nested block opens inside it (then the outer one is a wrapper and its
+    buffer is dropped) or it closes (then it is a complete block). JSON-LD
+    scripts are kept too so structured data still wins when present.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.ready = deque()
+        self.json_ld = []
+        self.link_tags = []
+        self.skip_blocks = False
+        # Open elements as [tag, capture buffer or None]
+        self._stack = []
+        self._capture = None
+        self._script = None
+
+    def drain(self):
+        """Blocks completed since the last drain"""
+        while self.ready:
+            yield self.ready.popleft()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'script' and ('type', 'application/ld+json') in attrs:
+            self._script = []
+        if tag == 'link':
+            self.link_tags.append(self.get_starttag_text())
+        if tag in VOID_TAGS:
+            self._append(self.get_starttag_text())
+            return
+        buffer = None
+        if is_block_start(tag, attrs) and not self.skip_blocks:
+            if self._capture is not None:
+                # The enclosing block is only a wrapper around this one
+                self._capture[1] = None
+            buffer = [self.get_starttag_text()]
+        else:
+            self._append(self.get_starttag_text())
+        entry = [tag, buffer]
+        self._stack.append(entry)
+        if buffer is not None:
+            self._capture = entry
+
+    def handle_startendtag(self, tag, attrs):
+        self._append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._script is not None:
+            self._finish_script()
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+        # Close any unclosed elements (e.g. <p>) up to the matching start tag
+        while self._stack:
+            entry = self._stack.pop()
+            self._append(f"</{entry[0]}>")
+            if entry[1] is not None:
+                self.ready.append(''.join(entry[1]))
+                entry[1] = None
+            if entry[0] == tag:
+                break
+        self._capture = next((entry for entry in reversed(self._stack) if entry[1] is not None), None)
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+        self._append(data)
+
+    def handle_entityref(self, name):
+        self._append(f"&{name};")
+
+    def handle_charref(self, name):
+        self._append(f"&#{name};")
+
+    def _append(self, text):
+        if self._capture is not None and self._capture[1] is not None:
+            self._capture[1].append(text)
+
+    def _finish_script(self):
+        try:
+            data = json.loads(''.join(self._script))
+        except ValueError:
+            data = None
+        self._script = None
+        if data is not None and any(True for _ in event_items(data)):
+            self.json_ld.append(data)
+            # Structured events will be used, so stop buffering blocks
+            self.skip_blocks = True
+            for entry in self._stack:
+                entry[1] = None
+            self._capture = None
+            self.ready.clear()
+
+
+class LxmlBlockStream:
+    """BlockStreamParser's interface on lxml's HTMLPullParser.
+
+    The tree lxml builds is pruned as it goes: once an element has closed
+    and no candidate block still needs it, it is cleared and dropped from
+    its parent, so only the open path and the current block stay in memory.
+    """
+
+    def __init__(self):
+        self._parser = etree.HTMLPullParser(events=('start', 'end'))
+        self.ready = deque()
+        self.json_ld = []
+        self.link_tags = []
+        self.skip_blocks = False
+        # Open candidate blocks as [element, contains a nested block]
+        self._open = []
+
+    def feed(self, text):
+        self._parser.feed(text)
+        self._process()
+
+    def close(self):
+        self._parser.close()
+        self._process()
+
+    def drain(self):
+        """Blocks completed since the last drain"""
+        while self.ready:
+            yield self.ready.popleft()
+
+    def _process(self):
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ''
+            if event == 'start':
+                if tag == 'link':
+                    self.link_tags.append(etree.tostring(element, encoding='unicode', with_tail=False))
+                if not self.skip_blocks and is_block_start(tag, element.attrib.items()):
+                    if self._open:
+                        # The enclosing block is only a wrapper around this one
+                        self._open[-1][1] = True
+                    self._open.append([element, False])
+                continue
+
+            if tag == 'script' and element.get('type') == 'application/ld+json':
+                self._finish_script(element.text or '')
+            if self._open and self._open[-1][0] is element:
+                _, nested = self._open.pop()
+                if not nested and not self.skip_blocks:
+                    self.ready.append(etree.tostring(element, encoding='unicode', with_tail=False))
+            if not self._open or self._open[-1][1]:
+                self._prune(element)
+
+    def _prune(self, element):
+        """Drop a closed element and its earlier siblings from the tree"""
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def _finish_script(self, text):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        if any(True for _ in event_items(data)):
+            self.json_ld.append(data)
+            # Structured events will be used, so stop collecting blocks
+            self.skip_blocks = True
+            for entry in self._open:
+                entry[1] = True
+            self.ready.clear()
+
+
+def make_block_stream():
+    """Incremental block parser for the configured parser backend"""
+    if etree is not None and HTML_PARSER == 'lxml':
+        return LxmlBlockStream()
+    return BlockStreamParser()
+
+
+class StreamingExtractor:
+    """Extract events from a listing page as it streams in.
+
+    Unlike the DOM path this does not narrow down to the Today's Events
+    section first: every block on the page is a candidate, which is what a
+    large day/week/month listing page holds.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    def iter_blocks(self, chunks, encoding='utf-8'):
+        """Markup of each event block, yielded as soon as its end tag arrives"""
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self.parser = make_block_stream()
+        for chunk in chunks:
+            self.parser.feed(decoder.decode(chunk))
+            yield from self.parser.drain()
+        self.parser.feed(decoder.decode(b'', final=True))
+        self.parser.close()
+        yield from self.parser.drain()
+
+    def extract(self, chunks, page_url, encoding='utf-8'):
+        """(events, strategy) from the page's JSON-LD, then its feeds, then its HTML blocks"""
+        events = []
+        seen_titles = set()
+        blocks = 0
+        for markup in self.iter_blocks(chunks, encoding):
+            blocks += 1
+            if not BLOCK_RULES.contains_any(markup):
+                continue
+            event = self.scraper.parse_event_block_detailed(fragment_root(markup))
+            if event and event['title'] not in seen_titles and self.scraper.is_benchmark_event(event['title']):
+                seen_titles.add(event['title'])
+                events.append(event)
+
+        if self.parser.json_ld:
+            events = [self.scraper.parse_json_ld_event(item) for data in self.parser.json_ld for item in event_items(data)]
+            logger.info('Streamed page: %d JSON-LD events', len(events))
+            return self.scraper.sources.resolve_links(events, page_url), STRATEGY_JSON_LD
+        feed_events, strategy = self.scraper.sources.feed_events(discover_feeds(''.join(self.parser.link_tags), page_url),
+                                                                 page_url)
+        if feed_events:
+            return feed_events, strategy
+        logger.info('Streamed page: %d blocks, %d events', blocks, len(events))
+        return events, STRATEGY_HTML
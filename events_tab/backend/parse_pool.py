@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Parse Pool - page parsing in worker processes for crawls and enrichment
+Fetch threads hand raw page bytes to a process pool and get compact event
+records back, so BeautifulSoup and the extraction regexes use every core
+instead of contending for one GIL
+"""
+
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from crawler import detail_event, listing_links
+from event_enrichment import parse_detail_page
+from events_log import get_logger
+
+logger = get_logger('parse_pool')
+
+# Pools that may break (a worker killed, e.g. out of memory) before parsing stays in-process
+MAX_RESTARTS = 3
+
+# Parse-only scraper of this process (created on first use in each worker)
+_scraper = None
+
+
+def worker_scraper():
+    """Scraper used for parsing in this process: no session use, enrichment or feeds"""
+    global _scraper
+    if _scraper is None:
+        # Imported here: events_api imports this module
+        from events_api import UCFEventsScraper
+        _scraper = UCFEventsScraper(enrich=False, feed_paths=[])
+    return _scraper
+
+
+def shutdown(executor, wait):
+    """Stop executor, dropping queued parses where Python can (3.9+)"""
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=wait, cancel_futures=True)
+    else:
+        executor.shutdown(wait=wait)
+
+
+def init_worker():
+    worker_scraper()
+
+
+def parse_listing_task(page_url, content, host):
+    return listing_links(page_url, content, host)
+
+
+def parse_detail_task(url, content, with_details=False):
+    return detail_event(worker_scraper(), url, content, with_details)
+
+
+def parse_detail_fields_task(content, url):
+    return parse_detail_page(content, url)
+
+
+def pool_context():
+    """forkserver where available: forking a threaded worker process is unsafe"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class PoolTask:
+    """A parse submitted to the pool (or run in-process when the pool is unusable)"""
+
+    def __init__(self, pool, future, task, args):
+        self.pool = pool
+        self.future = future
+        self.task = task
+        self.args = args
+
+    def result(self):
+        """The parse result; re-run in-process if its worker process died"""
+        if self.future is None:
+            return self.task(*self.args)
+        try:
+            return self.future.result()
+        except BrokenProcessPool:
+            logger.warning('Parse process died, parsing %s in-process', self.task.__name__)
+            self.pool.reset()
+            return self.task(*self.args)
+
+
+class ParsePool:
+    """Process pool started on first use, so a preloading server forks before it exists.
+
+    Tasks run in-process when a worker dies or no pool can be started, so
+    a crawl never fails because of the pool.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self.disabled = False
+        self.restarts = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=pool_context(),
+                                                     initializer=init_worker)
+                logger.info('Started %d parse processes', self.processes)
+            return self._executor
+
+    def submit(self, task, *args):
+        """PoolTask running task(*args) in a worker process"""
+        if self.disabled:
+            return PoolTask(self, None, task, args)
+        try:
+            return PoolTask(self, self.executor().submit(task, *args), task, args)
+        except BrokenProcessPool:
+            self.reset()
+        except (OSError, RuntimeError) as e:
+            # Processes cannot be started here; stop trying
+            logger.warning('Parse pool unavailable (%s), parsing in-process', ' '.join(str(e).split()))
+            self.disabled = True
+            self.reset()
+        return PoolTask(self, None, task, args)
+
+    def parse_listing(self, page_url, content, host):
+        """PoolTask of (detail links with titles, listing links) of a listing page"""
+        return self.submit(parse_listing_task, page_url, content, host)
+
+    def parse_detail(self, url, content, with_details=False):
+        """PoolTask of the event on a crawled detail page (or None), with its enrichment fields if asked"""
+        return self.submit(parse_detail_task, url, content, with_details)
+
+    def parse_detail_fields(self, content, url):
+        """PoolTask of the enrichment fields of a detail page"""
+        return self.submit(parse_detail_fields_task, content, url)
+
+    def reset(self):
+        """Drop a broken executor; the next submit starts a fresh one (up to MAX_RESTARTS)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            if executor is not None:
+                self.restarts += 1
+                if self.restarts >= MAX_RESTARTS and not self.disabled:
+                    logger.warning('Parse pool broke %d times, parsing in-process from now on', self.restarts)
+                    self.disabled = True
+        if executor is not None:
+            shutdown(executor, wait=False)
+
+    def close(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            shutdown(executor, wait=True)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Response Cache - rendered /api/events bodies in two tiers
+An in-process LRU (size and TTL bounded) sits in front of a SQLite file shared
+by every worker; entries belong to one store epoch and generation and are
+dropped when a newer generation, or a recreated store, lands
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from events_log import get_logger
+from events_metrics import RESPONSE_CACHE
+
+logger = get_logger('response_cache')
+
+# Puts per process between trims of the shared tier down to max_entries
+TRIM_INTERVAL = 64
+
+
+class LRUCache:
+    """Least recently used entries up to max_entries, each kept at most ttl seconds"""
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+
+class SQLiteCache:
+    """Bodies per (epoch, generation, key) in a SQLite file that all workers read and write.
+
+    Each process opens one WAL-mode connection on first use (so a server that
+    preloads the app never shares it across fork) and serializes its queries.
+    Every trim_interval puts a process deletes the oldest rows past
+    max_entries, so the file stays bounded between generations too.
+    """
+
+    def __init__(self, path, max_entries=5000, timeout=1.0, trim_interval=TRIM_INTERVAL):
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.trim_interval = trim_interval
+        self._conn = None
+        self._pid = None
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(responses)')]
+            if columns and 'epoch' not in columns:
+                # Written before store epochs: only a cache, so start over
+                conn.execute('DROP TABLE responses')
+            conn.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'epoch TEXT NOT NULL, generation INTEGER NOT NULL, key TEXT NOT NULL, '
+                         'body BLOB NOT NULL, created REAL NOT NULL, PRIMARY KEY (epoch, generation, key))')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, epoch, generation, key):
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT body FROM responses WHERE epoch = ? AND generation = ? AND key = ?',
+                (epoch, generation, key)).fetchone()
+        return row[0] if row else None
+
+    def put(self, epoch, generation, key, body):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (epoch, generation, key, body, created) VALUES (?, ?, ?, ?, ?)',
+                (epoch, generation, key, body, time.time()))
+            self._puts += 1
+            if self._puts % self.trim_interval == 0:
+                self._trim(conn)
+
+    def prune(self, epoch, generation):
+        """Delete other epochs, older generations and the oldest rows beyond max_entries"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM responses WHERE epoch != ? OR generation < ?', (epoch, generation))
+            self._trim(conn)
+
+    def _trim(self, conn):
+        conn.execute('DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses '
+                     'ORDER BY created DESC, rowid DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+
+class ResponseCache:
+    """Two-tier cache of response bodies for one app.
+
+    A miss in the LRU falls through to the shared SQLite tier, and a body
+    rendered by any worker is written to both. Errors in the shared tier
+    only cost the cache; the body is then rendered as if it missed.
+    """
+
+    def __init__(self, path=None, max_entries=256, ttl=300, shared_max_entries=5000):
+        self.memory = LRUCache(max_entries, ttl)
+        self.shared = SQLiteCache(path, shared_max_entries) if path else None
+
+    def get_or_build(self, epoch, generation, key, build):
+        """Cached body for (epoch, generation, key), else build() stored in both tiers
+
+        A recreated store restarts at generation 1, so the store epoch is part
+        of every key.
+        """
+        body = self.memory.get((epoch, generation, key))
+        if body is not None:
+            RESPONSE_CACHE.labels(tier='memory').inc()
+            return body
+        if self.shared is not None:
+            try:
+                body = self.shared.get(epoch, generation, key)
+            except sqlite3.Error as e:
+                logger.warning('Shared response cache read failed: %s', e)
+            if body is not None:
+                RESPONSE_CACHE.labels(tier='shared').inc()
+                self.memory.put((epoch, generation, key), body)
+                return body
+
+        RESPONSE_CACHE.labels(tier='miss').inc()
+        body = build()
+        self.memory.put((epoch, generation, key), body)
+        if self.shared is not None:
+            try:
+                self.shared.put(epoch, generation, key, body)
+            except sqlite3.Error as e:
+                logger.warning('Shared response cache write failed: %s', e)
+        return body
+
+    def invalidate(self, epoch, generation, prune_shared=False):
+        """Forget bodies of other epochs and older generations (the shared tier only when prune_shared)"""
+        self.memory.discard(lambda key: key[0] != epoch or key[1] < generation)
+        if prune_shared and self.shared is not None:
+            try:
+                self.shared.prune(epoch, generation)
+            except sqlite3.Error as e:
+                logger.warning('Shared response cache prune failed: %s', e)
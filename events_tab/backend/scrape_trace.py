@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Scrape Trace - opt-in recorder of where one scrape spent its time
+Stages, selectors and scraper helpers open nested spans that count calls,
+wall time and DOM nodes visited; a trace is saved as JSON and exports
+collapsed stacks for flame graphs (flamegraph.pl, speedscope)
+
+Usage: python scrape_trace.py [url] [--collapsed scrape.folded]
+"""
+
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from events_log import get_logger
+
+logger = get_logger('trace')
+
+
+class Span:
+    """Calls of one step under one parent, merged: count, wall time, nodes"""
+
+    __slots__ = ('name', 'calls', 'seconds', 'nodes', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.nodes = 0
+        self.children = {}
+
+    def child(self, name):
+        span = self.children.get(name)
+        if span is None:
+            span = self.children[name] = Span(name)
+        return span
+
+    def self_seconds(self):
+        """Time not accounted for by child spans"""
+        return max(0.0, self.seconds - sum(child.seconds for child in self.children.values()))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 6),
+            'self_seconds': round(self.self_seconds(), 6),
+            'nodes': self.nodes,
+            'children': [child.to_dict() for child in self.children.values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        span = cls(data['name'])
+        span.calls = data['calls']
+        span.seconds = data['seconds']
+        span.nodes = data['nodes']
+        for child in data['children']:
+            span.children[child['name']] = cls.from_dict(child)
+        return span
+
+
+class ScrapeTrace:
+    """Span tree of one scrape.
+
+    Each thread nests its own spans; spans opened on other threads (crawler
+    and enrichment workers) hang off the root.
+    """
+
+    def __init__(self, url=None):
+        self.url = url
+        self.started_at = datetime.now().isoformat()
+        self.root = Span('scrape')
+        self.root.calls = 1
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = [self.root]
+        return stack
+
+    @contextmanager
+    def span(self, name):
+        """Time the with block as a child of the innermost open span"""
+        stack = self._stack()
+        with self._lock:
+            span = stack[-1].child(name)
+        stack.append(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            with self._lock:
+                span.calls += 1
+                span.seconds += elapsed
+
+    def add_nodes(self, count):
+        """Count DOM nodes visited by the innermost open span"""
+        span = self._stack()[-1]
+        with self._lock:
+            span.nodes += count
+
+    def finish(self):
+        """Stop the clock on the whole scrape"""
+        self.root.seconds = time.perf_counter() - self._started
+        return self
+
+    def to_dict(self):
+        return {'url': self.url, 'started_at': self.started_at, 'root': self.root.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        trace = cls(data.get('url'))
+        trace.started_at = data.get('started_at')
+        trace.root = Span.from_dict(data['root'])
+        return trace
+
+    def collapsed(self):
+        """Collapsed stacks ("scrape;parse;index 1234"), self time in microseconds"""
+        lines = []
+
+        def walk(span, path):
+            path = f"{path};{span.name}" if path else span.name
+            micros = round(span.self_seconds() * 1e6)
+            if micros:
+                lines.append(f"{path} {micros}")
+            for child in span.children.values():
+                walk(child, path)
+
+        walk(self.root, '')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        """Atomically replace the trace file, so any worker can serve it"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def load_trace(path):
+    """The last saved ScrapeTrace, or None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return ScrapeTrace.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug('No trace at %s: %s', path, e)
+        return None
+
+
+def traced(method):
+    """Record calls of a scraper method as spans while its scrape is traced"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        trace = self.trace
+        if trace is None:
+            return method(self, *args, **kwargs)
+        with trace.span(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def maybe_span(trace, name):
+    """trace.span(name), or nothing when the scrape is not traced"""
+    if trace is None:
+        yield None
+    else:
+        with trace.span(name) as span:
+            yield span
+
+
+def main():
+    import argparse
+
+    from events_api import UCFEventsScraper
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url', nargs='?', default=None, help='listing page (default: events.ucf.edu)')
+    parser.add_argument('--collapsed', help='write collapsed stacks here for a flame graph')
+    parser.add_argument('--json', help='write the span tree here')
+    args = parser.parse_args()
+
+    scraper = UCFEventsScraper(base_url=args.url, enrich=False, tracing=True)
+    scraper.scrape_events()
+    trace = scraper.trace.finish()
+    if args.json:
+        trace.save(args.json)
+    if args.collapsed:
+        with open(args.collapsed, 'w', encoding='utf-8') as f:
+            f.write(trace.collapsed())
+    print(trace.collapsed(), end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Query parameter handling of /api/events (no app or network)"""
+
+import os
+import sys
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+from flask import Flask
+from werkzeug.datastructures import MultiDict
+
+from events_api import events_bp, parse_event_query
+
+
+class StubService:
+    """Records which response path /api/events took"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_response(self):
+        self.calls.append('full')
+        return '{"events": []}', None
+
+    def query_response(self, filters, limit=None, cursor=None):
+        self.calls.append(('query', filters['q']))
+        return '{"events": []}', None
+
+
+def client(service):
+    app = Flask(__name__)
+    app.register_blueprint(events_bp)
+    app.extensions['events'] = service
+    return app.test_client()
+
+
+def test_blank_or_wordless_q_is_no_text_filter():
+    for q in ('', '   ', '!?'):
+        filters, _, _ = parse_event_query(MultiDict({'q': q}))
+        assert filters['q'] is None
+
+
+def test_q_keeps_its_words():
+    filters, limit, cursor = parse_event_query(MultiDict({'q': ' Career  FAIR! ', 'start': '2025-03-01',
+                                                          'limit': '5'}))
+    assert filters['q'] == 'career fair'
+    assert filters['start'] == date(2025, 3, 1)
+    assert (limit, cursor) == (5, None)
+
+
+def test_unrelated_parameters_get_the_full_response():
+    service = StubService()
+    events = client(service)
+    assert events.get('/api/events?_=123').status_code == 200
+    assert events.get('/api/events?q=fair&_=123').status_code == 200
+    assert service.calls == ['full', ('query', 'fair')]
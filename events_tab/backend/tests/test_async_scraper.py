@@ -0,0 +1,34 @@
+"""Async scraping against the local fixture server (no network)"""
+
+import asyncio
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, 'benchmarks')]
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from async_scraper import AsyncUCFEventsScraper
+from events_api import UCFEventsScraper
+from fixture_server import FixtureServer
+
+
+def scraper(server, stream_threshold):
+    return UCFEventsScraper(base_url=server.url('month'), enrich=False, feed_paths=[],
+                            stream_threshold=stream_threshold)
+
+
+@pytest.mark.parametrize('chunk_size', [None, 4096])
+@pytest.mark.parametrize('stream_threshold', [16 * 1024, 10 * 1024 * 1024])
+def test_async_scrape_matches_sync(chunk_size, stream_threshold):
+    # chunk_size None sends a Content-Length, otherwise the size is only known at the end
+    with FixtureServer(chunk_size=chunk_size) as server:
+        expected = scraper(server, stream_threshold).scrape_events()
+        wrapped = scraper(server, stream_threshold)
+        events = asyncio.run(AsyncUCFEventsScraper(wrapped).scrape_events())
+
+    assert not wrapped.used_fallback
+    assert [event['title'] for event in events] == [event['title'] for event in expected]
@@ -0,0 +1,49 @@
+"""Deltas between generations from the bounded change history"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+from change_log import ChangeLog
+from event_model import EventDiff, normalize_events
+
+
+def event(number):
+    return normalize_events([{'title': f'Event {number}', 'link': f'https://events.ucf.edu/event/{number}/'}])[0]
+
+
+def history(maxlen=50):
+    # Generation 2 adds 1 and 2, 3 updates 1 and removes 2, 4 adds 3 and removes 1
+    log = ChangeLog(maxlen)
+    log.record(2, EventDiff(added=[event(1), event(2)]))
+    log.record(3, EventDiff(updated=[event(1)], removed=[event(2).id]))
+    log.record(4, EventDiff(added=[event(3)], removed=[event(1).id]))
+    return log
+
+
+def test_since_collapses_generations():
+    present = {event(3).id}
+    assert history().since(('a', 3), ('a', 4), present) == ({event(3).id}, set(), {event(1).id})
+    # Added and removed again in between: not mentioned at all
+    assert history().since(('a', 1), ('a', 4), present) == ({event(3).id}, set(), set())
+    assert history().since(('a', 2), ('a', 3), {event(1).id}) == (set(), {event(1).id}, {event(2).id})
+    assert history().since(('a', 4), ('a', 4), present) == (set(), set(), set())
+
+
+def test_since_needs_full_snapshot():
+    present = {event(3).id}
+    # From a recreated store, from the future, or beyond the kept history
+    assert history().since(('b', 3), ('a', 4), present) is None
+    assert history().since(('a', 5), ('a', 4), present) is None
+    assert history(maxlen=2).since(('a', 1), ('a', 4), present) is None
+
+
+def test_record_replaces_entries_of_unwritten_generations():
+    log = history()
+    log.record(3, EventDiff(added=[event(4)]))
+    assert [entry['generation'] for entry in log.to_meta()] == [2, 3]
+    restored = ChangeLog()
+    restored.load_meta(log.to_meta())
+    assert restored.since(('a', 2), ('a', 3), {event(4).id}) == ({event(4).id}, set(), set())
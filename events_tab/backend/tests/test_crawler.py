@@ -0,0 +1,86 @@
+"""Crawler mode end to end against the nested fixture site (no network)"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, 'benchmarks')]
+
+import pytest
+
+import event_enrichment
+from crawler import EventsCrawler
+from events_api import UCFEventsScraper
+from fixture_server import SITE_DIR, FixtureServer
+
+
+@pytest.fixture
+def site():
+    with FixtureServer(directory=SITE_DIR) as server:
+        yield server
+
+
+def crawl(server, **kwargs):
+    scraper = UCFEventsScraper(base_url=server.url(''), crawl=True, enrich=False, feed_paths=[])
+    crawler = EventsCrawler(scraper, per_host_delay=0, **kwargs)
+    return scraper, crawler, crawler.crawl()
+
+
+def test_crawl_follows_listings_and_detail_pages(site):
+    _, _, events = crawl(site)
+    by_title = {event['title']: event for event in events}
+
+    assert sorted(by_title) == ['Career Fair', 'Knights vs. Bulls', 'Planetarium Night', 'Resume Workshop']
+    assert by_title['Career Fair']['description'] == 'Meet employers hiring UCF students.'
+    assert by_title['Career Fair']['location'] == 'Student Union'
+    assert by_title['Knights vs. Bulls']['categories'] == ['sports']
+    # No detail page: kept as the minimal listing event
+    assert by_title['Planetarium Night']['description'] == 'UCF Event - Click for details'
+
+
+def test_crawl_fetches_each_page_once(site):
+    crawl(site)
+
+    assert site.hits['event/1001/career-fair'] == 1
+    assert site.hits['event/1003/knights-vs-bulls'] == 1
+    assert site.hits['category/sports'] == 1
+    assert site.hits['this-week'] == 2  # the listing and its ?page=2
+
+
+def test_crawl_not_modified(site):
+    scraper, _, first = crawl(site)
+    crawler = EventsCrawler(scraper, per_host_delay=0)
+
+    assert first
+    assert crawler.crawl() is None
+    assert scraper.not_modified
+
+
+def test_crawl_keeps_one_adapter_per_session(site):
+    scraper, _, _ = crawl(site)
+    adapter = scraper.session.get_adapter(site.url(''))
+    EventsCrawler(scraper, per_host_delay=0).crawl()
+
+    assert scraper.session.get_adapter(site.url('')) is adapter
+
+
+def test_crawl_mode_enrichment_reuses_crawled_detail_pages(site):
+    scraper = UCFEventsScraper(base_url=site.url(''), crawl=True, crawl_delay=0, feed_paths=[])
+    events = scraper.scrape_events()
+
+    assert len(events) == 4
+    # Both lack an image, so enrichment wants them, but the crawl already cached their fields
+    assert site.hits['event/1002/resume-workshop'] == 1
+    assert site.hits['event/1003/knights-vs-bulls'] == 1
+
+
+def test_crawled_detail_pages_are_parsed_once(site, monkeypatch, tmp_path):
+    parses = []
+    monkeypatch.setattr(event_enrichment, 'parse_detail_page', lambda content, url: parses.append(url))
+    scraper = UCFEventsScraper(base_url=site.url(''), crawl=True, crawl_delay=0, feed_paths=[],
+                               detail_cache_file=str(tmp_path / 'events_details.json'))
+    scraper.scrape_events()
+
+    # The crawl's own parse filled the cache; nothing parsed the pages again for enrichment
+    assert parses == []
+    assert scraper.enricher.cache.get(site.url('event/1002/resume-workshop'))['details']
@@ -0,0 +1,74 @@
+"""Parsing and identity of the typed event record"""
+
+import os
+import sys
+from datetime import date, datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+from event_model import Event, as_event, diff_events, normalize_events, parse_clock, parse_date, to_timestamp
+
+RAW = {'title': ' Career Fair ', 'description': 'Meet employers hiring UCF students.', 'date': 'March 5, 2025',
+       'time': '10:00 AM - 2:00 PM', 'location': 'UCF Student Union', 'link': 'https://events.ucf.edu/event/1001/',
+       'scraped_at': '2025-03-01T08:00:00'}
+
+
+def test_parse_date_formats():
+    assert parse_date('October 30, 2024') == (date(2024, 10, 30), None)
+    assert parse_date('10/30/2024') == (date(2024, 10, 30), None)
+    assert parse_date('2024-10-30T18:30') == (date(2024, 10, 30), (18, 30))
+    assert parse_date('Today', '2025-03-01T08:00:00') == (date(2025, 3, 1), None)
+    assert parse_date('2024-02-30') == (None, None)
+    assert parse_date('Date TBD') == (None, None)
+
+
+def test_parse_clock():
+    assert parse_clock('10:00 AM - 2:30 p.m.') == [(10, 0), (14, 30)]
+    assert parse_clock('12 pm') == [(12, 0)]
+    assert parse_clock('18:45') == [(18, 45)]
+    assert parse_clock('Evening reception') == [(18, 0)]
+    assert parse_clock('Time TBD') == []
+
+
+def test_from_scraped_parses_times_and_location():
+    event = Event.from_scraped(RAW)
+    assert event.title == 'Career Fair'
+    assert event.start == to_timestamp(datetime(2025, 3, 5, 10))
+    assert event.end == to_timestamp(datetime(2025, 3, 5, 14))
+    assert event.location_id == 'student-union'
+    assert Event.from_scraped(dict(RAW, time='9:00 PM - 1:00 AM')).end == to_timestamp(datetime(2025, 3, 6, 1))
+    assert Event.from_scraped(dict(RAW, location='TBD')).location_id == 'ucf-campus'
+
+
+def test_id_is_stable_and_fingerprint_follows_content():
+    event = Event.from_scraped(RAW)
+    tracked = Event.from_scraped(dict(RAW, link='http://EVENTS.ucf.edu/event/1001?utm_source=mail',
+                                      description='Now with more employers.'))
+    assert tracked.id == event.id
+    assert tracked.fingerprint != event.fingerprint
+    assert Event.from_scraped(dict(RAW, date='March 6, 2025')).id != event.id
+
+
+def test_stored_records_round_trip():
+    event = Event.from_scraped(RAW)
+    restored = as_event(event.to_dict())
+    assert (restored.id, restored.fingerprint, restored.start) == (event.id, event.fingerprint, event.start)
+
+
+def test_normalize_drops_untitled_and_repeated_events():
+    records = normalize_events([RAW, dict(RAW, link=RAW['link'] + '?fbclid=1'), {'title': ''}, None])
+    assert len(records) == 1
+
+
+def test_diff_by_stable_id():
+    first = normalize_events([RAW, dict(RAW, title='Resume Workshop', link='https://events.ucf.edu/event/1002/')])
+    second = normalize_events([dict(RAW, description='Updated.'),
+                               dict(RAW, title='Knights vs. Bulls', link='https://events.ucf.edu/event/1003/')])
+    diff = diff_events(first, second)
+
+    assert [event.title for event in diff.added] == ['Knights vs. Bulls']
+    assert [event.title for event in diff.updated] == ['Career Fair']
+    assert diff.removed == [first[1].id]
+    assert diff.summary() == '+1 ~1 -1'
+    assert not diff_events(second, second)
@@ -0,0 +1,68 @@
+"""Streaming JSON and iCal feed parsing"""
+
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+import pytest
+
+from event_sources import event_from_ical, iter_ical_events, iter_json_items
+
+ITEMS = [{'title': 'Career Fair', 'tags': ['careers']}, {'title': 'Say "hi", [x] {y}'}, [1, 2], 'text', 3]
+
+
+def pieces(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+def test_json_array_items_across_chunk_boundaries(size):
+    text = '  \n' + json.dumps(ITEMS, indent=1)
+    assert list(iter_json_items(pieces(text, size))) == ITEMS
+
+
+def test_json_items_stream_before_the_array_ends():
+    items = iter_json_items(iter(['[{"title": "A"}, ', '{"title"', ': "B"}']))
+    assert next(items) == {'title': 'A'}
+    assert next(items) == {'title': 'B'}
+    # The array is cut off without its closing bracket
+    assert list(items) == []
+
+
+def test_json_wrapped_feeds_and_empty_bodies():
+    assert list(iter_json_items(pieces(json.dumps({'events': ITEMS[:2]}), 5))) == ITEMS[:2]
+    assert list(iter_json_items(['{"meta": {}}'])) == []
+    assert list(iter_json_items(['', '  '])) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(['[{"title": ']))
+
+
+def test_ical_events_with_folded_lines_and_escapes():
+    calendar = [
+        'BEGIN:VCALENDAR\r\n',
+        'SUMMARY:Not an event\r\n',
+        'BEGIN:VEVENT\r\n',
+        'SUMMARY:Career Fair\\, Spring\r\n',
+        'DESCRIPTION:Meet employers\\nand recruiters at the Stu\r\n',
+        ' dent Union.\r\n',
+        'LOCATION;ALTREP="http://map.ucf.edu/a:b":Student Union\r\n',
+        'DTSTART:20250305T100000\r\n',
+        'CATEGORIES:careers, students\r\n',
+        'END:VEVENT\r\n',
+        'BEGIN:VEVENT\r\n',
+        'SUMMARY:Planetarium Night\r\n',
+        'DTSTART;VALUE=DATE:20250306\r\n',
+        'END:VEVENT\r\n',
+        'END:VCALENDAR\r\n',
+    ]
+    events = list(iter_ical_events(calendar))
+
+    assert [properties['SUMMARY'] for properties in events] == ['Career Fair, Spring', 'Planetarium Night']
+    assert events[0]['DESCRIPTION'] == 'Meet employers\nand recruiters at the Student Union.'
+    assert events[0]['LOCATION'] == 'Student Union'
+    first = event_from_ical(events[0])
+    assert first['categories'] == ['careers', 'students']
+    assert first['strategy'] == 'ical'
@@ -0,0 +1,69 @@
+"""Store file format, and migration from the old pickle cache"""
+
+import os
+import pickle
+import sys
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+import pytest
+
+from event_store import HEADER, EventStore, EventStoreError, write_store
+from events_service import EventsService
+
+EVENTS = [{'title': 'Career Fair', 'link': 'https://events.ucf.edu/event/1001/'},
+          {'title': 'Café Night ☕', 'link': 'https://events.ucf.edu/event/1002/'}]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'events_store.bin')
+    write_store(path, EVENTS, 7, {'epoch': 'abc', 'last_scrape_date': '2025-03-01T08:00:00'})
+    store = EventStore(path)
+
+    assert (store.generation, len(store), store.meta['epoch']) == (7, 2, 'abc')
+    assert list(store) == EVENTS
+    assert store[-1] == EVENTS[1] and store[0:1] == EVENTS[:1]
+    assert bytes(store.record_bytes(0)) == b'{"title":"Career Fair","link":"https://events.ucf.edu/event/1001/"}'
+    with pytest.raises(IndexError):
+        store.record_bytes(2)
+    # Replaced atomically: the open mapping keeps the old generation until reopened
+    assert not store.is_stale()
+    write_store(path, EVENTS[:1], 8)
+    assert store.is_stale() and len(store) == 2
+    store.close()
+    assert [name for name in os.listdir(tmp_path)] == ['events_store.bin']
+
+
+def test_corrupt_files_are_refused(tmp_path):
+    path = tmp_path / 'events_store.bin'
+    path.write_bytes(b'KHEV')
+    with pytest.raises(EventStoreError):
+        EventStore(str(path))
+    path.write_bytes(b'NOPE' + bytes(HEADER.size))
+    with pytest.raises(EventStoreError):
+        EventStore(str(path))
+
+    write_store(str(path), EVENTS, 1)
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(EventStoreError):
+        EventStore(str(path))
+
+
+def test_pickle_cache_is_migrated_once(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    legacy = tmp_path / 'events_cache.pkl'
+    with open(legacy, 'wb') as f:
+        pickle.dump({'events': EVENTS, 'generation': 4, 'last_scrape_date': '2025-03-01T08:00:00'}, f)
+
+    service = EventsService(SimpleNamespace(validators={}), cache_file=str(cache_file),
+                            legacy_cache_file=str(legacy))
+    service.load()
+
+    assert (service.generation, service.last_scrape_date) == (4, '2025-03-01T08:00:00')
+    assert service.epoch and [event['title'] for event in service.events] == ['Career Fair', 'Café Night ☕']
+    # The store is used from now on, even if the pickle stays behind
+    epoch = service.epoch
+    service.load()
+    assert service.epoch == epoch
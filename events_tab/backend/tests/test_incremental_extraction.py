@@ -0,0 +1,62 @@
+"""Block collection of the incremental listing parser"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+import pytest
+
+from incremental_extraction import BlockStreamParser
+
+PAGE = (
+    '<html><head><link rel="alternate" type="application/json" href="/feed.json"></head><body>'
+    '<div class="events-wrapper">'
+    '<div class="event"><h3>Career Fair</h3><p>Student Union &amp; more<br>10:00 AM</div>'
+    '<ul><li>Resume Workshop &#8211; Library</li></ul>'
+    '</div>'
+    '<div class="other">Not a block</div>'
+    '</body></html>'
+)
+
+
+def blocks(page, size):
+    parser = BlockStreamParser()
+    found = []
+    for start in range(0, len(page), size):
+        parser.feed(page[start:start + size])
+        found.extend(parser.drain())
+    parser.close()
+    found.extend(parser.drain())
+    return parser, found
+
+
+@pytest.mark.parametrize('size', [1, 5, 64, len(PAGE)])
+def test_innermost_blocks_whatever_the_chunking(size):
+    parser, found = blocks(PAGE, size)
+    assert found == [
+        '<div class="event"><h3>Career Fair</h3><p>Student Union &amp; more<br>10:00 AM</p></div>',
+        '<li>Resume Workshop &#8211; Library</li>',
+    ]
+    assert parser.link_tags == ['<link rel="alternate" type="application/json" href="/feed.json">']
+
+
+def test_blocks_are_ready_as_soon_as_they_close():
+    parser = BlockStreamParser()
+    parser.feed('<div class="event">One</div><div class="event">Tw')
+    assert list(parser.drain()) == ['<div class="event">One</div>']
+    parser.feed('o</div>')
+    assert list(parser.drain()) == ['<div class="event">Two</div>']
+
+
+def test_json_ld_events_stop_block_collection():
+    page = ('<div class="event">Before</div>'
+            '<script type="application/ld+json">{"@type": "Event", "name": "Career Fair"}</script>'
+            '<div class="event">After</div>')
+    parser, found = blocks(page, 7)
+    # Only a block drained before the script arrived got out
+    assert found == ['<div class="event">Before</div>']
+    assert parser.json_ld == [{'@type': 'Event', 'name': 'Career Fair'}]
+    parser, found = blocks(page, len(page))
+    assert found == []
@@ -0,0 +1,51 @@
+"""/metrics totals pooled across worker processes through a shared directory"""
+
+import multiprocessing
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+import pytest
+
+from events_metrics import Counter, Gauge, Histogram, Registry
+
+
+def registry(directory):
+    metrics = Registry()
+    requests = metrics.register(Counter('requests_total', 'Requests', ['status']))
+    seconds = metrics.register(Histogram('request_seconds', 'Latency', buckets=(0.1, 1)))
+    generation = metrics.register(Gauge('generation', 'Generation'))
+    metrics.share(directory)
+    return metrics, requests, seconds, generation
+
+
+def other_worker(directory):
+    metrics, requests, seconds, generation = registry(directory)
+    requests.labels(status=200).inc(3)
+    seconds.observe(0.5)
+    generation.set(7)
+    metrics.flush(force=True)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+def test_render_sums_counters_of_every_worker(tmp_path):
+    worker = multiprocessing.get_context('fork').Process(target=other_worker, args=(str(tmp_path),))
+    worker.start()
+    worker.join()
+
+    metrics, requests, seconds, generation = registry(str(tmp_path))
+    requests.labels(status=200).inc()
+    requests.labels(status=500).inc()
+    seconds.observe(0.05)
+    generation.set(8)
+    lines = metrics.render().splitlines()
+
+    assert 'requests_total{status="200"} 4' in lines
+    assert 'requests_total{status="500"} 1' in lines
+    assert 'request_seconds_bucket{le="0.1"} 1' in lines
+    assert 'request_seconds_bucket{le="1"} 2' in lines
+    assert 'request_seconds_count 2' in lines
+    # Gauges describe the shared store: the rendering process's value
+    assert 'generation 8' in lines
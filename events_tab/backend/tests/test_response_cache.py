@@ -0,0 +1,22 @@
+"""Shared response cache tier bounds (SQLite file in a temp directory)"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+from response_cache import SQLiteCache
+
+
+def test_puts_trim_shared_tier_to_max_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'responses.sqlite3'), max_entries=5, trim_interval=4)
+    for number in range(20):
+        cache.put('epoch', 1, f'key-{number}', b'{}')
+
+    rows = cache._connection().execute('SELECT key FROM responses ORDER BY rowid').fetchall()
+    assert [key for key, in rows] == [f'key-{number}' for number in range(15, 20)]
+    # Between trims the tier grows by less than trim_interval rows
+    for number in range(3):
+        cache.put('epoch', 1, f'more-{number}', b'{}')
+    assert cache._connection().execute('SELECT COUNT(*) FROM responses').fetchone() == (8,)
@@ -0,0 +1,213 @@
+"""Cache state shared between workers through the store file (no network)"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR]
+
+import pytest
+
+from event_db import SCHEMA, EventDatabase
+from event_index import parse_generation_tag
+from event_stream import GenerationBroadcaster, stream_generations
+from events_service import EventsService
+from response_cache import ResponseCache
+
+EVENTS = [{'title': 'Career Fair', 'description': 'Meet employers hiring UCF students.', 'date': 'March 5, 2025',
+           'time': '10:00 AM', 'location': 'Student Union', 'link': 'https://events.ucf.edu/event/1001/'}]
+
+
+def worker(cache_file, responses=None, database=None):
+    service = EventsService(SimpleNamespace(validators={}), cache_file=str(cache_file),
+                            legacy_cache_file=str(cache_file) + '.pkl', scrape_interval=60 * 60,
+                            responses=responses, database=database)
+    service.load()
+    return service
+
+
+def test_mark_fresh_reaches_other_workers(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    first = worker(cache_file)
+    first.save(EVENTS)
+    second = worker(cache_file)
+
+    # Both workers serve a generation scraped two hours ago
+    expired = (datetime.now() - timedelta(hours=2)).isoformat()
+    first.last_scrape_date = second.last_scrape_date = expired
+    assert second.should_scrape()
+
+    # First worker's refresh got a 304: no new generation, only fresh_file
+    first.mark_fresh()
+    second.sync_from_store()
+    assert second.generation == first.generation
+    assert second.last_scrape_date == first.last_scrape_date
+    assert not second.should_scrape()
+
+
+def test_stream_without_max_age_sends_committed_generations_and_closes(tmp_path):
+    service = worker(tmp_path / 'events_store.bin')
+    service.save(EVENTS)
+
+    messages = list(stream_generations(service, since=(service.epoch, 0), max_age=0))
+    assert messages[0].startswith('retry: ')
+    assert [message.split('\n')[:2] for message in messages[1:]] == [[f'id: {service.epoch}.1', 'event: generation']]
+    # Already up to date: nothing but the retry delay
+    assert list(stream_generations(service, since=(service.epoch, 1), max_age=0)) == [messages[0]]
+
+
+def test_stream_resumed_from_recreated_store_sends_current_generation(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    old = worker(cache_file)
+    old.save(EVENTS)
+    old.save([dict(EVENTS[0], title='Career Expo')])
+
+    cache_file.unlink()
+    new = worker(cache_file)
+    new.save(EVENTS)
+
+    # Last-Event-ID names generation 2 of the old store; the new one is only at 1
+    messages = list(stream_generations(new, since=(old.epoch, 2), send_delta=True, max_age=0))
+    assert messages[1].split('\n')[:2] == [f'id: {new.epoch}.1', 'event: generation']
+    assert json.loads(messages[1].split('data: ')[1])['full']
+
+
+def test_broadcaster_wakes_on_new_epoch_with_lower_generation():
+    broadcaster = GenerationBroadcaster()
+    broadcaster.publish('old', 3)
+    broadcaster.publish('new', 1)
+    assert broadcaster.wait(('old', 3), timeout=0) == ('new', 1)
+    assert broadcaster.wait(('new', 1), timeout=0) is None
+
+def test_recreated_store_does_not_serve_old_responses(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    responses = tmp_path / 'responses.sqlite3'
+    old = worker(cache_file, ResponseCache(str(responses)))
+    old.save(EVENTS)
+    old_body, old_etag = old.query_response({'q': 'career'})
+
+    # Store deleted and scraped again: generation 1 again, in a new epoch
+    cache_file.unlink()
+    renamed = [dict(EVENTS[0], title='Career Expo')]
+    new = worker(cache_file, ResponseCache(str(responses)))
+    new.save(renamed)
+    body, etag = new.query_response({'q': 'career'})
+
+    assert new.generation == old.generation == 1
+    assert etag != old_etag
+    assert b'Career Expo' in body and b'Career Fair' not in body
+    rows = new.responses.shared._connection().execute('SELECT DISTINCT epoch FROM responses').fetchall()
+    assert rows == [(new.epoch,)]
+
+
+def test_recreated_store_replaces_database_rows(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    database = EventDatabase(str(tmp_path / 'dev.db'))
+    old = worker(cache_file, database=database)
+    old.save(EVENTS + [dict(EVENTS[0], title='Resume Workshop', link='https://events.ucf.edu/event/1002/')])
+    old.save(EVENTS)
+    assert database.state() == (old.epoch, 2)
+
+    cache_file.unlink()
+    new = worker(cache_file, database=database)
+    new.save([dict(EVENTS[0], title='Career Expo')])
+
+    assert new.generation == 1
+    assert database.state() == (new.epoch, 1)
+    assert [event.title for _, event in database.search(new.epoch, 1)] == ['Career Expo']
+    body, _ = new.query_response({'q': 'career'})
+    assert b'Career Expo' in body and b'Career Fair' not in body
+
+
+def test_recreated_store_refuses_old_deltas_and_cursors(tmp_path):
+    cache_file = tmp_path / 'events_store.bin'
+    second = dict(EVENTS[0], title='Resume Workshop', link='https://events.ucf.edu/event/1002/')
+    old = worker(cache_file)
+    old.save(EVENTS + [second])
+    page = json.loads(old.query_response({}, limit=1)[0])
+    assert page['generation'] == f"{old.epoch}.1"
+
+    cache_file.unlink()
+    new = worker(cache_file)
+    new.save(EVENTS)
+    new.save([second])
+
+    # Same generation number, other epoch: everything again, not "no changes"
+    stale = json.loads(new.changes_response(parse_generation_tag(page['generation']))[0])
+    assert stale['full'] and [event['title'] for event in stale['events']] == ['Resume Workshop']
+    delta = json.loads(new.changes_response((new.epoch, 1))[0])
+    assert not delta['full'] and delta['generation'] == f"{new.epoch}.2"
+    assert [event['title'] for event in delta['added']] == ['Resume Workshop']
+    with pytest.raises(ValueError):
+        new.query_response({}, limit=1, cursor=page['next_cursor'])
+
+
+class StubScraper:
+    """Scraper returning a fixed event list, counting its scrapes"""
+
+    def __init__(self, events):
+        self.events = events
+        self.scrapes = 0
+        self.validators = {}
+        self.timings = {}
+        self.trace = None
+        self.not_modified = False
+        self.used_fallback = False
+
+    def scrape_events(self):
+        self.scrapes += 1
+        return list(self.events)
+
+
+def test_failed_save_backs_off_like_a_failed_scrape(tmp_path):
+    scraper = StubScraper(EVENTS)
+    # A directory where the store file should be: every save fails
+    service = EventsService(scraper, cache_file=str(tmp_path), legacy_cache_file=str(tmp_path / 'none.pkl'))
+
+    assert service.refresher.trigger()
+    service.refresher.wait()
+    assert not service.refresher.trigger()
+    assert scraper.scrapes == 1
+
+
+def test_unusable_cache_directory_backs_off(tmp_path):
+    scraper = StubScraper(EVENTS)
+    cache_file = tmp_path / 'missing' / 'events_store.bin'
+    service = EventsService(scraper, cache_file=str(cache_file), legacy_cache_file=str(tmp_path / 'none.pkl'))
+
+    assert service.refresher.trigger()
+    service.refresher.wait()
+    assert not service.refresher.trigger()
+
+
+def test_database_keeps_tables_it_does_not_own(tmp_path):
+    path = str(tmp_path / 'dev.db')
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE "Event" ("id" INTEGER PRIMARY KEY, "name" TEXT)')
+    connection.execute('INSERT INTO "Event" ("name") VALUES (\'Homecoming\')')
+    connection.commit()
+
+    service = worker(tmp_path / 'events_store.bin', database=EventDatabase(path))
+    service.save(EVENTS)
+
+    # Nothing mirrored, the table untouched, and queries still answered from memory
+    assert connection.execute('SELECT "name" FROM "Event"').fetchall() == [('Homecoming',)]
+    body, _ = service.query_response({'q': 'career'})
+    assert b'Career Fair' in body
+
+
+def test_database_without_epoch_column_is_migrated_in_place(tmp_path):
+    path = str(tmp_path / 'dev.db')
+    connection = sqlite3.connect(path)
+    # The Event model as first pushed, before rows carried the store epoch
+    connection.execute(SCHEMA[0].replace('"epoch" TEXT NOT NULL, ', ''))
+    connection.commit()
+
+    database = EventDatabase(path)
+    service = worker(tmp_path / 'events_store.bin', database=database)
+    service.save(EVENTS)
+    assert database.state() == (service.epoch, 1)
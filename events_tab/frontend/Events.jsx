@@ -1,6 +1,38 @@
 import React, { useState, useEffect } from 'react';
 import './Events.css';
 
+const EVENTS_API = 'http://localhost:5001/api/events';
+const EVENTS_CACHE_KEY = 'knighthaven.events';
+
+// Last event list and its "<epoch>.<generation>" tag, so a remount only asks for what changed
+const loadCachedEvents = () => {
+  try {
+    return JSON.parse(localStorage.getItem(EVENTS_CACHE_KEY));
+  } catch {
+    return null;
+  }
+};
+
+const saveCachedEvents = (generation, events) => {
+  try {
+    if (generation) {
+      localStorage.setItem(EVENTS_CACHE_KEY, JSON.stringify({ generation, events }));
+    }
+  } catch {
+    // Storage full or disabled: the next mount fetches the full list
+  }
+};
+
+// Apply an /api/events/changes delta to the cached list
+const applyChanges = (events, changes) => {
+  const removed = new Set(changes.removed);
+  const updated = new Map(changes.updated.map((event) => [event.id, event]));
+  return events
+    .filter((event) => !removed.has(event.id))
+    .map((event) => updated.get(event.id) || event)
+    .concat(changes.added);
+};
+
 const Events = () => {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -12,12 +44,25 @@ const Events = () => {
 
   const fetchEvents = async () => {
     try {
-      setLoading(true);
-      const response = await fetch('http://localhost:5001/api/events');
+      const cached = loadCachedEvents();
+      if (cached && cached.generation) {
+        // Show the cached list right away, then fetch only the changes
+        setEvents(cached.events);
+        setLoading(false);
+      } else {
+        setLoading(true);
+      }
+
+      const url = cached && cached.generation
+        ? `${EVENTS_API}/changes?since=${encodeURIComponent(cached.generation)}`
+        : EVENTS_API;
+      const response = await fetch(url);
       const data = await response.json();
       
       if (data.success) {
-        setEvents(data.events);
+        const latest = data.events || applyChanges(cached.events, data);
+        setEvents(latest);
+        saveCachedEvents(data.generation, latest);
         setError(null);
       } else {
         setError(data.error || 'Failed to fetch events');
@@ -33,12 +33,15 @@ app.get('/api/stats', async (req, res) => {
     const postCount = await prisma.post.count();
     const listingCount = await prisma.listing.count();
     const serviceCount = await prisma.service.count();
+    // The Event table only exists once `prisma db push` (or the events backend) has created it
+    const eventCount = await prisma.event.count().catch(() => 0);
     
     res.json({
       users: userCount,
       posts: postCount,
       listings: listingCount,
-      services: serviceCount
+      services: serviceCount,
+      events: eventCount
     });
   } catch (error) {
     res.status(500).json({ error: 'Failed to fetch stats' });
@@ -236,6 +239,65 @@ app.get('/api/places', async (req, res) => {
   }
 });
 
+// Location ID the events backend stores (same rules as event_model.location_id)
+const UNKNOWN_LOCATIONS = new Set(['', 'tbd', 'tba', 'ucf-campus', 'campus', 'ucf']);
+function eventLocationId(location) {
+  let slug = location.toLowerCase().replace(/&/g, ' and ').replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '');
+  if (slug.startsWith('ucf-') && slug !== 'ucf-campus') slug = slug.slice(4);
+  return UNKNOWN_LOCATIONS.has(slug) ? 'ucf-campus' : slug;
+}
+
+// Event times are campus wall-clock seconds since 1970-01-01 (no time zone)
+function eventDayStart(value) {
+  const match = /^(\d{4})-(\d{2})-(\d{2})$/.exec(value);
+  return match ? Date.UTC(Number(match[1]), Number(match[2]) - 1, Number(match[3])) / 1000 : null;
+}
+
+function eventWallClock(seconds) {
+  return seconds === null ? null : new Date(seconds * 1000).toISOString().slice(0, 19);
+}
+
+// Events endpoint - scraped events from the Event table, filtered through its indexes
+// Query: start/end (YYYY-MM-DD, inclusive), location (name or ID), limit (1-500)
+app.get('/api/events', async (req, res) => {
+  const { start, end, location, limit } = req.query;
+  const where = {};
+  if (start || end) {
+    const from = start ? eventDayStart(start) : null;
+    const to = end ? eventDayStart(end) : null;
+    if ((start && from === null) || (end && to === null)) {
+      return res.status(400).json({ error: 'start and end must be YYYY-MM-DD dates' });
+    }
+    where.startTs = {};
+    if (from !== null) where.startTs.gte = from;
+    if (to !== null) where.startTs.lt = to + 24 * 60 * 60;
+  }
+  if (location) {
+    where.locationId = eventLocationId(location);
+  }
+  const take = limit === undefined ? undefined : Number(limit);
+  if (take !== undefined && !(Number.isInteger(take) && take >= 1 && take <= 500)) {
+    return res.status(400).json({ error: 'limit must be between 1 and 500' });
+  }
+
+  try {
+    const events = await prisma.event.findMany({
+      where,
+      orderBy: { position: 'asc' },
+      take
+    });
+    res.json(events.map((event) => ({
+      ...event,
+      categories: JSON.parse(event.categories),
+      start: eventWallClock(event.startTs),
+      end: eventWallClock(event.endTs)
+    })));
+  } catch (error) {
+    console.error('Error fetching events:', error);
+    res.status(500).json({ error: 'Failed to fetch events' });
+  }
+});
+
 // Google Maps API key endpoint
 app.get('/api/maps-key', (req, res) => {
   res.json({ apiKey: GOOGLE_MAPS_API_KEY });